@@ -0,0 +1,244 @@
+# ---------------------------------------------------------------------------
+# Laser Blast, Batch Laser Tracer
+#
+# History
+# 18 Oct 2026                   Created
+#                               Check against find_laser_path, self_check
+# ---------------------------------------------------------------------------
+# MIT Licence
+# Copyright 2022 Mike Christle
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE
+# USE OR OTHER DEALINGS IN THE SOFTWARE.
+# ---------------------------------------------------------------------------
+
+import sys
+from random import Random
+
+from Laser import NEXT_STATE, MIRROR_DIR, BORDER, FACE, STATES, \
+                  HIT_LASER, HIT_EDGE, HIT_FACE, BEAM_LOOP, trace_hit
+from Cell import ACTOR_SHIFT, ANGLE_MASK, TEAM_SHIFT, LASER_CELL, Cell
+from GameLogic import Game
+from GameState import SQUARE_COUNT
+import GameState
+
+# NumPy is only needed for batch tracing
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+SQUARES = SQUARE_COUNT * SQUARE_COUNT
+
+# Results in the step table that end a beam
+_END_LASER = -1 - HIT_LASER
+_END_EDGE = -1 - HIT_EDGE
+_END_FACE = -1 - HIT_FACE
+
+
+# ---------------------------------------------------------------------------
+def _build_tables():
+    """
+    Build the tables for a whole step, indexed by beam state.
+    ARRIVE is the square the beam arrives on. STEP, indexed by
+    (state << 7) | cell on the square arrived on, is the state after
+    the beam leaves that square, or -1 - outcome if the beam ends there.
+    """
+
+    arrive = []
+    step = []
+    for state in range(STATES):
+        following = NEXT_STATE[state]
+        following &= BORDER - 1
+        arrive.append(0 if NEXT_STATE[state] == FACE else following >> 3)
+
+        for cell in range(128):
+            if NEXT_STATE[state] == FACE:
+                step.append(_END_FACE)
+            elif cell == 0:
+                step.append(following)
+            elif cell >= LASER_CELL:
+                step.append(_END_LASER)
+            else:
+                direction = MIRROR_DIR[((following & 7) << 3)
+                                       | (cell & ANGLE_MASK)]
+                if direction == 8:
+                    step.append(_END_EDGE)
+                elif direction == 9:
+                    step.append(_END_FACE)
+                else:
+                    step.append((following & ~7) | direction)
+
+    return (np.array(arrive, dtype = np.int32),
+            np.array(step, dtype = np.int32))
+
+
+if np is not None:
+    _ARRIVE, _STEP = _build_tables()
+
+
+# ---------------------------------------------------------------------------
+def boards_array(boards):
+    """Stack the cells of a list of Boards into an N x 9 x 9 array."""
+
+    _need_numpy()
+    data = b''.join(bytes(board.cells) for board in boards)
+    return np.frombuffer(data, dtype = np.uint8).reshape(-1, SQUARE_COUNT,
+                                                          SQUARE_COUNT)
+
+
+# ---------------------------------------------------------------------------
+def trace_batch(boards, board_index, squares):
+    """
+    Trace many beams at once. Boards is an N x 9 x 9 (or N x 81) array
+    of packed cells. Beam i is fired by the laser on square squares[i]
+    of board board_index[i]. All beams advance one square at a time
+    together, each step a lookup in the step table, and finished beams
+    are dropped from the working arrays.
+
+    Return (outcome, hit_x, hit_y) arrays, with the same meaning as
+    Laser.trace and Game.find_laser_path, -1 where the beam loops.
+    A beam still going after STATES steps loops, as in trace_squares.
+    """
+
+    _need_numpy()
+    cells = np.ascontiguousarray(boards, dtype = np.uint8).reshape(-1)
+    squares = np.asarray(squares, dtype = np.int32)
+    base = np.asarray(board_index, dtype = np.int32) * SQUARES
+
+    count = len(squares)
+    outcome = np.full(count, BEAM_LOOP, dtype = np.int8)
+    hit = np.full(count, -1, dtype = np.int32)
+
+    # Working arrays of the beams still travelling
+    beam = np.arange(count, dtype = np.int32)
+    start = squares
+    state = (squares << 3) | (cells[base + squares] & ANGLE_MASK)
+
+    for _ in range(STATES):
+        if len(beam) == 0:
+            break
+
+        sq = _ARRIVE[state]
+        state = _STEP[(state << 7) | cells[base + sq]]
+
+        done = state < 0
+        if done.any():
+            ended = state[done]
+            index = beam[done]
+            outcome[index] = -1 - ended
+            hit[index] = np.where(ended == _END_FACE, start[done], sq[done])
+
+            going = ~done
+            beam = beam[going]
+            base = base[going]
+            start = start[going]
+            state = state[going]
+
+    hit_y, hit_x = np.divmod(hit, SQUARE_COUNT)
+    loop = hit < 0
+    hit_x[loop] = -1
+    hit_y[loop] = -1
+    return outcome, hit_x.astype(np.int8), hit_y.astype(np.int8)
+
+
+# ---------------------------------------------------------------------------
+def trace_all(boards):
+    """
+    Fire every laser on every board. Return (board_index, squares,
+    outcome, hit_x, hit_y) arrays, one entry for each laser.
+    """
+
+    _need_numpy()
+    cells = np.ascontiguousarray(boards, dtype = np.uint8).reshape(-1, SQUARES)
+    board_index, squares = np.nonzero(cells >= LASER_CELL)
+    return (board_index, squares) + trace_batch(cells, board_index, squares)
+
+
+# ---------------------------------------------------------------------------
+def random_boards(count, seed):
+    """
+    Return count Boards, half from random play and half with random
+    pieces on up to half the squares, which gives many more long and
+    looping beams than games do.
+    """
+
+    rnd = Random(seed)
+    game = Game()
+    game.init_game()
+    boards = []
+    while len(boards) < count // 2:
+        game.make_move(rnd.choice(game.legal_moves()))
+        boards.append(game.board.copy())
+        if game.state == GameState.END:
+            game.init_game()
+
+    while len(boards) < count:
+        board = game.board.copy()
+        cells = board.cells
+        cells[:] = bytes(SQUARES)
+        for sq in rnd.sample(range(SQUARES), rnd.randrange(4, SQUARES // 2)):
+            actor = rnd.choice((Cell.MIRROR, Cell.MIRROR, Cell.LASER))
+            team = rnd.choice((Cell.RED_TEAM, Cell.GRN_TEAM))
+            cells[sq] = (actor << ACTOR_SHIFT) | (team << TEAM_SHIFT) | \
+                        rnd.randrange(8)
+        boards.append(board)
+    return boards
+
+
+# ---------------------------------------------------------------------------
+def self_check(count = 10000, seed = 1):
+    """
+    Fire every laser on count random boards with trace_all, and check
+    each beam against Game.find_laser_path and Laser.trace_hit.
+    Raises AssertionError on the first difference, returns the number
+    of beams checked.
+    """
+
+    boards = random_boards(count, seed)
+    board_index, squares, outcome, hit_x, hit_y = trace_all(
+        boards_array(boards))
+
+    game = Game()
+    for i, sq in enumerate(squares.tolist()):
+        game.board = boards[board_index[i]]
+        game.select_y, game.select_x = divmod(sq, SQUARE_COUNT)
+        game.find_laser_path()
+        assert (hit_x[i], hit_y[i]) == (game.hit_x, game.hit_y), \
+            (board_index[i], sq)
+        assert outcome[i] == trace_hit(game.board.cells, sq)[0], \
+            (board_index[i], sq)
+    return len(squares)
+
+
+# ---------------------------------------------------------------------------
+def _need_numpy():
+    if np is None:
+        raise ImportError('Batch tracing needs NumPy, pip install numpy')
+
+
+# ---------------------------------------------------------------------------
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    beams = self_check(count)
+    print(f'ok, {beams} beams on {count} boards the same as find_laser_path')
+
+
+if __name__ == '__main__':
+    main()
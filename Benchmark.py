@@ -0,0 +1,863 @@
+# ---------------------------------------------------------------------------
+# Laser Blast, Benchmark
+#
+# History
+# 18 Oct 2026                   Created
+#                               Add the search benchmark
+#                               Add the parallel search scaling benchmark
+#                               Add the Monte Carlo tree search benchmark
+#                               Add the batch laser tracer benchmark
+#                               Add the threat map benchmark
+#                               Add the benchmark suite, JSON and compare
+#                               Run the paint cases at a given square size
+#                               Add the paint_cursor case
+#                               Measure memory per game after play
+#                               Compare tracers with the original
+# ---------------------------------------------------------------------------
+# MIT Licence
+# Copyright 2022 Mike Christle
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE
+# USE OR OTHER DEALINGS IN THE SOFTWARE.
+# ---------------------------------------------------------------------------
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tracemalloc
+
+from time import perf_counter, strftime
+from Cell import ACTOR_SHIFT, ANGLE_MASK, TEAM_SHIFT, Cell
+from Engine import Engine
+from ParallelEngine import ParallelEngine
+from MCTS import MCTS, playout
+from BatchLaser import boards_array, trace_all
+from GameLogic import Game
+from Laser import NEW_DIR, BEAM_LOOP, trace, trace_hit
+from ThreatMap import ThreatMap
+import GameState
+
+
+# ---------------------------------------------------------------------------
+def random_click(game, rng):
+    """
+    Take one random action on a game through the click interface.
+    Select a random piece of the player, then click a random square
+    within two squares of it, or a random button on the action panel.
+    """
+
+    cells = game.board.cells
+    pieces = [sq for sq in range(81)
+              if cells[sq] and (cells[sq] >> TEAM_SHIFT) & 3 == game.player]
+    y, x = divmod(rng.choice(pieces), 9)
+
+    while True:
+        game.cursor_x = x
+        game.cursor_y = y
+        game.click()
+
+        if rng.random() < 0.5:
+            game.cursor_x = 9
+            game.cursor_y = rng.randrange(9)
+        else:
+            game.cursor_x = min(8, max(0, x + rng.randint(-2, 2)))
+            game.cursor_y = min(8, max(0, y + rng.randint(-2, 2)))
+        game.click()
+
+        if game.state != GameState.ACTION:
+            return
+
+
+# ---------------------------------------------------------------------------
+def bench_memory(args):
+    """
+    Measure the memory used by each game and the games per process,
+    when new and in steady state after --actions random actions each.
+    """
+
+    rng = random.Random(args.seed)
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    games = []
+    for _ in range(args.games):
+        game = Game()
+        game.init_game()
+        games.append(game)
+    used = tracemalloc.get_traced_memory()[0] - base
+    report_memory('new', args.games, used)
+
+    for _ in range(args.actions):
+        for game in games:
+            random_click(game, rng)
+            if game.state == GameState.END:
+                game.init_game()
+    used = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    report_memory(f'after {args.actions} actions', args.games, used)
+
+    # Play random actions round robin across all games
+    actions = 0
+    finished = 0
+    start = perf_counter()
+    while perf_counter() - start < args.seconds:
+        for game in games:
+            random_click(game, rng)
+            actions += 1
+            if game.state == GameState.END:
+                game.init_game()
+                finished += 1
+    elapsed = perf_counter() - start
+    print(f'{actions / elapsed:.0f} actions/s, '
+          f'{finished / elapsed:.1f} games finished/s, '
+          f'{len(games)} games live')
+
+
+# ---------------------------------------------------------------------------
+def report_memory(name, games, used):
+    """Print the memory used by some games."""
+
+    per_game = used / games
+    print(f'{name:20} {games} games, {used / 1e6:.1f} MB, '
+          f'{per_game:.0f} bytes per game, '
+          f'{(1 << 30) / per_game:.0f} games per GiB')
+
+
+# ---------------------------------------------------------------------------
+def random_positions(count, seed):
+    """Return a list of boards reached by random play."""
+
+    rng = random.Random(seed)
+    game = Game()
+    game.init_game()
+    boards = []
+    while len(boards) < count:
+        random_click(game, rng)
+        boards.append(game.board.copy())
+        if game.state == GameState.END:
+            game.init_game()
+    return boards
+
+
+# ---------------------------------------------------------------------------
+class OldCell:
+    """A square of the grid the original tracer walked."""
+
+    __slots__ = ('actor', 'team', 'angle')
+
+    def __init__(self, cell):
+        self.actor = cell >> ACTOR_SHIFT
+        self.team = (cell >> TEAM_SHIFT) & 3
+        self.angle = cell & ANGLE_MASK
+
+
+# ---------------------------------------------------------------------------
+def old_grid(cells):
+    """Unpack a board's cells into the original grid of cell objects."""
+
+    return [[OldCell(cells[y * 9 + x]) for x in range(9)] for y in range(9)]
+
+
+# ---------------------------------------------------------------------------
+def old_find_laser_path(grid, x, y):
+    """
+    The original find_laser_path, kept as the reference the new tracer
+    is measured against. The globals it used are locals here, and the
+    path is in grid coordinates. It never returns for a beam that
+    loops forever. Return (hit x, hit y, path).
+    """
+
+    path = []
+    select_x, select_y = x, y
+    direction = grid[y][x].angle
+
+    while True:
+
+        # Save current coordinates
+        path.append((x, y))
+
+        # Get the current cell
+        cell = grid[y][x]
+
+        # If current cell is a mirror, get new direction of travel
+        if cell.actor == Cell.MIRROR:
+            direction = NEW_DIR[direction][cell.angle]
+
+        # Advance to next cell
+        match direction:
+            case GameState.N:
+                y -= 1
+            case GameState.NE:
+                x += 1
+                y -= 1
+            case GameState.E:
+                x += 1
+            case GameState.SE:
+                x += 1
+                y += 1
+            case GameState.S:
+                y += 1
+            case GameState.SW:
+                y += 1
+                x -= 1
+            case GameState.W:
+                x -= 1
+            case GameState.NW:
+                x -= 1
+                y -= 1
+            case 8: # Hit edge of a mirror
+                return x, y, path
+            case 9: # Hit face of a mirror
+                path.append((x, y))
+                return select_x, select_y, path
+
+        # If laser hits a border mirror
+        match [direction, y, x]:
+            case [GameState.NW, -1, -1]: # Top left corner
+                path.append((x, y))
+                return select_x, select_y, path
+            case [GameState.NW, -1, _]: # Top side
+                path.append((x, y))
+                path.append((x + 1, y))
+                y += 1
+                direction = GameState.SW
+            case [GameState.NW, _, -1]: # Left side
+                path.append((x, y))
+                path.append((x, y + 1))
+                x += 1
+                direction = GameState.NE
+
+            case [GameState.NE, -1, 9]: # Top right corner
+                path.append((x, y))
+                return select_x, select_y, path
+            case [GameState.NE, -1, _]: # Top side
+                path.append((x, y))
+                path.append((x - 1, y))
+                y += 1
+                direction = GameState.SE
+            case [GameState.NE, _, 9]: # Right side
+                path.append((x, y))
+                path.append((x, y + 1))
+                x -= 1
+                direction = GameState.NW
+
+            case [GameState.SW, 9, -1]: # Bottom left corner
+                path.append((x, y))
+                return select_x, select_y, path
+            case [GameState.SW, 9, _]: # Bottom side
+                path.append((x, y))
+                path.append((x + 1, y))
+                y -= 1
+                direction = GameState.NW
+            case [GameState.SW, _, -1]: # Left side
+                path.append((x, y))
+                path.append((x, y - 1))
+                x += 1
+                direction = GameState.SE
+
+            case [GameState.SE, 9, 9]: # Bottom right corner
+                path.append((x, y))
+                return select_x, select_y, path
+            case [GameState.SE, 9, _]: # Bottom side
+                path.append((x, y))
+                path.append((x - 1, y))
+                y -= 1
+                direction = GameState.NE
+            case [GameState.SE, _, 9]: # Right side
+                path.append((x, y))
+                path.append((x, y - 1))
+                x -= 1
+                direction = GameState.SW
+
+            case [GameState.N, -1, _] | [GameState.S, 9, _] | \
+                 [GameState.W, _, -1] | [GameState.E, _, 9]: # Square on
+                path.append((x, y))
+                return select_x, select_y, path
+
+        # If laser beam hits a laser gun
+        cell = grid[y][x]
+        if cell.actor == Cell.LASER:
+            path.append((x, y))
+            return x, y, path
+
+
+# ---------------------------------------------------------------------------
+def bench_trace(args):
+    """
+    Measure laser traces per second over positions from random play,
+    against the original find_laser_path. Beams that loop forever are
+    left out, as the original never returns for them.
+    """
+
+    shots = []
+    for board in random_positions(args.positions, args.seed):
+        cells = board.cells
+        grid = old_grid(cells)
+        for sq in range(81):
+            if cells[sq] >> ACTOR_SHIFT == Cell.LASER and \
+                    trace_hit(cells, sq)[0] != BEAM_LOOP:
+                y, x = divmod(sq, 9)
+                shots.append((cells, sq, grid, x, y))
+
+    count = len(shots) * args.repeat
+    start = perf_counter()
+    for _ in range(args.repeat):
+        for _, _, grid, x, y in shots:
+            old_find_laser_path(grid, x, y)
+    original = count / (perf_counter() - start)
+    print(f'{"original":10} {original:10.0f} traces/s')
+
+    for name, func in (('trace', trace), ('trace_hit', trace_hit)):
+        start = perf_counter()
+        for _ in range(args.repeat):
+            for cells, sq, _, _, _ in shots:
+                func(cells, sq)
+        rate = count / (perf_counter() - start)
+        print(f'{name:10} {rate:10.0f} traces/s {rate / original:6.1f}x')
+
+
+# ---------------------------------------------------------------------------
+def bench_moves(args):
+    """Measure move generation and make/unmake over random play."""
+
+    rng = random.Random(args.seed)
+    game = Game()
+    game.init_game()
+    generated = made = 0
+    gen_time = make_time = 0.0
+
+    for _ in range(args.positions):
+        start = perf_counter()
+        moves = game.legal_moves()
+        gen_time += perf_counter() - start
+        generated += len(moves)
+
+        start = perf_counter()
+        for move in moves:
+            game.make_move(move)
+            game.unmake_move()
+        make_time += perf_counter() - start
+        made += len(moves)
+
+        game.make_move(rng.choice(moves))
+        if game.state == GameState.END:
+            game.init_game()
+
+    print(f'legal_moves {generated / gen_time:10.0f} moves/s, '
+          f'{generated / args.positions:.1f} moves per position')
+    print(f'make/unmake {made / make_time:10.0f} moves/s')
+
+
+# ---------------------------------------------------------------------------
+def bench_search(args):
+    """Measure the computer player over positions from random play."""
+
+    rng = random.Random(args.seed)
+    game = Game()
+    game.init_game()
+    engine = Engine()
+    nodes = depth = 0
+    elapsed = 0.0
+
+    for _ in range(args.positions):
+        for _ in range(rng.randrange(1, 40)):
+            random_click(game, rng)
+            if game.state == GameState.END:
+                game.init_game()
+
+        result = engine.search(game, args.seconds, args.depth)
+        nodes += result.nodes
+        depth += result.depth
+        elapsed += result.seconds
+        print(result)
+
+    print(f'search {nodes / elapsed:10.0f} nodes/s, '
+          f'average depth {depth / args.positions:.1f}')
+
+
+# ---------------------------------------------------------------------------
+def bench_batch(args):
+    """Compare the NumPy batch tracer with a loop of single traces."""
+
+    boards = random_positions(args.positions, args.seed)
+
+    start = perf_counter()
+    count = 0
+    for board in boards:
+        cells = board.cells
+        for sq in range(81):
+            if cells[sq] >> ACTOR_SHIFT == Cell.LASER:
+                trace_hit(cells, sq)
+                count += 1
+    loop_time = perf_counter() - start
+
+    start = perf_counter()
+    array = boards_array(boards)
+    stack_time = perf_counter() - start
+    start = perf_counter()
+    trace_all(array)
+    batch_time = perf_counter() - start
+
+    print(f'{count} beams on {len(boards)} boards')
+    print(f'trace_hit loop {count / loop_time:10.0f} beams/s')
+    print(f'trace_all      {count / batch_time:10.0f} beams/s, '
+          f'{loop_time / batch_time:.1f}x, '
+          f'plus {stack_time:.3f}s to stack the boards')
+
+
+# ---------------------------------------------------------------------------
+def bench_threats(args):
+    """Compare threat map updates with tracing every laser after a move."""
+
+    rng = random.Random(args.seed)
+    game = Game()
+    game.init_game()
+    threats = ThreatMap(game.board)
+    threats.traced = 0
+    update_time = full_time = 0.0
+    full_traced = 0
+
+    for _ in range(args.moves):
+        game.make_move(rng.choice(game.legal_moves()))
+        if game.state == GameState.END:
+            game.init_game()
+
+        start = perf_counter()
+        threats.update()
+        update_time += perf_counter() - start
+
+        start = perf_counter()
+        cells = game.board.cells
+        for sq in range(81):
+            if cells[sq] >> ACTOR_SHIFT == Cell.LASER:
+                trace(cells, sq)
+                full_traced += 1
+        full_time += perf_counter() - start
+
+    moves = args.moves
+    print(f'update   {1e6 * update_time / moves:6.2f} us/move, '
+          f'{threats.traced / moves:.2f} beams traced per move')
+    print(f'full     {1e6 * full_time / moves:6.2f} us/move, '
+          f'{full_traced / moves:.2f} beams traced per move')
+    print(f'speedup  {full_time / update_time:6.2f}x')
+
+
+# ---------------------------------------------------------------------------
+def bench_mcts(args):
+    """Measure random playouts and tree search over random play."""
+
+    rng = random.Random(args.seed)
+    game = Game()
+    game.init_game()
+    games = []
+    for _ in range(args.positions):
+        for _ in range(rng.randrange(1, 40)):
+            random_click(game, rng)
+            if game.state == GameState.END:
+                game.init_game()
+        games.append(game.copy())
+
+    count = args.playouts // args.positions
+    start = perf_counter()
+    for game in games:
+        for _ in range(count):
+            playout(game, rng.random)
+    elapsed = perf_counter() - start
+    print(f'playout {count * len(games) / elapsed:10.0f} playouts/s')
+
+    playouts = 0
+    elapsed = 0.0
+    for game in games:
+        result = MCTS(args.seed).search(game, playouts = count)
+        playouts += result.nodes
+        elapsed += result.seconds
+    print(f'search  {playouts / elapsed:10.0f} playouts/s')
+
+
+# ---------------------------------------------------------------------------
+def bench_smp(args):
+    """
+    Measure parallel search scaling from the start position,
+    the time to reach a depth and the nodes per second.
+    """
+
+    game = Game()
+    game.init_game()
+    print(f'workers  depth {args.depth}   speedup   nodes/s')
+    base = None
+
+    for workers in args.workers:
+        engine = ParallelEngine(workers)
+        engine.search(game, 0.5, 1)     # Warm up the workers
+        engine.clear()
+        result = engine.search(game, float('inf'), args.depth)
+        engine.close()
+
+        if base is None:
+            base = result.seconds
+        print(f'{workers:7} {result.seconds:8.2f}s '
+              f'{base / result.seconds:8.2f}x {result.nps():9.0f}')
+
+
+# ---------------------------------------------------------------------------
+# The benchmark suite. Each case is set up from a seeded random generator
+# and returns a function that runs one round, and the operations per round.
+# Paint cases import Paint when run, for a headless run set
+# SDL_VIDEODRIVER=dummy.
+
+def case_find_laser_path(rng):
+    game = Game()
+    game.init_game()
+    shots = []
+    for board in random_positions(200, rng.getrandbits(32)):
+        for sq in range(81):
+            if board.cells[sq] >> ACTOR_SHIFT == Cell.LASER:
+                shots.append((board, sq))
+
+    def run():
+        for board, sq in shots:
+            game.board = board
+            game.select_y, game.select_x = divmod(sq, 9)
+            game.find_laser_path()
+    return run, len(shots)
+
+
+def case_init_game(rng):
+    game = Game()
+
+    def run():
+        for _ in range(1000):
+            game.init_game()
+    return run, 1000
+
+
+def case_click(rng):
+    game = Game()
+    seed = rng.getrandbits(32)
+
+    def run():
+        click_rng = random.Random(seed)
+        game.init_game()
+        for _ in range(500):
+            random_click(game, click_rng)
+            if game.state == GameState.END:
+                game.init_game()
+    return run, 500
+
+
+def case_legal_moves(rng):
+    games = _random_games(rng, 200)
+
+    def run():
+        for game in games:
+            game.legal_moves()
+    return run, len(games)
+
+
+def case_make_unmake(rng):
+    games = [(game, game.legal_moves()) for game in _random_games(rng, 50)]
+    count = sum(len(moves) for _, moves in games)
+
+    def run():
+        for game, moves in games:
+            for move in moves:
+                game.make_move(move)
+                game.unmake_move()
+    return run, count
+
+
+def case_random_game(rng):
+    game = Game()
+    seed = rng.getrandbits(32)
+
+    def run():
+        click_rng = random.Random(seed)
+        for _ in range(5):
+            game.init_game()
+            while game.state != GameState.END:
+                random_click(game, click_rng)
+    return run, 5
+
+
+def case_paint(rng):
+    import Paint
+    games = _random_games(rng, 20)
+
+    def run():
+        for game in games:
+            Paint.painted.clear()
+            Paint.paint(game)
+    return run, len(games)
+
+
+def case_paint_cursor(rng):
+    import Paint
+    game = _random_games(rng, 1)[0]
+    Paint.paint(game)
+
+    def run():
+        for x in range(10):
+            game.cursor_x = x
+            Paint.paint(game)
+    return run, 10
+
+
+def case_paint_mirror(rng):
+    import Paint
+    colors = (Paint.RED, Paint.GREEN, Paint.WHITE)
+
+    def run():
+        for color in colors:
+            for angle in range(8):
+                Paint.paint_mirror(angle, 0, color, angle)
+    return run, 24
+
+
+def case_paint_laser(rng):
+    import Paint
+    colors = (Paint.RED, Paint.GREEN, Paint.WHITE)
+
+    def run():
+        for color in colors:
+            for angle in range(8):
+                Paint.paint_laser(angle, 0, color, angle)
+    return run, 24
+
+
+CASES = {
+    'find_laser_path': case_find_laser_path,
+    'init_game': case_init_game,
+    'click': case_click,
+    'legal_moves': case_legal_moves,
+    'make_unmake': case_make_unmake,
+    'random_game': case_random_game,
+    'paint': case_paint,
+    'paint_cursor': case_paint_cursor,
+    'paint_mirror': case_paint_mirror,
+    'paint_laser': case_paint_laser,
+}
+
+
+# ---------------------------------------------------------------------------
+def _random_games(rng, count):
+    """Return count games at positions reached by random play."""
+
+    game = Game()
+    game.init_game()
+    games = []
+    while len(games) < count:
+        for _ in range(rng.randrange(1, 20)):
+            random_click(game, rng)
+            if game.state == GameState.END:
+                game.init_game()
+        games.append(game.copy())
+    return games
+
+
+# ---------------------------------------------------------------------------
+def run_case(name, seed, warmup, repeat):
+    """Time a suite case, return a dict of its statistics."""
+
+    run, ops = CASES[name](random.Random(seed))
+    for _ in range(warmup):
+        run()
+
+    times = []
+    for _ in range(repeat):
+        start = perf_counter()
+        run()
+        times.append(perf_counter() - start)
+
+    per_op = [1e6 * t / ops for t in times]
+    median = statistics.median(per_op)
+    return {'ops': ops,
+            'rounds': times,
+            'median_us': median,
+            'mean_us': statistics.mean(per_op),
+            'stdev_us': statistics.stdev(per_op) if repeat > 1 else 0.0,
+            'min_us': min(per_op),
+            'ops_per_s': 1e6 / median}
+
+
+# ---------------------------------------------------------------------------
+def bench_suite(args):
+    """Run the benchmark suite, optionally saving the results as JSON."""
+
+    names = args.cases or list(CASES)
+    for name in names:
+        if name not in CASES:
+            sys.exit(f'Unknown case {name}, cases are {", ".join(CASES)}')
+
+    if args.square_size is not None:
+        import Paint
+        Paint.set_square_size(args.square_size)
+
+    results = {'meta': _meta(args), 'cases': {}}
+    print(f'{"case":16} {"ops":>6} {"median us":>10} {"mean us":>10} '
+          f'{"stdev":>7} {"min us":>10} {"ops/s":>10}')
+
+    for name in names:
+        stats = run_case(name, args.seed, args.warmup, args.repeat)
+        results['cases'][name] = stats
+        spread = 100 * stats['stdev_us'] / stats['mean_us']
+        print(f'{name:16} {stats["ops"]:6} {stats["median_us"]:10.2f} '
+              f'{stats["mean_us"]:10.2f} {spread:6.1f}% '
+              f'{stats["min_us"]:10.2f} {stats["ops_per_s"]:10.0f}')
+
+    if args.json:
+        with open(args.json, 'w') as out:
+            json.dump(results, out, indent = 1)
+
+
+# ---------------------------------------------------------------------------
+def _meta(args):
+    """Describe the run, so results from different commits can be compared."""
+
+    # Ask git about the repository of this file, wherever it is run from
+    repo = os.path.dirname(os.path.abspath(__file__))
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                                cwd = repo,
+                                capture_output = True, text = True,
+                                timeout = 10).stdout.strip()
+    except OSError:
+        commit = ''
+    return {'commit': commit,
+            'date': strftime('%Y-%m-%d %H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': args.seed,
+            'square_size': args.square_size,
+            'warmup': args.warmup,
+            'repeat': args.repeat}
+
+
+# ---------------------------------------------------------------------------
+def bench_compare(args):
+    """
+    Compare two suite JSON files by median time per operation.
+    Exit with status 1 if a case is slower than the threshold.
+    """
+
+    with open(args.old) as old_file, open(args.new) as new_file:
+        old = json.load(old_file)
+        new = json.load(new_file)
+
+    print(f'{old["meta"]["commit"] or args.old} -> '
+          f'{new["meta"]["commit"] or args.new}')
+    print(f'{"case":16} {"old us":>10} {"new us":>10} {"change":>8}')
+    regressed = False
+
+    for name, stats in new['cases'].items():
+        if name not in old['cases']:
+            continue
+        before = old['cases'][name]['median_us']
+        after = stats['median_us']
+        change = 100 * (after - before) / before
+        flag = ''
+        if change > args.threshold:
+            flag = '  slower'
+            regressed = True
+        elif change < -args.threshold:
+            flag = '  faster'
+        print(f'{name:16} {before:10.2f} {after:10.2f} {change:+7.1f}%{flag}')
+
+    if regressed:
+        sys.exit(1)
+
+
+# ---------------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description = 'Laser Blast benchmarks')
+    sub = parser.add_subparsers(dest = 'bench', required = True)
+
+    cmd = sub.add_parser('memory', help = 'memory per game, games per process')
+    cmd.add_argument('--games', type = int, default = 10000)
+    cmd.add_argument('--seconds', type = float, default = 5.0)
+    cmd.add_argument('--actions', type = int, default = 68,
+                     help = 'random actions per game before measuring again')
+    cmd.add_argument('--seed', type = int, default = 1)
+    cmd.set_defaults(func = bench_memory)
+
+    cmd = sub.add_parser('trace', help = 'laser traces per second')
+    cmd.add_argument('--positions', type = int, default = 2000)
+    cmd.add_argument('--repeat', type = int, default = 20)
+    cmd.add_argument('--seed', type = int, default = 1)
+    cmd.set_defaults(func = bench_trace)
+
+    cmd = sub.add_parser('moves', help = 'move generation and make/unmake')
+    cmd.add_argument('--positions', type = int, default = 2000)
+    cmd.add_argument('--seed', type = int, default = 1)
+    cmd.set_defaults(func = bench_moves)
+
+    cmd = sub.add_parser('search', help = 'computer player nodes per second')
+    cmd.add_argument('--positions', type = int, default = 10)
+    cmd.add_argument('--seconds', type = float, default = 2.0)
+    cmd.add_argument('--depth', type = int, default = 64)
+    cmd.add_argument('--seed', type = int, default = 1)
+    cmd.set_defaults(func = bench_search)
+
+    cmd = sub.add_parser('batch', help = 'NumPy batch laser tracer')
+    cmd.add_argument('--positions', type = int, default = 100000)
+    cmd.add_argument('--seed', type = int, default = 1)
+    cmd.set_defaults(func = bench_batch)
+
+    cmd = sub.add_parser('threats', help = 'threat map update per move')
+    cmd.add_argument('--moves', type = int, default = 20000)
+    cmd.add_argument('--seed', type = int, default = 1)
+    cmd.set_defaults(func = bench_threats)
+
+    cmd = sub.add_parser('mcts', help = 'Monte Carlo playouts per second')
+    cmd.add_argument('--positions', type = int, default = 10)
+    cmd.add_argument('--playouts', type = int, default = 100000)
+    cmd.add_argument('--seed', type = int, default = 1)
+    cmd.set_defaults(func = bench_mcts)
+
+    cmd = sub.add_parser('smp', help = 'parallel search scaling')
+    cmd.add_argument('--workers', type = int, nargs = '+',
+                     default = [1, 2, 4, 8])
+    cmd.add_argument('--depth', type = int, default = 3)
+    cmd.set_defaults(func = bench_smp)
+
+    cmd = sub.add_parser('suite', help = 'run the benchmark suite')
+    cmd.add_argument('cases', nargs = '*', help = ', '.join(CASES))
+    cmd.add_argument('--warmup', type = int, default = 1)
+    cmd.add_argument('--repeat', type = int, default = 7)
+    cmd.add_argument('--seed', type = int, default = 1)
+    cmd.add_argument('--json', help = 'save the results to this file')
+    cmd.add_argument('--square-size', type = int,
+                     help = 'square size in pixels for the paint cases')
+    cmd.set_defaults(func = bench_suite)
+
+    cmd = sub.add_parser('compare', help = 'compare two suite JSON files')
+    cmd.add_argument('old')
+    cmd.add_argument('new')
+    cmd.add_argument('--threshold', type = float, default = 10.0,
+                     help = 'percent change reported as slower or faster')
+    cmd.set_defaults(func = bench_compare)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
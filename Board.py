@@ -0,0 +1,139 @@
+# ---------------------------------------------------------------------------
+# Laser Blast, Board
+#
+# History
+# 18 Oct 2026                   Created
+#                               Keep a Zobrist hash of the board
+# ---------------------------------------------------------------------------
+# MIT Licence
+# Copyright 2022 Mike Christle
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE
+# USE OR OTHER DEALINGS IN THE SOFTWARE.
+# ---------------------------------------------------------------------------
+
+from Cell import Cell, ACTOR_SHIFT, TEAM_SHIFT, ANGLE_MASK
+from GameState import SQUARE_COUNT
+from Zobrist import CELL_KEYS, board_hash
+
+
+SQUARES = SQUARE_COUNT * SQUARE_COUNT
+
+
+# ---------------------------------------------------------------------------
+class Board:
+    """
+    The playing board packed one byte per square in a bytearray.
+    Square index is y * 9 + x, see Cell for the byte layout.
+    Copying a board is a single buffer copy.
+    The Zobrist hash of the board is kept up to date by every change
+    made through the board or a Cell view of it.
+    """
+
+    __slots__ = ('cells', 'hash')
+
+    # Set True to recompute the hash from scratch after every change
+    # and check it against the incremental hash, for testing.
+    VERIFY_HASH = False
+
+    # -----------------------------------------------------------------------
+    def __init__(self, cells = None):
+        if cells is None:
+            self.cells = bytearray(SQUARES)
+        else:
+            self.cells = bytearray(cells)
+        self.hash = board_hash(self.cells)
+
+    # -----------------------------------------------------------------------
+    def copy(self):
+        board = Board.__new__(Board)
+        board.cells = self.cells[:]
+        board.hash = self.hash
+        return board
+
+    # -----------------------------------------------------------------------
+    def cell(self, x, y):
+        """Return a Cell view of the square at x, y."""
+
+        return Cell(self, y * SQUARE_COUNT + x)
+
+    # -----------------------------------------------------------------------
+    def clear(self):
+        """Remove all pieces from the board."""
+
+        self.cells[:] = bytes(SQUARES)
+        self.hash = 0
+
+    # -----------------------------------------------------------------------
+    def set(self, x, y, team, actor, angle):
+        self.put(y * SQUARE_COUNT + x,
+                 (actor << ACTOR_SHIFT) | (team << TEAM_SHIFT) | angle)
+
+    # -----------------------------------------------------------------------
+    def put(self, sq, cell):
+        """Store a packed cell in square sq."""
+
+        sq <<= 7
+        cells = self.cells
+        self.hash ^= CELL_KEYS[sq | cells[sq >> 7]] ^ CELL_KEYS[sq | cell]
+        cells[sq >> 7] = cell
+        if self.VERIFY_HASH: self.check_hash()
+
+    # -----------------------------------------------------------------------
+    def move(self, src, dst):
+        """Move the piece on square src to the empty square dst."""
+
+        cells = self.cells
+        cell = cells[src]
+        self.hash ^= CELL_KEYS[(src << 7) | cell] ^ CELL_KEYS[(dst << 7) | cell]
+        cells[dst] = cell
+        cells[src] = 0
+        if self.VERIFY_HASH: self.check_hash()
+
+    # -----------------------------------------------------------------------
+    def check_hash(self):
+        """Raise an AssertionError if the incremental hash is wrong."""
+
+        if self.hash != board_hash(self.cells):
+            raise AssertionError('Board hash does not match the cells')
+
+    # -----------------------------------------------------------------------
+    def actor(self, x, y):
+        return self.cells[y * SQUARE_COUNT + x] >> ACTOR_SHIFT
+
+    # -----------------------------------------------------------------------
+    def team(self, x, y):
+        return (self.cells[y * SQUARE_COUNT + x] >> TEAM_SHIFT) & 3
+
+    # -----------------------------------------------------------------------
+    def angle(self, x, y):
+        return self.cells[y * SQUARE_COUNT + x] & ANGLE_MASK
+
+    # -----------------------------------------------------------------------
+    def __eq__(self, other):
+        if not isinstance(other, Board):
+            return NotImplemented
+        return self.cells == other.cells
+
+    # -----------------------------------------------------------------------
+    def __hash__(self):
+        return self.hash
+
+    # -----------------------------------------------------------------------
+    def __repr__(self):
+        return self.cells.hex()
@@ -3,6 +3,9 @@
 #
 # History
 #  1 Nov 2022 Mike Christle     Created
+# 18 Oct 2026                   Pack cells one byte per square in a Board
+#                               Changes update the Board's Zobrist hash
+#                               Add LASER_CELL
 # ---------------------------------------------------------------------------
 # MIT Licence
 # Copyright 2022 Mike Christle
@@ -25,6 +28,17 @@
 # ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE
 # USE OR OTHER DEALINGS IN THE SOFTWARE.
 # ---------------------------------------------------------------------------
+
+# Each square of the board is packed into one byte
+#   bits 0-2  angle
+#   bits 3-4  team
+#   bits 5-6  actor
+# An empty square is zero.
+ANGLE_MASK = 7
+TEAM_SHIFT = 3
+ACTOR_SHIFT = 5
+
+
 class Cell:
     EMPTY = 0
     MIRROR = 1
@@ -42,24 +56,43 @@ class Cell:
     _teams = ('None', 'Red', 'Green')
     _actors = ('Empty', 'Mirror', 'Laser')
 
+    # A Cell is a view of one square of a Board, it holds no state itself.
+    # Changes go through the board to keep its hash up to date.
+    __slots__ = ('board', 'index')
+
+    # -----------------------------------------------------------------------
+    def __init__(self, board, index):
+        self.board = board
+        self.index = index
+
     # -----------------------------------------------------------------------
-    def __init__(self):
-        self.actor = Cell.EMPTY
-        self.team = Cell.NO_TEAM
-        self.angle = 0
-        self.selected = False
+    @property
+    def actor(self):
+        return self.board.cells[self.index] >> ACTOR_SHIFT
+
+    # -----------------------------------------------------------------------
+    @property
+    def team(self):
+        return (self.board.cells[self.index] >> TEAM_SHIFT) & 3
+
+    # -----------------------------------------------------------------------
+    @property
+    def angle(self):
+        return self.board.cells[self.index] & ANGLE_MASK
+
+    @angle.setter
+    def angle(self, angle):
+        cell = self.board.cells[self.index]
+        self.board.put(self.index, (cell & ~ANGLE_MASK) | angle)
 
     # -----------------------------------------------------------------------
     def clear(self):
-        self.actor = Cell.EMPTY
-        self.selected = False
+        self.board.put(self.index, 0)
 
     # -----------------------------------------------------------------------
     def set(self, team, actor, angle):
-        self.team = team
-        self.actor = actor
-        self.angle = angle
-        self.selected = False
+        self.board.put(self.index,
+                       (actor << ACTOR_SHIFT) | (team << TEAM_SHIFT) | angle)
 
     # -----------------------------------------------------------------------
     # Move contents of a cell to a destination cell
@@ -67,16 +100,15 @@ class Cell:
     # Contents of cell0 are copied to cell1, then cell0 is cleared
     # -----------------------------------------------------------------------
     def move_to(self, to):
-        to.team = self.team
-        to.actor = self.actor
-        to.angle = self.angle
-        to.selected = False
-        self.actor = Cell.EMPTY
-        self.selected = False
+        to.board.put(to.index, self.board.cells[self.index])
+        self.board.put(self.index, 0)
 
     # -----------------------------------------------------------------------
     def __repr__(self):
         team = Cell._teams[self.team]
         actor = Cell._actors[self.actor]
-        return f'{team} {actor} {self.angle} {self.selected}'
+        return f'{team} {actor} {self.angle}'
+
 
+# Any cell at or above this value holds a laser cannon
+LASER_CELL = Cell.LASER << ACTOR_SHIFT
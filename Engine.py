@@ -0,0 +1,343 @@
+# ---------------------------------------------------------------------------
+# Laser Blast, Computer Player
+#
+# History
+# 18 Oct 2026                   Created
+#                               Stop a search on request, resume
+#                               an earlier search of the same position
+#                               Search with a given table, from a given depth
+# ---------------------------------------------------------------------------
+# MIT Licence
+# Copyright 2022 Mike Christle
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE
+# USE OR OTHER DEALINGS IN THE SOFTWARE.
+# ---------------------------------------------------------------------------
+
+from time import perf_counter
+from Cell import ACTOR_SHIFT, TEAM_SHIFT, LASER_CELL, Cell
+from Laser import trace_hit, HIT_EDGE
+from Moves import legal_moves, move_str, KIND_SHIFT, SRC_SHIFT, ARG_MASK, \
+                  FIRE, ROTATE
+import GameState
+
+
+WIN = 1000000           # Score of a won game, less the plies to win it
+WIN_LIMIT = WIN - 1000  # Scores beyond this are won or lost games
+LASER_VALUE = 1000      # Value of a laser cannon
+MIRROR_VALUE = 40       # Value of a mirror
+THREAT_VALUE = 300      # Value of a laser aimed at an enemy cannon
+
+# Transposition table entry flags
+EXACT = 0
+LOWER = 1       # Score is at least the stored score
+UPPER = 2       # Score is at most the stored score
+
+NO_MOVE = -1
+
+
+# Value of each packed cell from the red player's point of view
+def _cell_value(cell):
+    if cell == 0:
+        return 0
+    value = LASER_VALUE if cell >> ACTOR_SHIFT == Cell.LASER else MIRROR_VALUE
+    return value if (cell >> TEAM_SHIFT) & 3 == Cell.RED_TEAM else -value
+
+CELL_VALUES = tuple(_cell_value(cell) for cell in range(256))
+
+
+# ---------------------------------------------------------------------------
+def evaluate(game):
+    """
+    Score a position from the point of view of the player to move.
+    Material, plus a bonus for each laser that would hit an enemy cannon
+    if fired now, doubled for the player to move who can fire first.
+    """
+
+    cells = game.board.cells
+    score = sum(map(CELL_VALUES.__getitem__, cells))
+
+    for sq in range(81):
+        cell = cells[sq]
+        if cell < LASER_CELL:
+            continue
+        outcome, hit = trace_hit(cells, sq)
+        if outcome == HIT_EDGE or hit < 0 or hit == sq:
+            continue
+        team = (cell >> TEAM_SHIFT) & 3
+        if (cells[hit] >> TEAM_SHIFT) & 3 == team:
+            continue
+        threat = THREAT_VALUE * 2 if team == game.player else THREAT_VALUE
+        score += threat if team == Cell.RED_TEAM else -threat
+
+    return score if game.player == Cell.RED_TEAM else -score
+
+
+# ---------------------------------------------------------------------------
+class SearchTimeout(Exception):
+    pass
+
+
+# ---------------------------------------------------------------------------
+class TranspositionTable:
+    """
+    A fixed size table of search results, indexed by the low bits of
+    the position key. An entry is replaced by a search of the same or
+    greater depth, or by any search once the entry is from an older move.
+    """
+
+    __slots__ = ('mask', 'entries', 'generation')
+
+    # -----------------------------------------------------------------------
+    def __init__(self, bits = 18):
+        self.mask = (1 << bits) - 1
+        self.entries = [None] * (1 << bits)
+        self.generation = 0
+
+    # -----------------------------------------------------------------------
+    def new_search(self):
+        self.generation += 1
+
+    # -----------------------------------------------------------------------
+    def probe(self, key):
+        """Return (depth, flag, score, move) for key, or None."""
+
+        entry = self.entries[key & self.mask]
+        if entry is not None and entry[0] == key:
+            return entry[1:5]
+        return None
+
+    # -----------------------------------------------------------------------
+    def store(self, key, depth, flag, score, move):
+        index = key & self.mask
+        entry = self.entries[index]
+        if entry is None or entry[0] == key or depth >= entry[1] \
+                or entry[5] != self.generation:
+            self.entries[index] = (key, depth, flag, score, move,
+                                   self.generation)
+
+
+# ---------------------------------------------------------------------------
+class SearchResult:
+    """The result of a search, with statistics for reporting."""
+
+    __slots__ = ('move', 'score', 'depth', 'nodes', 'seconds', 'reused')
+
+    def __init__(self, move, score, depth, nodes, seconds, reused = 0):
+        self.move = move
+        self.score = score
+        self.depth = depth
+        self.nodes = nodes
+        self.seconds = seconds
+        self.reused = reused    # Depth carried over from an earlier search
+
+    def nps(self):
+        return self.nodes / self.seconds if self.seconds > 0 else 0
+
+    def __repr__(self):
+        return (f'{move_str(self.move)} score {self.score} '
+                f'depth {self.depth} nodes {self.nodes} '
+                f'{self.nps():.0f} nodes/s'
+                + (f' reused depth {self.reused}' if self.reused else ''))
+
+
+# ---------------------------------------------------------------------------
+class Engine:
+    """
+    Computer player, an iterative deepening alpha-beta search
+    over single actions. Both actions of a turn are plies, and the
+    score is only negated when the turn passes to the other player.
+    The last result is kept, so a search of the position searched last,
+    such as a ponder hit, carries on from the depth already reached.
+    """
+
+    # -----------------------------------------------------------------------
+    def __init__(self, tt_bits = 18, tt = None):
+        self.tt = TranspositionTable(tt_bits) if tt is None else tt
+        self.nodes = 0
+        self.deadline = 0.0
+        self.stop = None
+        self.last_key = None
+        self.last = None
+
+    # -----------------------------------------------------------------------
+    def search(self, game, seconds = 2.0, max_depth = 64, stop = None,
+               min_depth = 1):
+        """
+        Search for the best move for the player to move in game,
+        for up to seconds of wall clock time, or until stop() returns
+        True if stop is given. The game is not changed.
+        Iterations start at min_depth.
+        Return a SearchResult from the deepest completed iteration.
+        """
+
+        game = game.copy()
+        start = perf_counter()
+        self.deadline = start + seconds
+        self.stop = stop
+        self.nodes = 0
+        self.tt.new_search()
+
+        moves = legal_moves(game)
+        key = game.key()
+        if key == self.last_key and self.last.depth > 0:
+            last = self.last
+            result = SearchResult(last.move, last.score, last.depth, 0, 0.0,
+                                  last.depth)
+            if abs(last.score) > WIN_LIMIT:
+                max_depth = last.depth
+        else:
+            result = SearchResult(moves[0] if moves else NO_MOVE, 0, 0, 0, 0.0)
+        self.last_key = key
+        self.last = result
+
+        for depth in range(max(result.depth + 1, min_depth), max_depth + 1):
+            try:
+                score = self._search(game, depth, -WIN, WIN, 0)
+            except SearchTimeout:
+                break
+            entry = self.tt.probe(game.key())
+            move = entry[3] if entry is not None else result.move
+            result = SearchResult(move, score, depth, self.nodes,
+                                  perf_counter() - start, result.reused)
+            self.last = result
+
+            # No need to look further once the game is decided
+            if abs(score) > WIN_LIMIT or len(moves) < 2:
+                break
+
+        result.nodes = self.nodes
+        result.seconds = perf_counter() - start
+        return result
+
+    # -----------------------------------------------------------------------
+    def _search(self, game, depth, alpha, beta, ply):
+        self.nodes += 1
+        if not self.nodes & 1023 and (perf_counter() > self.deadline or
+                                      self.stop is not None and self.stop()):
+            raise SearchTimeout()
+
+        # A finished game is lost by the player with no lasers left
+        if game.state == GameState.END:
+            if game.player == Cell.RED_TEAM:
+                lost = game.red_laser_count == 0
+            else:
+                lost = game.grn_laser_count == 0
+            return ply - WIN if lost else WIN - ply
+
+        if depth == 0:
+            return evaluate(game)
+
+        key = game.key()
+        tt_move = NO_MOVE
+        entry = self.tt.probe(key)
+        if entry is not None:
+            tt_depth, flag, score, tt_move = entry
+            if tt_depth >= depth and ply > 0:
+                score = _score_from_tt(score, ply)
+                if flag == EXACT:
+                    return score
+                if flag == LOWER and score >= beta:
+                    return score
+                if flag == UPPER and score <= alpha:
+                    return score
+
+        original_alpha = alpha
+        best_score = -WIN
+        best_move = NO_MOVE
+        player = game.player
+
+        for move in order_moves(game, legal_moves(game), tt_move):
+            game.make_move(move)
+            if game.player == player:
+                score = self._search(game, depth - 1, alpha, beta, ply + 1)
+            else:
+                score = -self._search(game, depth - 1, -beta, -alpha, ply + 1)
+            game.unmake_move()
+
+            if score > best_score:
+                best_score = score
+                best_move = move
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+
+        if best_score <= original_alpha:
+            flag = UPPER
+        elif best_score >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.tt.store(key, depth, flag, _score_to_tt(best_score, ply),
+                      best_move)
+        return best_score
+
+
+# ---------------------------------------------------------------------------
+def order_moves(game, moves, tt_move):
+    """
+    Sort moves best first: the table move, then lasers fired
+    at enemy cannons, then at enemy mirrors, then rotations,
+    then steps and jumps, then lasers fired at friendly pieces.
+    """
+
+    cells = game.board.cells
+    player = game.player
+    keyed = []
+
+    for move in moves:
+        kind = move >> KIND_SHIFT
+        if move == tt_move:
+            order = 4000
+        elif kind == FIRE:
+            outcome, hit = trace_hit(cells, (move >> SRC_SHIFT) & ARG_MASK)
+            if hit < 0 or (cells[hit] >> TEAM_SHIFT) & 3 == player:
+                order = -1000
+            elif outcome == HIT_EDGE:
+                order = 1000
+            else:
+                order = 3000
+        elif kind == ROTATE:
+            order = 10
+        else:
+            order = 0
+        keyed.append((order, move))
+
+    keyed.sort(reverse = True)
+    return [move for _, move in keyed]
+
+
+# ---------------------------------------------------------------------------
+def _score_to_tt(score, ply):
+    """Store won and lost scores relative to the position, not the root."""
+
+    if score > WIN_LIMIT:
+        return score + ply
+    if score < -WIN_LIMIT:
+        return score - ply
+    return score
+
+
+# ---------------------------------------------------------------------------
+def _score_from_tt(score, ply):
+    if score > WIN_LIMIT:
+        return score - ply
+    if score < -WIN_LIMIT:
+        return score + ply
+    return score
@@ -7,6 +7,16 @@
 # 15 Nov 2022 Mike Christle     Switch to 9x9 square grid
 #                               Allow laser cannons to fire diagonally
 # 16 Jun 2023 Mike Christle     Clear board before new game
+# 18 Oct 2026                   Remove Paint dependency, headless engine
+#                               Move game state into the Game class
+#                               Store the grid in a packed Board
+#                               Trace the laser with Laser.trace
+#                               Nothing is destroyed if the beam loops
+#                               Legal move generator, make and unmake moves
+#                               Zobrist key of the position
+#                               Copy a game, play a move from any player
+#                               Add the on_play hook
+#                               Play keeps no undo records, on_new_game hook
 # ---------------------------------------------------------------------------
 # MIT Licence
 # Copyright 2022 Mike Christle
@@ -31,9 +41,14 @@
 # ---------------------------------------------------------------------------
 
 import GameState
+import Moves
 
-from Paint import fire_laser, laser_path_append
-from Cell import Cell
+from Board import Board
+from Cell import Cell, ANGLE_MASK, TEAM_SHIFT
+from GameState import SQUARE_COUNT
+from Laser import trace, trace_hit, HIT_EDGE, BEAM_LOOP
+from Moves import legal_moves, KIND_SHIFT, SRC_SHIFT, ARG_MASK
+from Zobrist import CELL_KEYS, TURN_KEYS
 
 
 # Initial location of mirrors
@@ -41,339 +56,352 @@ INIT_MIRRORS = ((1, 0, 6), (2, 1, 4), (1, 2, 2),
                 (1, 3, 6), (2, 4, 4), (1, 5, 2),
                 (1, 6, 6), (2, 7, 4), (1, 8, 2))
 
-# New direction of beam after hitting a mirror
-#          000 022 045 068 090 112 135 158
-NEW_DIR = ((9,  3,  2,  1,  8,  7,  6,  5),  # 0 N       8 = Hit mirror edge
-           (3,  2,  8,  0,  7,  6,  9,  4),  # 1 NE      9 = Hit laser
-           (8,  1,  0,  7,  9,  5,  4,  3),  # 2 E
-           (1,  0,  9,  6,  5,  4,  8,  2),  # 3 SE
-           (9,  7,  6,  5,  8,  3,  2,  1),  # 4 S
-           (7,  6,  8,  4,  3,  2,  9,  0),  # 5 SW
-           (8,  5,  4,  3,  9,  1,  0,  7),  # 6 W
-           (5,  4,  9,  2,  1,  0,  8,  6))  # 7 NW
-
-select_x = 0        # Coordinates of selected piece
-select_y = 0
-hit_x = -1          # Coordinates of piece hit by a laser beam
-hit_y = -1
-move_count = 0      # Count of moves for each payers turn
-
-
-# ---------------------------------------------------------------------------
-def init_game():
-    """Initialize the board and game state for a new game."""
-
-    global move_count
-
-    # Clear cells from previous game
-    for row in GameState.grid:
-        for cell in row:
-            cell.clear()
-
-    # Place laser cannons on grid
-    x = GameState.SQUARE_COUNT - 1
-    for y in range(1, GameState.SQUARE_COUNT, 3):
-        GameState.grid[y][0].set(Cell.RED_TEAM, Cell.LASER, Cell.RIGHT)
-        GameState.grid[y][x].set(Cell.GRN_TEAM, Cell.LASER, Cell.LEFT)
-
-    # place mirrors on grid
-    for x, y, angle in INIT_MIRRORS:
-        GameState.grid[y][x].set(Cell.RED_TEAM, Cell.MIRROR, angle)
-        x = x + 8 - (x << 1)
-        if angle != 4: angle ^= 4
-        GameState.grid[y][x].set(Cell.GRN_TEAM, Cell.MIRROR, angle)
-
-    # The loser of last game gets first move
-    if GameState.grn_laser_count == 0:
-        GameState.player = Cell.RED_TEAM
-    else:
-        GameState.player = Cell.GRN_TEAM
-
-    # Reset counts
-    move_count = 2
-    GameState.red_laser_count = 3
-    GameState.grn_laser_count = 3
-    GameState.state = GameState.WAIT
-
-    # Reset the cursor
-    GameState.cursor_x = 4
-    GameState.cursor_y = 4
-
-
 # ---------------------------------------------------------------------------
-def find_laser_path():
+class Game:
     """
-    Trace the path of a laser beam starting with the selected laser.
-    Set hit x and y if something is destroyed.
+    One game of Laser Blast.
+    Each game owns its board, cursor, counters and selection,
+    so a single process can host any number of games.
+    A game uses about 500 bytes, and about 550 in play, as play keeps
+    no undo records, see "python Benchmark.py memory".
     """
 
-    global hit_x, hit_y, select_x, select_y
-
-    hit_x = hit_y = -1
-    x = select_x
-    y = select_y
-    direction = GameState.grid[y][x].angle
-
-    while True:
-
-        # Save current coordinates
-        laser_path_append(x, y)
-
-        # Get the current cell
-        cell = GameState.grid[y][x]
-
-        # If current cell is a mirror, get new direction of travel
-        if cell.actor == Cell.MIRROR:
-            direction = NEW_DIR[direction][cell.angle]
-
-        # Advance to next cell
-        match direction:
-            case GameState.N:
-                y -= 1
-            case GameState.NE:
-                x += 1
-                y -= 1
-            case GameState.E:
-                x += 1
-            case GameState.SE:
-                x += 1
-                y += 1
-            case GameState.S:
-                y += 1
-            case GameState.SW:
-                y += 1
-                x -= 1
-            case GameState.W:
-                x -= 1
-            case GameState.NW:
-                x -= 1
-                y -= 1
-            case 8: # Hit edge of a mirror
-                hit_x = x
-                hit_y = y
-                return
-            case 9: # Hit face of a mirror
-                hit_mirror_face(x, y)
-                return
-
-        # If laser hits a border mirror
-        match [direction, y, x]:
-            case [GameState.NW, -1, -1]: # Top left corner
-                hit_mirror_face(x, y)
-                return
-            case [GameState.NW, -1, _]: # Top side
-                laser_path_append(x, y)
-                laser_path_append(x + 1, y)
-                y += 1
-                direction = GameState.SW
-            case [GameState.NW, _, -1]: # Left side
-                laser_path_append(x, y)
-                laser_path_append(x, y + 1)
-                x += 1
-                direction = GameState.NE
-
-            case [GameState.NE, -1, GameState.SQUARE_COUNT]: # Top right corner
-                hit_mirror_face(x, y)
-                return
-            case [GameState.NE, -1, _]: # Top side
-                laser_path_append(x, y)
-                laser_path_append(x - 1, y)
-                y += 1
-                direction = GameState.SE
-            case [GameState.NE, _, GameState.SQUARE_COUNT]: # Right side
-                laser_path_append(x, y)
-                laser_path_append(x, y + 1)
-                x -= 1
-                direction = GameState.NW
-
-            case [GameState.SW, GameState.SQUARE_COUNT, -1]: # Bottom left corner
-                hit_mirror_face(x, y)
-                return
-            case [GameState.SW, GameState.SQUARE_COUNT, _]: # Bottom side
-                laser_path_append(x, y)
-                laser_path_append(x + 1, y)
-                y -= 1
-                direction = GameState.NW
-            case [GameState.SW, _, -1]: # Left side
-                laser_path_append(x, y)
-                laser_path_append(x, y - 1)
-                x += 1
-                direction = GameState.SE
-
-            case [GameState.SE, GameState.SQUARE_COUNT, GameState.SQUARE_COUNT]: # Bottom right corner
-                hit_mirror_face(x, y)
-                return
-            case [GameState.SE, GameState.SQUARE_COUNT, _]: # Bottom side
-                laser_path_append(x, y)
-                laser_path_append(x - 1, y)
-                y -= 1
-                direction = GameState.NE
-            case [GameState.SE, _, GameState.SQUARE_COUNT]: # Right side
-                laser_path_append(x, y)
-                laser_path_append(x, y - 1)
-                x -= 1
-                direction = GameState.SW
-
-            case [GameState.N, -1, _]: # Top side
-                hit_mirror_face(x, y)
-                return
-            case [GameState.S, GameState.SQUARE_COUNT, _]: # Bottom side
-                hit_mirror_face(x, y)
-                return
-            case [GameState.W, _, -1]: # Left side
-                hit_mirror_face(x, y)
-                return
-            case [GameState.E, _, GameState.SQUARE_COUNT]: # Right side
-                hit_mirror_face(x, y)
-                return
-
-            # If laser beam hits a laser gun
-        cell = GameState.grid[y][x]
-        if cell.actor == Cell.LASER:
-            select_x = x
-            select_y = y
-            hit_mirror_face(x, y)
-            return
-
-
-# ---------------------------------------------------------------------------
-def hit_mirror_face(x, y):
-    global hit_x, hit_y
-
-    laser_path_append(x, y)
-    hit_x = select_x
-    hit_y = select_y
-    if GameState.grid[select_y][select_x].team == Cell.RED_TEAM:
-        GameState.red_laser_count -= 1
-    else:
-        GameState.grn_laser_count -= 1
-
-
-# ---------------------------------------------------------------------------
-def click():
-    """Process player actions."""
-
-    # If in wait state
-    if GameState.state == GameState.WAIT:
-        click_wait()
-
-    # If in action state and clicked on board
-    elif GameState.cursor_x < 9:
-        click_move()
-
-    # If in action state and clicked on right most column
-    else:
-        click_action()
-
-
-# ---------------------------------------------------------------------------
-def click_wait():
-    """Process selection of a game piece."""
-
-    global select_x, select_y
-
-    if GameState.cursor_x < 9:
-        cell = GameState.grid[GameState.cursor_y][GameState.cursor_x]
-        if cell.team == GameState.player:
-            cell.selected = True
-            select_x = GameState.cursor_x
-            select_y = GameState.cursor_y
-            GameState.state = GameState.ACTION
-
-
-# ---------------------------------------------------------------------------
-def click_action():
-    """Process the rotation of a game piece, or firing the laser."""
-
-    global move_count
-
-    selected = GameState.grid[select_y][select_x]
-
-    # If a mirror was selected
-    # And new angle is not the same current angle
-    if selected.actor == Cell.MIRROR:
-        if GameState.cursor_y < 8 and selected.angle != GameState.cursor_y:
-            # Change the angle of selected cell
-            selected.angle = GameState.cursor_y
-            selected.selected = False
-            move_count -= 1
-            action_taken()
-
-    # IF laser selected
-    # And fire laser button pressed
-    elif GameState.cursor_y == 8:
-        selected.selected = False
-        find_laser_path()
-        fire_laser()
-
-        # If something was hit, remove it from board
-        if hit_x != -1:
-            GameState.grid[hit_y][hit_x].clear()
-
-        move_count -= 1
-        action_taken()
-
-    # IF laser selected
-    # Rotate the laser
-    elif GameState.cursor_y < 8:
-        y = GameState.cursor_y
+    __slots__ = ('state', 'player', 'board', 'cursor_x', 'cursor_y',
+                 'grn_laser_count', 'red_laser_count',
+                 'select_x', 'select_y', 'hit_x', 'hit_y',
+                 'move_count', 'laser_path', 'history', 'on_fire', 'on_play',
+                 'on_new_game')
+
+    # -----------------------------------------------------------------------
+    def __init__(self):
+        # State of play
+        self.state = GameState.WAIT
+        self.player = Cell.RED_TEAM
+
+        # The board stores the state of the playing board
+        self.board = Board()
+
+        # Location of the cursor on the board
+        self.cursor_x = 0
+        self.cursor_y = 0
+
+        # Count of each players lasers
+        self.grn_laser_count = 0
+        self.red_laser_count = 0
+
+        self.select_x = 0       # Coordinates of selected piece
+        self.select_y = 0
+        self.hit_x = -1         # Coordinates of piece hit by a laser beam
+        self.hit_y = -1
+        self.move_count = 0     # Count of moves for each payers turn
+        self.laser_path = []    # Path of the last laser beam in grid coordinates
+        self.history = []       # Undo stack of moves made by make_move
+
+        # Front end hook, called with this game when a laser is fired.
+        # The engine never imports pygame, so a display is optional.
+        self.on_fire = None
+
+        # Hook called with this game and each move taken by play,
+        # before it is made, for example to record the game
+        self.on_play = None
+
+        # Hook called with this game at the end of init_game
+        self.on_new_game = None
+
+    # -----------------------------------------------------------------------
+    def copy(self):
+        """
+        Return a copy of the game position, for a search to work on.
+        The history and front end hook are not copied.
+        """
+
+        game = Game()
+        game.board = self.board.copy()
+        game.state = GameState.WAIT if self.state == GameState.ACTION \
+                     else self.state
+        game.player = self.player
+        game.move_count = self.move_count
+        game.red_laser_count = self.red_laser_count
+        game.grn_laser_count = self.grn_laser_count
+        return game
+
+    # -----------------------------------------------------------------------
+    def init_game(self):
+        """Initialize the board and game state for a new game."""
+
+        board = self.board
+
+        # Clear cells from previous game
+        board.clear()
+        self.history.clear()
+
+        # Place laser cannons on grid
+        x = SQUARE_COUNT - 1
+        for y in range(1, SQUARE_COUNT, 3):
+            board.set(0, y, Cell.RED_TEAM, Cell.LASER, Cell.RIGHT)
+            board.set(x, y, Cell.GRN_TEAM, Cell.LASER, Cell.LEFT)
+
+        # place mirrors on grid
+        for x, y, angle in INIT_MIRRORS:
+            board.set(x, y, Cell.RED_TEAM, Cell.MIRROR, angle)
+            x = x + 8 - (x << 1)
+            if angle != 4: angle ^= 4
+            board.set(x, y, Cell.GRN_TEAM, Cell.MIRROR, angle)
+
+        # The loser of last game gets first move
+        if self.grn_laser_count == 0:
+            self.player = Cell.RED_TEAM
+        else:
+            self.player = Cell.GRN_TEAM
+
+        # Reset counts
+        self.move_count = 2
+        self.red_laser_count = 3
+        self.grn_laser_count = 3
+        self.state = GameState.WAIT
+
+        # Reset the cursor
+        self.cursor_x = 4
+        self.cursor_y = 4
+
+        if self.on_new_game is not None:
+            self.on_new_game(self)
+
+    # -----------------------------------------------------------------------
+    def find_laser_path(self):
+        """
+        Trace the path of a laser beam starting with the selected laser.
+        Set hit x and y to the piece that would be destroyed,
+        or to -1 if the beam loops forever. The board is not changed.
+        """
+
+        outcome, hit, self.laser_path = trace(
+            self.board.cells, self.select_y * SQUARE_COUNT + self.select_x)
+
+        if outcome == BEAM_LOOP:
+            self.hit_x = self.hit_y = -1
+        else:
+            self.hit_y, self.hit_x = divmod(hit, SQUARE_COUNT)
+
+    # -----------------------------------------------------------------------
+    def key(self):
+        """
+        Return the 64 bit Zobrist key of the position, the board hash
+        combined with the player to move and the remaining move count.
+        """
+
+        return self.board.hash ^ TURN_KEYS[(self.player << 2) | self.move_count]
+
+    # -----------------------------------------------------------------------
+    def legal_moves(self):
+        """Return a list of every legal move for the player to move."""
+
+        return legal_moves(self)
+
+    # -----------------------------------------------------------------------
+    def make_move(self, move):
+        """
+        Take an action, a move from the Moves module, for the player
+        to move. The board is changed in place and enough is saved
+        on the history stack for unmake_move to restore it.
+        """
+
+        board = self.board
+        cells = board.cells
+        kind = move >> KIND_SHIFT
+        src = (move >> SRC_SHIFT) & ARG_MASK
+        arg = move & ARG_MASK
+
+        # Find what a laser would destroy
+        if kind == Moves.FIRE:
+            outcome, hit = trace_hit(cells, src)
+            hit_cell = cells[hit] if hit >= 0 else 0
+        else:
+            hit = -1
+            hit_cell = 0
+
+        self.history.append((move, self.player, self.move_count, self.state,
+                             self.red_laser_count, self.grn_laser_count,
+                             board.hash, cells[src], hit, hit_cell))
+
+        # The board hash is updated here rather than through
+        # Board.move and Board.put, as this is the search hot path
+        cell = cells[src]
+        match kind:
+            case Moves.STEP:
+                board.hash ^= CELL_KEYS[(src << 7) | cell] ^ \
+                              CELL_KEYS[(arg << 7) | cell]
+                cells[arg] = cell
+                cells[src] = 0
+                self.move_count -= 1
+
+            case Moves.JUMP:
+                board.hash ^= CELL_KEYS[(src << 7) | cell] ^ \
+                              CELL_KEYS[(arg << 7) | cell]
+                cells[arg] = cell
+                cells[src] = 0
+                self.move_count -= 2
+
+            case Moves.ROTATE:
+                new_cell = (cell & ~ANGLE_MASK) | arg
+                board.hash ^= CELL_KEYS[(src << 7) | cell] ^ \
+                              CELL_KEYS[(src << 7) | new_cell]
+                cells[src] = new_cell
+                self.move_count -= 1
+
+            case _: # Fire
+                if hit >= 0:
+                    # If a laser cannon was destroyed, update the counts
+                    if outcome != HIT_EDGE:
+                        if (hit_cell >> TEAM_SHIFT) & 3 == Cell.RED_TEAM:
+                            self.red_laser_count -= 1
+                        else:
+                            self.grn_laser_count -= 1
+                    board.hash ^= CELL_KEYS[(hit << 7) | hit_cell]
+                    cells[hit] = 0
+                self.move_count -= 1
+
+        if board.VERIFY_HASH: board.check_hash()
+        self.action_taken()
+
+    # -----------------------------------------------------------------------
+    def unmake_move(self):
+        """Take back the last move made by make_move."""
+
+        board = self.board
+        (move, self.player, self.move_count, self.state,
+         self.red_laser_count, self.grn_laser_count,
+         board.hash, src_cell, hit, hit_cell) = self.history.pop()
+
+        # The saved hash is restored, so the cells can be written directly
+        cells = board.cells
+        src = (move >> SRC_SHIFT) & ARG_MASK
+        if move >> KIND_SHIFT < Moves.ROTATE:
+            cells[move & ARG_MASK] = 0
+        cells[src] = src_cell
+        if hit >= 0:
+            cells[hit] = hit_cell
+
+        if board.VERIFY_HASH: board.check_hash()
+
+    # -----------------------------------------------------------------------
+    def play(self, move):
+        """
+        Take an action from a player, a click or a computer player.
+        A fired laser is traced for the on_fire hook before the hit
+        piece is removed, and the cursor is reset when the turn passes.
+        No undo record is kept, so a game in play does not grow.
+        """
+
+        player = self.player
+
+        if move >> KIND_SHIFT == Moves.FIRE:
+            self.select_y, self.select_x = \
+                divmod((move >> SRC_SHIFT) & ARG_MASK, SQUARE_COUNT)
+            self.find_laser_path()
+            if self.on_fire is not None:
+                self.on_fire(self)
+
+        if self.on_play is not None:
+            self.on_play(self, move)
+        self.make_move(move)
+        self.history.pop()
+
+        # Reset the cursor for the next player
+        if self.player != player:
+            self.cursor_x = 4
+            self.cursor_y = 4
+
+    # -----------------------------------------------------------------------
+    def click(self):
+        """Process player actions."""
+
+        # If in wait state
+        if self.state == GameState.WAIT:
+            self.click_wait()
+
+        # If in action state and clicked on board
+        elif self.cursor_x < 9:
+            self.click_move()
+
+        # If in action state and clicked on right most column
+        else:
+            self.click_action()
+
+    # -----------------------------------------------------------------------
+    def click_wait(self):
+        """Process selection of a game piece."""
+
+        if self.cursor_x < 9:
+            if self.board.team(self.cursor_x, self.cursor_y) == self.player:
+                self.select_x = self.cursor_x
+                self.select_y = self.cursor_y
+                self.state = GameState.ACTION
+
+    # -----------------------------------------------------------------------
+    def click_action(self):
+        """Process the rotation of a game piece, or firing the laser."""
+
+        selected = self.board.cell(self.select_x, self.select_y)
+        src = self.select_y * SQUARE_COUNT + self.select_x
+
+        # If a mirror was selected
         # And new angle is not the same current angle
-        if selected.angle != y:
-            selected.angle = y
-            selected.selected = False
-            move_count -= 1
-            action_taken()
-
-
-# ---------------------------------------------------------------------------
-def click_move():
-    """Process the moving of a game piece."""
-
-    global move_count
-
-    selected = GameState.grid[select_y][select_x]
-    cell = GameState.grid[GameState.cursor_y][GameState.cursor_x]
-
-    # Move a red or green piece
-    dx = abs(select_x - GameState.cursor_x)
-    dy = abs(select_y - GameState.cursor_y)
-
-    # If click on selected piece, deselect the piece
-    if dx == 0 and dy == 0:
-        selected.selected = False
-        action_taken()
-
-    # If click on empty cell
-    elif cell.actor == Cell.EMPTY:
-        # Move one space
-        if dx < 2 and dy < 2:
-            move_count -= 1
-            selected.move_to(cell)
-            action_taken()
-        # Move two spaces
-        elif move_count == 2 and dx < 3 and dy < 3:
-            move_count -= 2
-            selected.move_to(cell)
-            action_taken()
-
-
-# ---------------------------------------------------------------------------
-def action_taken():
-    """Update the game state if an action is taken."""
-
-    global move_count
-
-    GameState.state = GameState.WAIT
-
-    if move_count == 0:
-        move_count = 2
-        GameState.cursor_x = 4
-        GameState.cursor_y = 4
-        match GameState.player:
-            case Cell.RED_TEAM:
-                GameState.player = Cell.GRN_TEAM
-            case Cell.GRN_TEAM:
-                GameState.player = Cell.RED_TEAM
-
-    if GameState.red_laser_count == 0 or GameState.grn_laser_count == 0:
-        GameState.state = GameState.END
+        if selected.actor == Cell.MIRROR:
+            if self.cursor_y < 8 and selected.angle != self.cursor_y:
+                # Change the angle of selected cell
+                self.play(Moves.make(Moves.ROTATE, src, self.cursor_y))
+
+        # IF laser selected
+        # And fire laser button pressed
+        elif self.cursor_y == 8:
+            self.play(Moves.make(Moves.FIRE, src))
+
+        # IF laser selected
+        # Rotate the laser
+        elif self.cursor_y < 8:
+            y = self.cursor_y
+            # And new angle is not the same current angle
+            if selected.angle != y:
+                self.play(Moves.make(Moves.ROTATE, src, y))
+
+    # -----------------------------------------------------------------------
+    def click_move(self):
+        """Process the moving of a game piece."""
+
+        src = self.select_y * SQUARE_COUNT + self.select_x
+        dst = self.cursor_y * SQUARE_COUNT + self.cursor_x
+
+        # Move a red or green piece
+        dx = abs(self.select_x - self.cursor_x)
+        dy = abs(self.select_y - self.cursor_y)
+
+        # If click on selected piece, deselect the piece
+        if dx == 0 and dy == 0:
+            self.state = GameState.WAIT
+
+        # If click on empty cell
+        elif self.board.cells[dst] == 0:
+            # Move one space
+            if dx < 2 and dy < 2:
+                self.play(Moves.make(Moves.STEP, src, dst))
+            # Move two spaces
+            elif self.move_count == 2 and dx < 3 and dy < 3:
+                self.play(Moves.make(Moves.JUMP, src, dst))
+
+    # -----------------------------------------------------------------------
+    def action_taken(self):
+        """Update the game state if an action is taken."""
+
+        self.state = GameState.WAIT
+
+        if self.move_count == 0:
+            self.move_count = 2
+            match self.player:
+                case Cell.RED_TEAM:
+                    self.player = Cell.GRN_TEAM
+                case Cell.GRN_TEAM:
+                    self.player = Cell.RED_TEAM
+
+        if self.red_laser_count == 0 or self.grn_laser_count == 0:
+            self.state = GameState.END
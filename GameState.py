@@ -5,6 +5,8 @@
 #  1 Nov 2022 Mike Christle     Created
 # 14 Nov 2022 Mike Christle     Add mirrors to the borders
 # 15 Nov 2022 Mike Christle     Switch to 9x9 square grid
+# 18 Oct 2026                   Move game state into GameLogic.Game
+#                               Add RULES_VERSION
 # ---------------------------------------------------------------------------
 # MIT Licence
 # Copyright 2022 Mike Christle
@@ -28,9 +30,6 @@
 # USE OR OTHER DEALINGS IN THE SOFTWARE.
 # ---------------------------------------------------------------------------
 
-from Cell import Cell
-
-
 N  = 0
 NE = 1
 E  = 2
@@ -44,18 +43,9 @@ END = 0     # End of game, one player lost all lasers
 WAIT = 1    # Waiting for the red player to select a piece
 ACTION = 3  # Waiting for player to select an action
 
-# State of play
-state = WAIT
-player = Cell.RED_TEAM
-
-# The grid stores the state of the playing board
+# Size of the playing board, the per game state is in GameLogic.Game
 SQUARE_COUNT = 9
-grid = [[Cell() for _ in range(SQUARE_COUNT)] for _ in range(SQUARE_COUNT)]
-
-# Location of the cursor on the board
-cursor_x = 0
-cursor_y = 0
 
-# Count of each players lasers
-grn_laser_count = 0
-red_laser_count = 0
+# Version of the rules, saved in game records.
+# Change it when a rule changes, so old records are not replayed wrongly.
+RULES_VERSION = 1
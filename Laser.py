@@ -0,0 +1,331 @@
+# ---------------------------------------------------------------------------
+# Laser Blast, Laser Tracer
+#
+# History
+# 18 Oct 2026                   Created
+#                               Add trace_squares for the threat map
+# ---------------------------------------------------------------------------
+# MIT Licence
+# Copyright 2022 Mike Christle
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE
+# USE OR OTHER DEALINGS IN THE SOFTWARE.
+# ---------------------------------------------------------------------------
+
+from Cell import ANGLE_MASK, LASER_CELL
+from GameState import SQUARE_COUNT, NE, SE, SW, NW
+
+
+# New direction of beam after hitting a mirror
+#          000 022 045 068 090 112 135 158
+NEW_DIR = ((9,  3,  2,  1,  8,  7,  6,  5),  # 0 N       8 = Hit mirror edge
+           (3,  2,  8,  0,  7,  6,  9,  4),  # 1 NE      9 = Hit laser
+           (8,  1,  0,  7,  9,  5,  4,  3),  # 2 E
+           (1,  0,  9,  6,  5,  4,  8,  2),  # 3 SE
+           (9,  7,  6,  5,  8,  3,  2,  1),  # 4 S
+           (7,  6,  8,  4,  3,  2,  9,  0),  # 5 SW
+           (8,  5,  4,  3,  9,  1,  0,  7),  # 6 W
+           (5,  4,  9,  2,  1,  0,  8,  6))  # 7 NW
+
+# Outcome of a laser trace
+HIT_LASER = 0   # Beam hit a laser cannon, the cannon is destroyed
+HIT_EDGE = 1    # Beam hit the edge of a mirror, the mirror is destroyed
+HIT_FACE = 2    # Beam hit a mirror face, the firing cannon is destroyed
+BEAM_LOOP = 3   # Beam repeats itself forever, nothing is destroyed
+
+# Step in x and y for each direction of travel
+DX = (0, 1, 1, 1, 0, -1, -1, -1)
+DY = (-1, -1, 0, 1, 1, 1, 0, -1)
+
+# Reflection off a border mirror, (direction, side) -> new direction
+_REFLECT = {(NW, 'top'): SW, (NW, 'left'): NE,
+            (NE, 'top'): SE, (NE, 'right'): NW,
+            (SW, 'bottom'): NW, (SW, 'left'): SE,
+            (SE, 'bottom'): NE, (SE, 'right'): SW}
+
+
+# Flag added to NEXT_STATE when a step bounces off a border mirror
+BORDER = 1 << 10
+FACE = BORDER | (BORDER - 1)
+
+
+# ---------------------------------------------------------------------------
+def _build_tables():
+    """
+    Build the step tables, indexed by beam state (square << 3) | direction.
+    NEXT_STATE is the state after one step. It has the BORDER flag added
+    if the beam bounced off a border mirror, and is FACE if the beam hit
+    a border mirror square on. BORDER_PATH holds the points where
+    the beam touched the border, in grid coordinates.
+    """
+
+    size = SQUARE_COUNT
+    next_state = []
+    border_path = []
+
+    for sq in range(size * size):
+        y0, x0 = divmod(sq, size)
+        for direction in range(8):
+            x = x0 + DX[direction]
+            y = y0 + DY[direction]
+
+            # Which borders were crossed
+            sides = []
+            if y < 0: sides.append('top')
+            if y >= size: sides.append('bottom')
+            if x < 0: sides.append('left')
+            if x >= size: sides.append('right')
+
+            if not sides:
+                next_state.append(((y * size + x) << 3) | direction)
+                border_path.append(None)
+
+            # Corners and square on hits reflect back to the cannon
+            elif len(sides) == 2 or (direction, sides[0]) not in _REFLECT:
+                next_state.append(FACE)
+                border_path.append(((x, y),))
+
+            # Bounce off a border, the beam comes back
+            # to the square next to where it left the board
+            else:
+                side = sides[0]
+                if side in ('top', 'bottom'):
+                    other = x - DX[direction], y
+                    y = y0
+                else:
+                    other = x, y - DY[direction]
+                    x = x0
+                new_dir = _REFLECT[direction, side]
+                next_state.append(BORDER | ((y * size + x) << 3) | new_dir)
+                border_path.append(((x0 + DX[direction], y0 + DY[direction]),
+                                    other))
+
+    return tuple(next_state), tuple(border_path)
+
+
+NEXT_STATE, BORDER_PATH = _build_tables()
+
+# NEW_DIR flattened, indexed by (direction << 3) | angle
+MIRROR_DIR = tuple(d for row in NEW_DIR for d in row)
+
+# Grid coordinates of each square
+POINTS = tuple(divmod(sq, SQUARE_COUNT)[::-1]
+               for sq in range(SQUARE_COUNT * SQUARE_COUNT))
+
+# Number of beam states. A beam that ends never repeats the state after
+# a turn, and there is a mirror and a border state for each beam state,
+# so this many turns is enough to trace any beam.
+STATES = SQUARE_COUNT * SQUARE_COUNT * 8
+MAX_TURNS = STATES * 2
+
+# Most beams end within a few turns, so the first turns of a trace
+# are run without loop detection.
+FAST_TURNS = 16
+
+
+# ---------------------------------------------------------------------------
+def trace(cells, sq, max_turns = MAX_TURNS, next_state = NEXT_STATE,
+          mirror_dir = MIRROR_DIR, points = POINTS):
+    """
+    Trace the beam of the laser cannon on square sq of a board's cells.
+    Return (outcome, hit square, path). The path is a list of grid
+    coordinates where the beam starts, turns and ends, including
+    the points where it touches the border mirrors.
+
+    A beam that repeats itself, or turns more than max_turns times,
+    ends with BEAM_LOOP and a hit square of -1. A beam goes straight
+    for less than SQUARE_COUNT steps, so this also bounds the steps.
+    The tables are bound as default arguments for speed.
+    """
+
+    path = [points[sq]]
+    start = sq
+    state = (sq << 3) | (cells[sq] & ANGLE_MASK)
+    turns = 0
+    limit = max_turns if max_turns < FAST_TURNS else FAST_TURNS
+
+    while True:
+
+        # Advance to next cell
+        index = state
+        state = next_state[index]
+        if state >= BORDER:
+            path.extend(BORDER_PATH[index])
+            if state == FACE:
+                return HIT_FACE, start, path
+            state -= BORDER
+            turns += 1
+            if turns >= limit:
+                return _trace_loop(cells, start, state, True,
+                                   max_turns - turns, path)
+
+        # Empty squares are zero
+        cell = cells[state >> 3]
+        if cell:
+            if cell >= LASER_CELL:
+                path.append(points[state >> 3])
+                return HIT_LASER, state >> 3, path
+
+            # Mirror, get new direction of travel
+            path.append(points[state >> 3])
+            direction = mirror_dir[((state & 7) << 3) | (cell & ANGLE_MASK)]
+            if direction == 8:
+                return HIT_EDGE, state >> 3, path
+            if direction == 9:
+                return HIT_FACE, start, path
+            state = (state & ~7) | direction
+            turns += 1
+            if turns >= limit:
+                return _trace_loop(cells, start, state, False,
+                                   max_turns - turns, path)
+
+
+# ---------------------------------------------------------------------------
+def trace_hit(cells, sq, max_turns = MAX_TURNS, next_state = NEXT_STATE,
+              mirror_dir = MIRROR_DIR):
+    """
+    Same as trace, without building the path.
+    Return (outcome, hit square).
+    """
+
+    start = sq
+    state = (sq << 3) | (cells[sq] & ANGLE_MASK)
+    turns = 0
+    limit = max_turns if max_turns < FAST_TURNS else FAST_TURNS
+
+    while True:
+        state = next_state[state]
+        if state >= BORDER:
+            if state == FACE:
+                return HIT_FACE, start
+            state -= BORDER
+            turns += 1
+            if turns >= limit:
+                return _trace_loop(cells, start, state, True,
+                                   max_turns - turns, None)[:2]
+
+        cell = cells[state >> 3]
+        if cell:
+            if cell >= LASER_CELL:
+                return HIT_LASER, state >> 3
+
+            direction = mirror_dir[((state & 7) << 3) | (cell & ANGLE_MASK)]
+            if direction == 8:
+                return HIT_EDGE, state >> 3
+            if direction == 9:
+                return HIT_FACE, start
+            state = (state & ~7) | direction
+            turns += 1
+            if turns >= limit:
+                return _trace_loop(cells, start, state, False,
+                                   max_turns - turns, None)[:2]
+
+
+# ---------------------------------------------------------------------------
+def trace_squares(cells, sq, next_state = NEXT_STATE,
+                  mirror_dir = MIRROR_DIR):
+    """
+    Same as trace_hit, also returning a bitmask of the squares the beam
+    passes through, bit y * 9 + x, including the cannon and the hit square.
+    Return (outcome, hit square, mask). The outcome depends only on the
+    cells of these squares.
+
+    The square and direction a beam arrives with decide where it arrives
+    next, so a beam that has not ended after STATES steps never will.
+    """
+
+    start = sq
+    state = (sq << 3) | (cells[sq] & ANGLE_MASK)
+    mask = 1 << sq
+
+    for _ in range(STATES):
+        state = next_state[state]
+        if state >= BORDER:
+            if state == FACE:
+                return HIT_FACE, start, mask
+            state -= BORDER
+
+        sq = state >> 3
+        mask |= 1 << sq
+        cell = cells[sq]
+        if cell:
+            if cell >= LASER_CELL:
+                return HIT_LASER, sq, mask
+            direction = mirror_dir[((state & 7) << 3) | (cell & ANGLE_MASK)]
+            if direction == 8:
+                return HIT_EDGE, sq, mask
+            if direction == 9:
+                return HIT_FACE, start, mask
+            state = (state & ~7) | direction
+
+    return BEAM_LOOP, -1, mask
+
+
+# ---------------------------------------------------------------------------
+def _trace_loop(cells, start, state, border, max_turns, path):
+    """
+    Continue a long trace with loop detection, from the state after
+    a turn. Border is True if that turn was a border bounce.
+    A beam can only repeat itself where it turns, so the state after
+    each mirror and each border bounce is kept in a bitset. Mirror states
+    use the low STATES bits, border states the high bits.
+    Path is None if the caller does not want the path.
+    """
+
+    visited = 1 << (state + STATES if border else state)
+
+    while max_turns > 0:
+
+        # After a border bounce the beam has already arrived in a cell
+        if border:
+            border = False
+        else:
+            index = state
+            state = NEXT_STATE[index]
+            if state >= BORDER:
+                if path is not None:
+                    path.extend(BORDER_PATH[index])
+                if state == FACE:
+                    return HIT_FACE, start, path
+                state -= BORDER
+                max_turns -= 1
+                bit = 1 << (state + STATES)
+                if visited & bit:
+                    return BEAM_LOOP, -1, path
+                visited |= bit
+
+        cell = cells[state >> 3]
+        if cell:
+            if path is not None:
+                path.append(POINTS[state >> 3])
+            if cell >= LASER_CELL:
+                return HIT_LASER, state >> 3, path
+
+            direction = MIRROR_DIR[((state & 7) << 3) | (cell & ANGLE_MASK)]
+            if direction == 8:
+                return HIT_EDGE, state >> 3, path
+            if direction == 9:
+                return HIT_FACE, start, path
+            state = (state & ~7) | direction
+            max_turns -= 1
+            bit = 1 << state
+            if visited & bit:
+                return BEAM_LOOP, -1, path
+            visited |= bit
+
+    return BEAM_LOOP, -1, path
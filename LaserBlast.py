@@ -6,6 +6,19 @@
 # 14 Nov 2022 Mike Christle     Add mirrors to the borders
 # 15 Nov 2022 Mike Christle     Switch to 9x9 square grid
 #                               Allow laser cannons to fire diagonally
+# 18 Oct 2026                   Play on a GameLogic.Game object
+#                               Add a computer opponent, --ai and --think
+#                               Think on a worker process, ponder
+#                               Add the Monte Carlo tree search player
+#                               F2 shows the threat map
+#                               Show shots without stopping the game loop
+#                               Sleep until input when idle, paint at most
+#                               once a frame
+#                               Fit the board to a resized window
+#                               Draw the first frame before the joysticks
+#                               and the worker start, --profile-startup
+#                               Record the games played, --record
+#                               Lazy SMP search, --smp
 # ---------------------------------------------------------------------------
 # MIT Licence
 # Copyright 2022 Mike Christle
@@ -29,96 +42,253 @@
 # USE OR OTHER DEALINGS IN THE SOFTWARE.
 # ---------------------------------------------------------------------------
 
+from time import perf_counter
+startup = [('start', perf_counter())]
+
 import sys, pygame
-import GameState
+startup.append(('import pygame', perf_counter()))
+from argparse import ArgumentParser
 
 from Cell import Cell
-from Paint import paint, get_grid_xy
-from GameLogic import init_game, click
-
-init_game()
-pygame.joystick.init()
-joysticks = [pygame.joystick.Joystick(x) for x in range(pygame.joystick.get_count())]
-paint()
-
-while True:
-
-    # Get all pygame events
-    for event in pygame.event.get():
-        match [event.type, GameState.player]:
-
-            # Exit if window is closed
-            case [pygame.QUIT, _]:
-                sys.exit()
-
-            # If F1 is pressed, start new game
-            case [pygame.KEYDOWN, _] if event.key == pygame.K_F1:
-                init_game()
-                paint()
-
-            # If green player, handle keyboard events
-            case [pygame.KEYDOWN, Cell.GRN_TEAM]:
-                match event.key:
-                    case pygame.K_UP if GameState.cursor_y > 0:
-                        GameState.cursor_y -= 1
-                    case pygame.K_RIGHT if GameState.cursor_x < 9:
-                        GameState.cursor_x += 1
-                    case pygame.K_LEFT if GameState.cursor_x > 0:
-                        GameState.cursor_x -= 1
-                    case pygame.K_DOWN if GameState.cursor_y < 8:
-                        GameState.cursor_y += 1
-                    case pygame.K_RETURN | pygame.K_SPACE:
-                        click()
-                paint()
-
-            # If red player, handle controller 1 button events
-            case [pygame.JOYBUTTONDOWN, Cell.RED_TEAM]:
-                if event.joy == 1 and event.button < 4:
-                    click()
-                    paint()
-
-            # If green player, handle controller 0 button events
-            case [pygame.JOYBUTTONDOWN, Cell.GRN_TEAM]:
-                if event.joy == 0 and event.button < 4:
-                    click()
-                    paint()
-
-            # If red player, handle controller 1 axis events
-            case [pygame.JOYAXISMOTION, Cell.RED_TEAM]:
-                match [event.joy, event.axis, int(event.value)]:
-                    case [1, 4, -1] if GameState.cursor_y > 0:
-                        GameState.cursor_y -= 1
-                    case [1, 4, 1] if GameState.cursor_y < 8:
-                        GameState.cursor_y += 1
-                    case [1, 0, -1] if GameState.cursor_x > 0:
-                        GameState.cursor_x -= 1
-                    case [1, 0, 1] if GameState.cursor_x < 9:
-                        GameState.cursor_x += 1
-                paint()
-
-            # If green player, handle controller 0 axis events
-            case [pygame.JOYAXISMOTION, Cell.GRN_TEAM]:
-                match [event.joy, event.axis, int(event.value)]:
-                    case [0, 4, -1] if GameState.cursor_y > 0:
-                        GameState.cursor_y -= 1
-                    case [0, 4, 1] if GameState.cursor_y < 8:
-                        GameState.cursor_y += 1
-                    case [0, 0, -1] if GameState.cursor_x > 0:
-                        GameState.cursor_x -= 1
-                    case [0, 0, 1] if GameState.cursor_x < 9:
-                        GameState.cursor_x += 1
-                paint()
-
-            # If red player, handle motion events
-            case [pygame.MOUSEMOTION, Cell.RED_TEAM]:
-                x, y = pygame.mouse.get_pos()
-                x, y = get_grid_xy(x, y)
-                if x != GameState.cursor_x or y != GameState.cursor_y:
-                    GameState.cursor_x = x
-                    GameState.cursor_y = y
-                    paint()
-
-            # If red player, handle mouse button events
-            case [pygame.MOUSEBUTTONUP, Cell.RED_TEAM] if event.button == 1:
-                click()
-                paint()
+from Paint import paint, get_grid_xy, fire_laser, toggle_threats
+from Paint import animate, stop_laser, set_laser_time, fit_window, load_font
+startup.append(('import Paint, open the window', perf_counter()))
+from GameLogic import Game
+from Worker import EngineWorker
+from Record import RecordWriter
+import GameState
+startup.append(('import the game modules', perf_counter()))
+
+FRAME_RATE = 60
+
+# Longest time in ms the game loop sleeps waiting for input
+IDLE_WAIT = 500
+
+
+# ---------------------------------------------------------------------------
+def teams(option):
+    """Return the teams named by a red, green or both option."""
+
+    match option:
+        case 'red': return (Cell.RED_TEAM,)
+        case 'green': return (Cell.GRN_TEAM,)
+        case 'both': return (Cell.RED_TEAM, Cell.GRN_TEAM)
+        case _: return ()
+
+
+# ---------------------------------------------------------------------------
+def print_startup():
+    """Print the time taken by each step of starting up."""
+
+    previous = startup[0][1]
+    for name, time in startup[1:]:
+        print(f'{name:32}{(time - previous) * 1000:8.1f} ms')
+        previous = time
+    print(f'{"total":32}{(previous - startup[0][1]) * 1000:8.1f} ms')
+
+
+# ---------------------------------------------------------------------------
+def click(game):
+    """Click for the player, cutting short a shot being shown."""
+
+    stop_laser()
+    game.click()
+
+
+# ---------------------------------------------------------------------------
+def main():
+    parser = ArgumentParser(description = 'Laser Blast')
+    parser.add_argument('--ai', choices = ('red', 'green', 'both'),
+                        help = 'let the computer play red, green or both')
+    parser.add_argument('--think', type = float, default = 2.0,
+                        help = 'seconds the computer thinks per action')
+    parser.add_argument('--smp', type = int, default = 1,
+                        help = 'processes the computer searches with, '
+                               'lazy SMP when more than 1')
+    parser.add_argument('--no-ponder', action = 'store_true',
+                        help = 'do not think on the other player\'s time')
+    parser.add_argument('--mcts', choices = ('red', 'green', 'both'),
+                        help = 'let the computer play red, green or both '
+                               'with Monte Carlo tree search')
+    parser.add_argument('--laser-time', type = float, default = 2.0,
+                        help = 'seconds a laser shot is shown, 0 to skip, '
+                               'Escape cuts a shot short')
+    parser.add_argument('--record',
+                        help = 'record file the games played are appended to')
+    parser.add_argument('--profile-startup', action = 'store_true',
+                        help = 'print the time taken by each step of '
+                               'starting up')
+    args = parser.parse_args()
+    set_laser_time(args.laser_time)
+    startup.append(('parse the arguments', perf_counter()))
+
+    ai_players = teams(args.ai) + teams(args.mcts)
+    mcts_players = teams(args.mcts)
+
+    game = Game()
+    game.on_fire = fire_laser
+    if args.record:
+        RecordWriter(args.record).attach(game)
+    game.init_game()
+    startup.append(('new game', perf_counter()))
+    paint(game)
+    startup.append(('first frame', perf_counter()))
+
+    # Start the rest once the board is showing
+    load_font()
+    startup.append(('load the font', perf_counter()))
+    pygame.joystick.init()
+    joysticks = [pygame.joystick.Joystick(x) for x in range(pygame.joystick.get_count())]
+    startup.append(('joysticks', perf_counter()))
+    worker = EngineWorker(smp = args.smp) if ai_players else None
+    startup.append(('start the engine worker', perf_counter()))
+    clock = pygame.time.Clock()
+    if args.profile_startup:
+        print_startup()
+
+    while True:
+        repaint = False
+
+        # Show the next flash of a laser shot
+        shooting = animate(game)
+        thinking = False
+
+        # Let the computer think, without holding up the display,
+        # and play once the last shot has been shown
+        if worker is not None:
+            if game.state == GameState.END:
+                worker.cancel()
+            elif game.player in ai_players:
+                thinking = True
+                if game.state == GameState.WAIT:
+                    worker.search(game, args.think,
+                                  game.player in mcts_players)
+                    result = None if shooting else worker.result()
+                    if result is not None:
+                        print('Red  ' if game.player == Cell.RED_TEAM
+                              else 'Green', result)
+                        game.play(result.move)
+                        repaint = True
+            elif not args.no_ponder and ai_players != mcts_players:
+                worker.ponder(game)
+
+        # Get all pygame events. When there is nothing to show or
+        # wait for, sleep until an event comes in.
+        if shooting or thinking:
+            events = pygame.event.get()
+        else:
+            events = [pygame.event.wait(IDLE_WAIT)] + pygame.event.get()
+
+        for event in events:
+            match [event.type, game.player]:
+
+                # Exit if window is closed
+                case [pygame.QUIT, _]:
+                    if worker is not None:
+                        worker.close()
+                    sys.exit()
+
+                # If F1 is pressed, start new game
+                case [pygame.KEYDOWN, _] if event.key == pygame.K_F1:
+                    if worker is not None:
+                        worker.cancel()
+                    stop_laser()
+                    game.init_game()
+                    repaint = True
+
+                # If F2 is pressed, show or hide the threat map
+                case [pygame.KEYDOWN, _] if event.key == pygame.K_F2:
+                    toggle_threats(game)
+                    repaint = True
+
+                # If the window is resized, fit the board to it
+                case [pygame.VIDEORESIZE, _]:
+                    fit_window(event.w, event.h)
+                    repaint = True
+
+                # If Escape is pressed, cut short the laser shot
+                case [pygame.KEYDOWN, _] if event.key == pygame.K_ESCAPE:
+                    stop_laser()
+                    repaint = True
+
+                # Ignore input for the computer player
+                case [_, player] if player in ai_players:
+                    pass
+
+                # If green player, handle keyboard events
+                case [pygame.KEYDOWN, Cell.GRN_TEAM]:
+                    match event.key:
+                        case pygame.K_UP if game.cursor_y > 0:
+                            game.cursor_y -= 1
+                        case pygame.K_RIGHT if game.cursor_x < 9:
+                            game.cursor_x += 1
+                        case pygame.K_LEFT if game.cursor_x > 0:
+                            game.cursor_x -= 1
+                        case pygame.K_DOWN if game.cursor_y < 8:
+                            game.cursor_y += 1
+                        case pygame.K_RETURN | pygame.K_SPACE:
+                            click(game)
+                    repaint = True
+
+                # If red player, handle controller 1 button events
+                case [pygame.JOYBUTTONDOWN, Cell.RED_TEAM]:
+                    if event.joy == 1 and event.button < 4:
+                        click(game)
+                        repaint = True
+
+                # If green player, handle controller 0 button events
+                case [pygame.JOYBUTTONDOWN, Cell.GRN_TEAM]:
+                    if event.joy == 0 and event.button < 4:
+                        click(game)
+                        repaint = True
+
+                # If red player, handle controller 1 axis events
+                case [pygame.JOYAXISMOTION, Cell.RED_TEAM]:
+                    match [event.joy, event.axis, int(event.value)]:
+                        case [1, 4, -1] if game.cursor_y > 0:
+                            game.cursor_y -= 1
+                        case [1, 4, 1] if game.cursor_y < 8:
+                            game.cursor_y += 1
+                        case [1, 0, -1] if game.cursor_x > 0:
+                            game.cursor_x -= 1
+                        case [1, 0, 1] if game.cursor_x < 9:
+                            game.cursor_x += 1
+                    repaint = True
+
+                # If green player, handle controller 0 axis events
+                case [pygame.JOYAXISMOTION, Cell.GRN_TEAM]:
+                    match [event.joy, event.axis, int(event.value)]:
+                        case [0, 4, -1] if game.cursor_y > 0:
+                            game.cursor_y -= 1
+                        case [0, 4, 1] if game.cursor_y < 8:
+                            game.cursor_y += 1
+                        case [0, 0, -1] if game.cursor_x > 0:
+                            game.cursor_x -= 1
+                        case [0, 0, 1] if game.cursor_x < 9:
+                            game.cursor_x += 1
+                    repaint = True
+
+                # If red player, handle motion events
+                case [pygame.MOUSEMOTION, Cell.RED_TEAM]:
+                    x, y = get_grid_xy(*event.pos)
+                    if x != game.cursor_x or y != game.cursor_y:
+                        game.cursor_x = x
+                        game.cursor_y = y
+                        repaint = True
+
+                # If red player, handle mouse button events
+                case [pygame.MOUSEBUTTONUP, Cell.RED_TEAM] if event.button == 1:
+                    click(game)
+                    repaint = True
+
+        # Paint once for all the events of this frame, and at most
+        # FRAME_RATE times a second, leaving the processor to the
+        # engine worker between frames
+        if repaint:
+            paint(game)
+        if repaint or shooting or thinking:
+            clock.tick(FRAME_RATE)
+
+
+if __name__ == '__main__':
+    main()
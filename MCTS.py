@@ -0,0 +1,253 @@
+# ---------------------------------------------------------------------------
+# Laser Blast, Monte Carlo Tree Search
+#
+# History
+# 18 Oct 2026                   Created
+# ---------------------------------------------------------------------------
+# MIT Licence
+# Copyright 2022 Mike Christle
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE
+# USE OR OTHER DEALINGS IN THE SOFTWARE.
+# ---------------------------------------------------------------------------
+
+from math import log, sqrt
+from random import Random
+from time import perf_counter
+from Cell import ANGLE_MASK, TEAM_SHIFT, LASER_CELL, Cell
+from Engine import SearchResult, NO_MOVE
+from Laser import trace_hit, HIT_EDGE
+from Moves import legal_moves, STEP_TARGETS
+import GameState
+
+
+EXPLORE = 1.4           # UCT exploration constant
+PLAYOUT_PLIES = 40      # Actions played out before a playout is scored
+FIRE_RATE = 0.4         # Chance a random laser action is to fire
+
+
+# ---------------------------------------------------------------------------
+def playout(game, random, max_plies = PLAYOUT_PLIES):
+    """
+    Play random actions from the game position on a copy of the cells,
+    until a player loses all laser cannons or max_plies actions are
+    played. Lasers are traced by Laser.trace_hit, and the game ends
+    under the same test as Game.action_taken.
+
+    Return the result for red, 1 for a win, 0 for a loss, or an estimate
+    from the laser cannons left if the game did not end.
+    """
+
+    cells = game.board.cells[:]
+    player = game.player
+    count = game.move_count
+    lasers = [0, game.red_laser_count, game.grn_laser_count]
+    pieces = [None, [], []]
+    for sq in range(81):
+        if cells[sq]:
+            pieces[(cells[sq] >> TEAM_SHIFT) & 3].append(sq)
+
+    for _ in range(max_plies):
+        own = pieces[player]
+        index = int(random() * len(own))
+        sq = own[index]
+        cell = cells[sq]
+        r = random()
+
+        # Fire a laser, remove what it hits
+        if cell >= LASER_CELL and r < FIRE_RATE:
+            outcome, hit = trace_hit(cells, sq)
+            if hit >= 0:
+                hit_cell = cells[hit]
+                team = (hit_cell >> TEAM_SHIFT) & 3
+                pieces[team].remove(hit)
+                cells[hit] = 0
+                if outcome != HIT_EDGE:
+                    lasers[team] -= 1
+                    if lasers[team] == 0:
+                        return 0.0 if team == Cell.RED_TEAM else 1.0
+
+        # Step to a random empty neighbour, otherwise rotate
+        else:
+            targets = STEP_TARGETS[sq]
+            dst = targets[int(random() * len(targets))]
+            if r > 0.7 and cells[dst] == 0:
+                cells[dst] = cell
+                cells[sq] = 0
+                own[index] = dst
+            else:
+                angle = (cell + 1 + int(random() * 7)) & ANGLE_MASK
+                cells[sq] = (cell & ~ANGLE_MASK) | angle
+
+        count -= 1
+        if count == 0:
+            count = 2
+            player = 3 - player
+
+    return 0.5 + (lasers[Cell.RED_TEAM] - lasers[Cell.GRN_TEAM]) * 0.125
+
+
+# ---------------------------------------------------------------------------
+class Node:
+    """A node of the search tree, the position after a move."""
+
+    __slots__ = ('move', 'parent', 'player', 'key', 'children', 'untried',
+                 'visits', 'wins')
+
+    def __init__(self, move, parent, player, key):
+        self.move = move
+        self.parent = parent
+        self.player = player    # Player who made the move
+        self.key = key
+        self.children = []
+        self.untried = None     # Moves not yet expanded, made on first visit
+        self.visits = 0
+        self.wins = 0.0         # Results for player
+
+
+# ---------------------------------------------------------------------------
+class MCTS:
+    """
+    Computer player using Monte Carlo tree search with UCT.
+    The tree is kept between searches, and the subtree of the position
+    searched next is reused when it was reached by the moves played.
+    """
+
+    # -----------------------------------------------------------------------
+    def __init__(self, seed = None, max_plies = PLAYOUT_PLIES):
+        self.rng = Random(seed)
+        self.max_plies = max_plies
+        self.root = None
+
+    # -----------------------------------------------------------------------
+    def search(self, game, seconds = 2.0, playouts = None, stop = None):
+        """
+        Search for the best move for the player to move in game, for up
+        to seconds of wall clock time, playouts playouts if given,
+        or until stop() returns True if stop is given.
+        Return a SearchResult. Its nodes count playouts, and its score
+        is the expected result of the move for the player, in thousandths.
+        """
+
+        game = game.copy()
+        start = perf_counter()
+        deadline = start + seconds
+        budget = playouts if playouts is not None else 1 << 62
+        random = self.rng.random
+        max_plies = self.max_plies
+        root = self._find_root(game)
+        count = 0
+        depth = 0
+
+        while count < budget:
+            if not count & 63 and count and (
+                    perf_counter() > deadline or
+                    stop is not None and stop()):
+                break
+            count += 1
+
+            # Select, follow the best children down to a leaf
+            node = root
+            plies = 0
+            while node.untried is not None and not node.untried \
+                    and node.children:
+                node = _select(node)
+                game.make_move(node.move)
+                plies += 1
+
+            # Expand, add one new child
+            if game.state != GameState.END:
+                if node.untried is None:
+                    node.untried = legal_moves(game)
+                untried = node.untried
+                if untried:
+                    index = int(random() * len(untried))
+                    move = untried[index]
+                    untried[index] = untried[-1]
+                    untried.pop()
+                    player = game.player
+                    game.make_move(move)
+                    plies += 1
+                    child = Node(move, node, player, game.key())
+                    node.children.append(child)
+                    node = child
+
+            # Simulate
+            if game.state == GameState.END:
+                result = 0.0 if game.red_laser_count == 0 else 1.0
+            else:
+                result = playout(game, random, max_plies)
+
+            # Back up the result
+            while node is not None:
+                node.visits += 1
+                node.wins += result if node.player == Cell.RED_TEAM \
+                             else 1.0 - result
+                node = node.parent
+
+            if plies > depth:
+                depth = plies
+            for _ in range(plies):
+                game.unmake_move()
+
+        if root.children:
+            best = max(root.children, key = lambda child: child.visits)
+            move = best.move
+            score = round(1000 * best.wins / best.visits)
+        else:
+            moves = legal_moves(game)
+            move = moves[0] if moves else NO_MOVE
+            score = 0
+        return SearchResult(move, score, depth, count, perf_counter() - start)
+
+    # -----------------------------------------------------------------------
+    def _find_root(self, game):
+        """
+        Return the node of the old tree for the game position, if it is
+        within a turn of the last root, else start a new tree.
+        """
+
+        key = game.key()
+        level = [self.root] if self.root is not None else []
+        for _ in range(5):
+            for node in level:
+                if node.key == key:
+                    node.parent = None
+                    node.move = NO_MOVE
+                    self.root = node
+                    return node
+            level = [child for node in level for child in node.children]
+
+        self.root = Node(NO_MOVE, None, Cell.NO_TEAM, key)
+        return self.root
+
+
+# ---------------------------------------------------------------------------
+def _select(node, explore = EXPLORE, sqrt = sqrt):
+    """Return the child of node with the best UCT value."""
+
+    scale = explore * sqrt(log(node.visits))
+    best = None
+    best_value = -1.0
+    for child in node.children:
+        visits = child.visits
+        value = child.wins / visits + scale / sqrt(visits)
+        if value > best_value:
+            best_value = value
+            best = child
+    return best
@@ -0,0 +1,203 @@
+# ---------------------------------------------------------------------------
+# Laser Blast, Move Generator
+#
+# History
+# 18 Oct 2026                   Created
+#                               Add is_legal and parse_move
+# ---------------------------------------------------------------------------
+# MIT Licence
+# Copyright 2022 Mike Christle
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE
+# USE OR OTHER DEALINGS IN THE SOFTWARE.
+# ---------------------------------------------------------------------------
+
+from Cell import ACTOR_SHIFT, ANGLE_MASK, TEAM_SHIFT, Cell
+from GameState import SQUARE_COUNT
+import GameState
+
+
+# A move is packed into an int
+#   bits 0-6   destination square, or new angle for a rotation
+#   bits 7-13  square of the piece that takes the action
+#   bits 14-15 kind of move
+STEP = 0        # Move one square
+JUMP = 1        # Move two squares, uses both actions of a turn
+ROTATE = 2      # Rotate a mirror or laser cannon
+FIRE = 3        # Fire a laser cannon
+
+SRC_SHIFT = 7
+KIND_SHIFT = 14
+ARG_MASK = 0x7F
+
+
+# ---------------------------------------------------------------------------
+def _build_targets(distance):
+    """For each square, the squares exactly distance squares away."""
+
+    targets = []
+    for sq in range(SQUARE_COUNT * SQUARE_COUNT):
+        y0, x0 = divmod(sq, SQUARE_COUNT)
+        squares = []
+        for y in range(y0 - distance, y0 + distance + 1):
+            for x in range(x0 - distance, x0 + distance + 1):
+                if max(abs(x - x0), abs(y - y0)) != distance:
+                    continue
+                if 0 <= x < SQUARE_COUNT and 0 <= y < SQUARE_COUNT:
+                    squares.append(y * SQUARE_COUNT + x)
+        targets.append(tuple(squares))
+    return tuple(targets)
+
+
+STEP_TARGETS = _build_targets(1)
+JUMP_TARGETS = _build_targets(2)
+
+
+# ---------------------------------------------------------------------------
+def make(kind, src, arg = 0):
+    return (kind << KIND_SHIFT) | (src << SRC_SHIFT) | arg
+
+
+# ---------------------------------------------------------------------------
+def legal_moves(game):
+    """Return a list of every legal move for the player to move."""
+
+    if game.state == GameState.END:
+        return []
+
+    cells = game.board.cells
+    player = game.player
+    jump = game.move_count == 2
+    moves = []
+    append = moves.append
+
+    for sq in range(SQUARE_COUNT * SQUARE_COUNT):
+        cell = cells[sq]
+        if not cell or (cell >> TEAM_SHIFT) & 3 != player:
+            continue
+
+        base = sq << SRC_SHIFT
+        for dst in STEP_TARGETS[sq]:
+            if not cells[dst]:
+                append(base | dst)
+
+        if jump:
+            jump_base = (JUMP << KIND_SHIFT) | base
+            for dst in JUMP_TARGETS[sq]:
+                if not cells[dst]:
+                    append(jump_base | dst)
+
+        rotate_base = (ROTATE << KIND_SHIFT) | base
+        angle = cell & ANGLE_MASK
+        for new_angle in range(8):
+            if new_angle != angle:
+                append(rotate_base | new_angle)
+
+        if cell >> ACTOR_SHIFT == Cell.LASER:
+            append((FIRE << KIND_SHIFT) | base)
+
+    return moves
+
+
+# ---------------------------------------------------------------------------
+def is_legal(game, move):
+    """Return True if a move is legal for the player to move."""
+
+    if game.state == GameState.END:
+        return False
+
+    kind = move >> KIND_SHIFT
+    src = (move >> SRC_SHIFT) & ARG_MASK
+    arg = move & ARG_MASK
+    cells = game.board.cells
+    if src >= SQUARE_COUNT * SQUARE_COUNT:
+        return False
+    cell = cells[src]
+    if not cell or (cell >> TEAM_SHIFT) & 3 != game.player:
+        return False
+
+    match kind:
+        case 0: # STEP
+            return arg in STEP_TARGETS[src] and not cells[arg]
+        case 1: # JUMP
+            return game.move_count == 2 and arg in JUMP_TARGETS[src] \
+                and not cells[arg]
+        case 2: # ROTATE
+            return arg < 8 and arg != cell & ANGLE_MASK
+        case _: # FIRE
+            return arg == 0 and cell >> ACTOR_SHIFT == Cell.LASER
+
+
+# ---------------------------------------------------------------------------
+def square_str(sq):
+    """Name a square, file a-i from the left, rank 1-9 from the top."""
+
+    y, x = divmod(sq, SQUARE_COUNT)
+    return 'abcdefghi'[x] + str(y + 1)
+
+
+# ---------------------------------------------------------------------------
+def move_str(move):
+    """
+    Return a move in text notation
+      a2-b2  step or jump to a square
+      a2/3   rotate to angle 3
+      a2*    fire the laser
+    """
+
+    kind = move >> KIND_SHIFT
+    src = square_str((move >> SRC_SHIFT) & ARG_MASK)
+    arg = move & ARG_MASK
+    if kind == ROTATE:
+        return f'{src}/{arg}'
+    if kind == FIRE:
+        return src + '*'
+    return src + '-' + square_str(arg)
+
+
+# ---------------------------------------------------------------------------
+def parse_square(text):
+    """Return the square named by square_str, ValueError if not a square."""
+
+    if len(text) != 2 or text[0] not in 'abcdefghi' \
+            or text[1] not in '123456789':
+        raise ValueError(f'Not a square: {text!r}')
+    return (int(text[1]) - 1) * SQUARE_COUNT + 'abcdefghi'.index(text[0])
+
+
+# ---------------------------------------------------------------------------
+def parse_move(text):
+    """
+    Return the move written in the text notation of move_str.
+    A move two squares away is a jump. Raise ValueError if the text
+    is not a move, legal or not.
+    """
+
+    src = parse_square(text[:2])
+    match text[2:3]:
+        case '/' if text[3:] in ('0', '1', '2', '3', '4', '5', '6', '7'):
+            return make(ROTATE, src, int(text[3:]))
+        case '*' if len(text) == 3:
+            return make(FIRE, src)
+        case '-':
+            dst = parse_square(text[3:])
+            if dst in STEP_TARGETS[src]:
+                return make(STEP, src, dst)
+            if dst in JUMP_TARGETS[src]:
+                return make(JUMP, src, dst)
+    raise ValueError(f'Not a move: {text!r}')
@@ -5,6 +5,16 @@
 #  1 Nov 2022 Mike Christle     Created
 # 15 Nov 2022 Mike Christle     Switch to 9x9 square grid
 #                               Allow laser cannons to fire diagonally
+# 18 Oct 2026                   Paint a Game object passed in by the caller
+#                               Read pieces from the packed Board
+#                               Add the threat map overlay
+#                               Cache pieces as sprites, set_square_size
+#                               Cache the checker board, repaint only the
+#                               squares that changed
+#                               Animate a shot from the frame clock
+#                               Resizable window, geometry tables
+#                               Start only the display, load the font
+#                               when it is first needed
 # ---------------------------------------------------------------------------
 # MIT Licence
 # Copyright 2022 Mike Christle
@@ -29,31 +39,14 @@
 # ---------------------------------------------------------------------------
 
 from Cell import Cell
-from time import sleep
+from ThreatMap import ThreatMap
 from math import sqrt
+from time import perf_counter
 import GameState
 import pygame
 
 
-# To change the size of the display, set the SQUARE_SIZE constant.
-# All other constants are calculated from this.
-SQUARE_SIZE = 100
-SQUARE_HALF = SQUARE_SIZE // 2
-SCREEN_WIDTH = SQUARE_SIZE * 10
-SCREEN_HEIGHT = SQUARE_SIZE * 9
-
-PAD = SQUARE_SIZE // 10
-PAD2 = PAD << 1
-SCREEN_SIZE = SCREEN_WIDTH + PAD2, SCREEN_HEIGHT + PAD2
-SCREEN_COOR = (0, 0, SCREEN_WIDTH + PAD2, SCREEN_HEIGHT + PAD2)
-
 TAN_22 = 0.41421356237309503
-MID = round((SQUARE_HALF - PAD) * TAN_22)
-LINE_WIDTH = SQUARE_SIZE // 10
-LASER_WIDTH = SQUARE_SIZE // 15
-LASER_CIRCLE_RADIUS = SQUARE_SIZE >> 2
-LASER_P1 = int(sqrt(0.5 * SQUARE_HALF * SQUARE_HALF))
-LASER_P23 = int(sqrt(0.5 * (SQUARE_HALF >> 1) ** 2))
 
 BLACK = '#000000'
 GRAY = '#404040'
@@ -64,25 +57,197 @@ GREEN = '#00DD00'
 WHITE = '#FFFFFF'
 BLUE = '#A0A0FF'
 
-TEXT_X = (9 * SQUARE_SIZE) + SQUARE_HALF + PAD
-TEXT_Y = (8 * SQUARE_SIZE) + SQUARE_HALF + PAD
-TEXT_XY = TEXT_X, TEXT_Y
-FONT_SIZE = SQUARE_SIZE // 2
-
-BG_COOR = (((9 * SQUARE_SIZE) + PAD, PAD), (SQUARE_SIZE, 9 * SQUARE_SIZE))
-BORDER0 = ((0, 0), (SCREEN_WIDTH + PAD, PAD))
-BORDER1 = ((0, 0), (PAD, SCREEN_HEIGHT + PAD))
-BORDER2 = ((0, SCREEN_HEIGHT + PAD), (SCREEN_WIDTH + PAD, PAD))
-BORDER3 = ((SCREEN_WIDTH + PAD, 0), (PAD, SCREEN_HEIGHT + PAD2))
-
 
 laser_color = False
 laser_path = []
+
+# A shot being shown, the board as it was when the laser fired,
+# the squares the beam crosses, the time it started and the
+# flash painted last. The beam flashes LASER_FLASHES times over
+# laser_time seconds.
+LASER_FLASHES = 20
+laser_time = 2.0
+laser_board = None
+laser_squares = frozenset()
+laser_start = 0
+laser_flash = -1
+laser_grid = []
+
+# The beam drawn in the current color, on a BLACK color keyed surface.
+# Lines clipped to a square are not always drawn with the same pixels,
+# so the beam is drawn whole and copied a square at a time.
+laser_layer = None
 player_color = RED
+threat_map = None
+screen = None
+
+# The font is loaded when first needed. Finding it can scan all the
+# system fonts, so the file found is kept for other sizes.
+font = None
+font_path = None
+font_found = False
+
+# Pieces drawn once into sprites, (actor, color, angle) -> Surface.
+# A sprite has a margin of PAD around the square, as lines can reach
+# a little past the edge of the square.
+sprites = {}
+
+# The checker board, drawn once for each square size
+background = None
+
+# What was last painted on each square, (x, y) -> key, and on the
+# whole screen, so paint only repaints the squares that changed
+painted = {}
+painted_screen = None
+
+# More changed squares than this repaint the whole screen
+MAX_DIRTY = 16
+
+
+# Smallest square size a window is fitted with
+MIN_SQUARE_SIZE = 20
+
+
+# ---------------------------------------------------------------------------
+def set_square_size(size, window = None):
+    """
+    Set the size of a square in pixels and open a resizable display
+    of the window size, by default just big enough for the board.
+    All other sizes, and the tables of where things are drawn,
+    are calculated from this.
+    """
+
+    global SQUARE_SIZE, SQUARE_HALF, SCREEN_WIDTH, SCREEN_HEIGHT
+    global PAD, PAD2, SCREEN_SIZE, SCREEN_COOR
+    global MID, LINE_WIDTH, LASER_WIDTH, LASER_CIRCLE_RADIUS
+    global LASER_P1, LASER_P23
+    global TEXT_X, TEXT_Y, TEXT_XY, FONT_SIZE
+    global BG_COOR, BORDER0, BORDER1, BORDER2, BORDER3
+    global SQUARE_ORIGINS, SQUARE_RECTS, MIRROR_ENDS, LASER_POINTS
+    global screen, font, THREAT_OVERLAYS, background, laser_layer
+
+    SQUARE_SIZE = size
+    SQUARE_HALF = SQUARE_SIZE // 2
+    SCREEN_WIDTH = SQUARE_SIZE * 10
+    SCREEN_HEIGHT = SQUARE_SIZE * 9
+
+    PAD = SQUARE_SIZE // 10
+    PAD2 = PAD << 1
+    SCREEN_SIZE = SCREEN_WIDTH + PAD2, SCREEN_HEIGHT + PAD2
+    SCREEN_COOR = (0, 0, SCREEN_WIDTH + PAD2, SCREEN_HEIGHT + PAD2)
+
+    MID = round((SQUARE_HALF - PAD) * TAN_22)
+    LINE_WIDTH = SQUARE_SIZE // 10
+    LASER_WIDTH = SQUARE_SIZE // 15
+    LASER_CIRCLE_RADIUS = SQUARE_SIZE >> 2
+    LASER_P1 = int(sqrt(0.5 * SQUARE_HALF * SQUARE_HALF))
+    LASER_P23 = int(sqrt(0.5 * (SQUARE_HALF >> 1) ** 2))
+
+    TEXT_X = (9 * SQUARE_SIZE) + SQUARE_HALF + PAD
+    TEXT_Y = (8 * SQUARE_SIZE) + SQUARE_HALF + PAD
+    TEXT_XY = TEXT_X, TEXT_Y
+    FONT_SIZE = SQUARE_SIZE // 2
+
+    BG_COOR = (((9 * SQUARE_SIZE) + PAD, PAD), (SQUARE_SIZE, 9 * SQUARE_SIZE))
+    BORDER0 = ((0, 0), (SCREEN_WIDTH + PAD, PAD))
+    BORDER1 = ((0, 0), (PAD, SCREEN_HEIGHT + PAD))
+    BORDER2 = ((0, SCREEN_HEIGHT + PAD), (SCREEN_WIDTH + PAD, PAD))
+    BORDER3 = ((SCREEN_WIDTH + PAD, 0), (PAD, SCREEN_HEIGHT + PAD2))
+
+    # Top left of the sprite and the area repainted for each square,
+    # (x, y) -> position, including the action panel squares at x = 9
+    SQUARE_ORIGINS = {(x, y): (x * SQUARE_SIZE, y * SQUARE_SIZE)
+                      for y in range(9) for x in range(10)}
+    SQUARE_RECTS = {xy: pygame.Rect(origin, (SQUARE_SIZE + PAD2,) * 2)
+                    for xy, origin in SQUARE_ORIGINS.items()}
+
+    # Ends of the mirror line for each angle,
+    # from the top left of the square
+    far = SQUARE_SIZE - PAD
+    MIRROR_ENDS = (((PAD, SQUARE_HALF), (far, SQUARE_HALF)),
+                   ((PAD, SQUARE_HALF + MID), (far, SQUARE_HALF - MID)),
+                   ((PAD, far), (far, PAD)),
+                   ((SQUARE_HALF + MID, PAD), (SQUARE_HALF - MID, far)),
+                   ((SQUARE_HALF, PAD), (SQUARE_HALF, far)),
+                   ((SQUARE_HALF - MID, PAD), (SQUARE_HALF + MID, far)),
+                   ((PAD, PAD), (far, far)),
+                   ((PAD, SQUARE_HALF - MID), (far, SQUARE_HALF + MID)))
+
+    # Tip and the two back corners of the laser barrel for each angle,
+    # from the center of the square
+    half, r, p1, p23 = SQUARE_HALF, LASER_CIRCLE_RADIUS, LASER_P1, LASER_P23
+    LASER_POINTS = (((0, -half), (-r, 0), (r, 0)),
+                    ((p1, -p1), (-p23, -p23), (p23, p23)),
+                    ((half, 0), (0, -r), (0, r)),
+                    ((p1, p1), (p23, -p23), (-p23, p23)),
+                    ((0, half), (-r, 0), (r, 0)),
+                    ((-p1, p1), (p23, p23), (-p23, -p23)),
+                    ((-half, 0), (0, -r), (0, r)),
+                    ((-p1, -p1), (p23, -p23), (-p23, p23)))
+
+    if window is None:
+        window = SCREEN_SIZE
+    screen = pygame.display.set_mode(window, pygame.RESIZABLE)
+    font = None
+    sprites.clear()
+    painted.clear()
+
+    # Redraw a laser shot being shown at the new size
+    laser_path.clear()
+    for x, y in laser_grid:
+        laser_path_append(x, y)
+    laser_layer = None
+
+    # Paint checker board, the window outside the board is black
+    background = pygame.Surface(window).convert()
+    background.fill(BLACK)
+    for y in range(9):
+        y0 = (y * SQUARE_SIZE) + PAD
+        for x in range(9):
+            x0 = (x * SQUARE_SIZE) + PAD
+            color_idx = (x + y) & 1
+            color = SQUARE_COLORS[color_idx]
+            rect = pygame.Rect((x0, y0), (SQUARE_SIZE, SQUARE_SIZE))
+            pygame.draw.rect(background, color, rect)
+
+    # Translucent squares for the threat map overlay
+    THREAT_OVERLAYS = {}
+    for team, color in ((Cell.RED_TEAM, RED), (Cell.GRN_TEAM, GREEN)):
+        overlay = pygame.Surface((SQUARE_SIZE, SQUARE_SIZE), pygame.SRCALPHA)
+        overlay.fill(pygame.Color(color) - pygame.Color(0, 0, 0, 192))
+        THREAT_OVERLAYS[team] = overlay
+
+
+# ---------------------------------------------------------------------------
+def load_font():
+    """Return the font for the action panel, loading it if needed."""
+
+    global font, font_path, font_found
 
-pygame.init()
-screen = pygame.display.set_mode(SCREEN_SIZE)
-font = pygame.font.SysFont('Arial Bold', FONT_SIZE)
+    if font is None:
+        if not font_found:
+            pygame.font.init()
+            font_path = pygame.font.match_font('Arial Bold')
+            font_found = True
+        font = pygame.font.Font(font_path, FONT_SIZE)
+    return font
+
+
+# ---------------------------------------------------------------------------
+def fit_window(width, height):
+    """Use the biggest squares that fit in a window resized by the user."""
+
+    size = min(width * 10 // 102, height * 10 // 92)
+    while size > MIN_SQUARE_SIZE and (
+            size * 10 + ((size // 10) << 1) > width or
+            size * 9 + ((size // 10) << 1) > height):
+        size -= 1
+    size = max(size, MIN_SQUARE_SIZE)
+    set_square_size(size, (width, height))
+
+
+pygame.display.init()
+set_square_size(100)
 pygame.display.set_caption('Laser Blast   V2.1   Press F1 to start a new game')
 
 
@@ -93,6 +258,29 @@ def laser_path_append(x, y):
     laser_path.append((x, y))
 
 
+# ---------------------------------------------------------------------------
+def toggle_threats(game):
+    """Show or hide the squares each team's lasers would pass through."""
+
+    global threat_map
+
+    threat_map = ThreatMap(game.board) if threat_map is None else None
+
+
+# ---------------------------------------------------------------------------
+def paint_threats(area = (1 << 81) - 1):
+    """Shade the squares in the area mask covered by each team's beams."""
+
+    for team, overlay in THREAT_OVERLAYS.items():
+        mask = threat_map.covered(team) & area
+        while mask:
+            low = mask & -mask
+            y, x = divmod(low.bit_length() - 1, 9)
+            x, y = SQUARE_ORIGINS[x, y]
+            screen.blit(overlay, (x + PAD, y + PAD))
+            mask ^= low
+
+
 # ---------------------------------------------------------------------------
 def get_grid_xy(x, y):
     """Convert from screen coordinates to grid coordinates"""
@@ -107,9 +295,9 @@ def get_grid_xy(x, y):
 
 
 # ---------------------------------------------------------------------------
-def paint_cursor():
-    x = (GameState.cursor_x * SQUARE_SIZE) + PAD
-    y = (GameState.cursor_y * SQUARE_SIZE) + PAD
+def paint_cursor(game):
+    x = (game.cursor_x * SQUARE_SIZE) + PAD
+    y = (game.cursor_y * SQUARE_SIZE) + PAD
     p0 = x + SQUARE_HALF, y
     p1 = x + SQUARE_HALF, y + SQUARE_SIZE
     pygame.draw.line(screen, WHITE, p0, p1)
@@ -118,152 +306,305 @@ def paint_cursor():
     pygame.draw.line(screen, WHITE, p0, p1)
 
 
+# ---------------------------------------------------------------------------
+def sprite(actor, color, angle):
+    """Return the sprite of a piece, drawing it the first time."""
+
+    key = actor, color, angle
+    surface = sprites.get(key)
+    if surface is None:
+        size = SQUARE_SIZE + PAD2
+        surface = pygame.Surface((size, size), pygame.SRCALPHA)
+        if actor == Cell.MIRROR:
+            draw_mirror(surface, PAD, PAD, color, angle)
+        else:
+            draw_laser(surface, PAD, PAD, color, angle)
+
+        # Run length encoding skips the clear pixels quickly
+        surface = surface.convert_alpha()
+        surface.set_alpha(255, pygame.RLEACCEL)
+        sprites[key] = surface
+    return surface
+
+
 # ---------------------------------------------------------------------------
 def paint_mirror(x, y, color, angle):
     """Paint a mirror."""
 
-    x = (x * SQUARE_SIZE) + PAD
-    y = (y * SQUARE_SIZE) + PAD
-
-    match angle:
-        case 0:
-            p0 = x + PAD, y + SQUARE_HALF
-            p1 = x + SQUARE_SIZE - PAD, y + SQUARE_HALF
-        case 1:
-            p0 = x + PAD, y + SQUARE_HALF + MID
-            p1 = x + SQUARE_SIZE - PAD, y + SQUARE_HALF - MID
-        case 2:
-            p0 = x + PAD, y + SQUARE_SIZE - PAD
-            p1 = x + SQUARE_SIZE - PAD, y + PAD
-        case 3:
-            p0 = x + SQUARE_HALF + MID, y + PAD
-            p1 = x + SQUARE_HALF - MID, y + SQUARE_SIZE - PAD
-        case 4:
-            p0 = x + SQUARE_HALF, y + PAD
-            p1 = x + SQUARE_HALF, y + SQUARE_SIZE - PAD
-        case 5:
-            p0 = x + SQUARE_HALF - MID, y + PAD
-            p1 = x + SQUARE_HALF + MID, y + SQUARE_SIZE - PAD
-        case 6:
-            p0 = x + PAD, y + PAD
-            p1 = x + SQUARE_SIZE - PAD, y + SQUARE_SIZE - PAD
-        case _:
-            p0 = x + PAD, y + SQUARE_HALF - MID
-            p1 = x + SQUARE_SIZE - PAD, y + SQUARE_HALF + MID
-
-    pygame.draw.line(screen, color, p0, p1, width = LINE_WIDTH)
+    screen.blit(sprite(Cell.MIRROR, color, angle), SQUARE_ORIGINS[x, y])
 
 
 # ---------------------------------------------------------------------------
 def paint_laser(x, y, color, angle):
     """Paint a laser cannon."""
 
-    x = (x * SQUARE_SIZE) + PAD + SQUARE_HALF
-    y = (y * SQUARE_SIZE) + PAD + SQUARE_HALF
-
-    match angle:
-        case 0:
-            p1 = (x, y - SQUARE_HALF)
-            p2 = (x - LASER_CIRCLE_RADIUS, y)
-            p3 = (x + LASER_CIRCLE_RADIUS, y)
-        case 1:
-            p1 = (x + LASER_P1, y - LASER_P1)
-            p2 = (x - LASER_P23, y - LASER_P23)
-            p3 = (x + LASER_P23, y + LASER_P23)
-        case 2:
-            p1 = (x + SQUARE_HALF, y)
-            p2 = (x, y - LASER_CIRCLE_RADIUS)
-            p3 = (x, y + LASER_CIRCLE_RADIUS)
-        case 3:
-            p1 = (x + LASER_P1, y + LASER_P1)
-            p2 = (x + LASER_P23, y - LASER_P23)
-            p3 = (x - LASER_P23, y + LASER_P23)
-        case 4:
-            p1 = (x, y + SQUARE_HALF)
-            p2 = (x - LASER_CIRCLE_RADIUS, y)
-            p3 = (x + LASER_CIRCLE_RADIUS, y)
-        case 5:
-            p1 = (x - LASER_P1, y + LASER_P1)
-            p2 = (x + LASER_P23, y + LASER_P23)
-            p3 = (x - LASER_P23, y - LASER_P23)
-        case 6:
-            p1 = (x - SQUARE_HALF, y)
-            p2 = (x, y - LASER_CIRCLE_RADIUS)
-            p3 = (x, y + LASER_CIRCLE_RADIUS)
-        case _:
-            p1 = (x - LASER_P1, y - LASER_P1)
-            p2 = (x + LASER_P23, y - LASER_P23)
-            p3 = (x - LASER_P23, y + LASER_P23)
-
-    pygame.draw.polygon(screen, color, (p1, p2, p3))
-    pygame.draw.line(screen, BLACK, (x, y), p1, width = 3)
-    pygame.draw.circle(screen, color, (x, y), LASER_CIRCLE_RADIUS)
+    screen.blit(sprite(Cell.LASER, color, angle), SQUARE_ORIGINS[x, y])
 
 
-# -----------------------------------------------------------------------
-def fire_laser():
+# ---------------------------------------------------------------------------
+def draw_mirror(surface, x, y, color, angle):
+    """Draw a mirror on a surface, with the square's top left at x, y."""
+
+    (x0, y0), (x1, y1) = MIRROR_ENDS[angle]
+    p0 = x + x0, y + y0
+    p1 = x + x1, y + y1
+
+    pygame.draw.line(surface, color, p0, p1, width = LINE_WIDTH)
+
+
+# ---------------------------------------------------------------------------
+def draw_laser(surface, x, y, color, angle):
+    """Draw a laser cannon on a surface, with the square's top left at x, y."""
+
+    x += SQUARE_HALF
+    y += SQUARE_HALF
+
+    p1, p2, p3 = ((x + dx, y + dy) for dx, dy in LASER_POINTS[angle])
+
+    pygame.draw.polygon(surface, color, (p1, p2, p3))
+    pygame.draw.line(surface, BLACK, (x, y), p1, width = 3)
+    pygame.draw.circle(surface, color, (x, y), LASER_CIRCLE_RADIUS)
+
+
+# ---------------------------------------------------------------------------
+def set_laser_time(seconds):
+    """Set how long a shot is shown, 0 to not show shots."""
+
+    global laser_time
+    laser_time = seconds
+
+
+# ---------------------------------------------------------------------------
+def fire_laser(game):
+    """
+    Start the animation of a laser shot, called before the hit piece
+    is removed. The laser path comes from the game.laser_path list
+    in grid coordinates. The shot is shown by calling animate each
+    frame, which returns False when it has finished.
+    """
+
+    global laser_board, laser_squares, laser_start, laser_flash
+
+    if laser_time <= 0:
+        return
+
+    stop_laser()
+    laser_grid.extend(game.laser_path)
+    for x, y in laser_grid:
+        laser_path_append(x, y)
+    laser_board = game.board.copy()
+    laser_squares = beam_squares(game.laser_path)
+    laser_start = perf_counter()
+    laser_flash = -1
+
+
+# ---------------------------------------------------------------------------
+def animate(game):
     """
-    Animate the firing of a laser.
-    The laser path comes from the GameState.laser_path list
-    in grid coordinates.
+    Show the next flash of the laser shot, if it is time.
+    Return True while a shot is being shown.
     """
 
-    global laser_color
+    global laser_color, laser_flash, laser_layer
+
+    if laser_board is None:
+        return False
+
+    flash = int((perf_counter() - laser_start) * LASER_FLASHES / laser_time)
+    if flash >= LASER_FLASHES:
+        stop_laser()
+        paint(game)
+        return False
+
+    if flash != laser_flash:
+        laser_flash = flash
+        laser_color = bool(flash & 1)
+        laser_layer = None
+        paint(game)
+    return True
+
+
+# ---------------------------------------------------------------------------
+def stop_laser():
+    """End the laser shot being shown, the next paint removes the beam."""
 
-    for _ in range(20):
-        paint()
-        laser_color = not laser_color
-        sleep(0.1)
+    global laser_board, laser_squares, laser_color, laser_layer
 
     laser_path.clear()
+    laser_grid.clear()
+    laser_layer = None
+    laser_board = None
+    laser_squares = frozenset()
+    laser_color = False
+
+
+# ---------------------------------------------------------------------------
+def beam_squares(path):
+    """
+    Return the squares, including the action panel squares, that a beam
+    drawn along the path of grid points crosses. A diagonal step also
+    crosses the corners of the two squares beside it.
+    """
+
+    squares = set()
+    for (x0, y0), (x1, y1) in zip(path, path[1:]):
+        dx = (x1 > x0) - (x1 < x0)
+        dy = (y1 > y0) - (y1 < y0)
+        x, y = x0, y0
+        squares.add((x, y))
+        while (x, y) != (x1, y1):
+            if dx and dy:
+                squares.add((x + dx, y))
+                squares.add((x, y + dy))
+            x += dx
+            y += dy
+            squares.add((x, y))
+
+    return frozenset((x, y) for x, y in squares if 0 <= x < 10 and 0 <= y < 9)
 
 
 # -----------------------------------------------------------------------
-def paint():
-    """Repaint the screen display."""
+def paint(game):
+    """
+    Repaint the screen display. Only the squares that look different
+    since the last paint are repainted and updated on the display,
+    unless the whole screen changed, such as the border color.
+    """
 
-    selected_cell = None
+    global painted, painted_screen
+
+    if threat_map is not None:
+        threat_map.update()
+
+    keys = square_keys(game)
+    whole = (game.player, screen, threat_map is not None)
+
+    if whole != painted_screen or not painted:
+        dirty = None
+    else:
+        dirty = [xy for xy, key in keys.items() if painted[xy] != key]
+        if len(dirty) > MAX_DIRTY:
+            dirty = None
+
+    if dirty is None:
+        paint_area(game, screen.get_rect(), ALL_SQUARES)
+        pygame.display.flip()
+    elif dirty:
+        rects = []
+        for x, y in dirty:
+            rect = SQUARE_RECTS[x, y]
+            paint_area(game, rect, NEIGHBOURS[x, y])
+            rects.append(rect)
+        pygame.display.update(rects)
+
+    painted = keys
+    painted_screen = whole
 
-    # Paint checker board
+
+# -----------------------------------------------------------------------
+def square_keys(game):
+    """
+    Return what each square shows, (x, y) -> key,
+    including the action panel squares at x = 9.
+    """
+
+    cells = (laser_board or game.board).cells
+    if game.state == GameState.ACTION:
+        select = game.select_y * 9 + game.select_x
+        panel = cells[select] >> 3
+    else:
+        select = -1
+        panel = 0
+
+    if threat_map is not None:
+        red = threat_map.covered(Cell.RED_TEAM)
+        green = threat_map.covered(Cell.GRN_TEAM)
+    else:
+        red = green = 0
+
+    keys = {}
+    for sq in range(81):
+        y, x = divmod(sq, 9)
+        keys[x, y] = (cells[sq], sq == select, (red >> sq) & 1,
+                      (green >> sq) & 1)
     for y in range(9):
-        y0 = (y * SQUARE_SIZE) + PAD
-        for x in range(9):
-            x0 = (x * SQUARE_SIZE) + PAD
-            color_idx = (x + y) & 1
-            color = SQUARE_COLORS[color_idx]
-            rect = pygame.Rect((x0, y0), (SQUARE_SIZE, SQUARE_SIZE))
-            pygame.draw.rect(screen, color, rect)
+        keys[9, y] = panel
+
+    for xy in laser_squares:
+        keys[xy] = keys[xy], laser_color
+
+    cursor = game.cursor_x, game.cursor_y
+    keys[cursor] = keys[cursor], 'cursor'
+    return keys
+
+
+# The squares a square's repaint area reaches into
+ALL_SQUARES = [(x, y) for y in range(9) for x in range(9)]
+NEIGHBOURS = {(x, y): [(i, j) for j in range(y - 1, y + 2)
+                       for i in range(x - 1, x + 2)
+                       if 0 <= i < 9 and 0 <= j < 9]
+              for y in range(9) for x in range(10)}
+
+
+# -----------------------------------------------------------------------
+def paint_area(game, rect, squares):
+    """
+    Paint the part of the screen in rect, in the same layers as a full
+    paint, drawing only the pieces on the list of squares.
+    """
+
+    global laser_layer
+
+    screen.set_clip(rect)
+    screen.blit(background, rect, rect)
+    board = laser_board or game.board
+
+    selected_cell = None
+    if game.state == GameState.ACTION:
+        select_xy = game.select_x, game.select_y
+    else:
+        select_xy = None
+
+    if threat_map is not None:
+        area = 0
+        for x, y in squares:
+            area |= 1 << (y * 9 + x)
+        paint_threats(area)
 
     # Paint laser path
     if len(laser_path) > 0:
-        color = WHITE if laser_color else BLUE
-        pygame.draw.lines(screen, color, False, laser_path, width = LASER_WIDTH)
+        if laser_layer is None:
+            laser_layer = pygame.Surface(SCREEN_SIZE).convert()
+            laser_layer.set_colorkey(BLACK)
+            color = WHITE if laser_color else BLUE
+            pygame.draw.lines(laser_layer, color, False, laser_path,
+                              width = LASER_WIDTH)
+        screen.blit(laser_layer, rect, rect)
 
     # Paint mirrors and lasers
-    for y in range(9):
-        for x in range(9):
-            cell = GameState.grid[y][x]
-            if cell.actor == Cell.EMPTY:
-                continue
-
-            if cell.selected:
-                color = WHITE
-                selected_cell = cell
-            elif cell.team == Cell.RED_TEAM:
-                color = RED
-            else: # Green Team
-                color = GREEN
-
-            if cell.actor == Cell.MIRROR:
-                paint_mirror(x, y, color, cell.angle)
-            else: # Laser
-                paint_laser(x, y, color, cell.angle)
+    for x, y in squares:
+        cell = board.cell(x, y)
+        if cell.actor == Cell.EMPTY:
+            continue
+
+        if (x, y) == select_xy:
+            color = WHITE
+        elif cell.team == Cell.RED_TEAM:
+            color = RED
+        else: # Green Team
+            color = GREEN
+
+        if cell.actor == Cell.MIRROR:
+            paint_mirror(x, y, color, cell.angle)
+        else: # Laser
+            paint_laser(x, y, color, cell.angle)
 
     # Paint action buttons on action panel
     pygame.draw.rect(screen, DARK_GRAY, BG_COOR)
 
     # Paint the action buttons
-    if selected_cell is not None:
+    if select_xy is not None:
+        selected_cell = board.cell(*select_xy)
         if selected_cell.team == Cell.RED_TEAM:
             color = RED
         else: # Green Team
@@ -275,17 +616,17 @@ def paint():
         else: # Laser
             for y in range(8):
                 paint_laser(9, y, color, y)
-            text = font.render('FIRE', True, color)
+            text = load_font().render('FIRE', True, color)
             rect = text.get_rect()
             rect.center = (TEXT_X, TEXT_Y)
             screen.blit(text, rect)
 
     # Paint the border
-    color = RED if GameState.player == Cell.RED_TEAM else GREEN
+    color = RED if game.player == Cell.RED_TEAM else GREEN
     pygame.draw.rect(screen, color, BORDER0)
     pygame.draw.rect(screen, color, BORDER1)
     pygame.draw.rect(screen, color, BORDER2)
     pygame.draw.rect(screen, color, BORDER3)
 
-    paint_cursor()
-    pygame.display.flip()
+    paint_cursor(game)
+    screen.set_clip(None)
@@ -0,0 +1,215 @@
+# ---------------------------------------------------------------------------
+# Laser Blast, Parallel Search
+#
+# History
+# 18 Oct 2026                   Created
+#                               Stop a search when asked, for the worker
+#                               Default signal handlers in the workers
+# ---------------------------------------------------------------------------
+# MIT Licence
+# Copyright 2022 Mike Christle
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE
+# USE OR OTHER DEALINGS IN THE SOFTWARE.
+# ---------------------------------------------------------------------------
+
+from multiprocessing import shared_memory
+from time import perf_counter
+from Engine import Engine, SearchResult
+from Worker import _CONTEXT, reset_signals, stop_process
+
+
+# Packed table entry, two 64 bit words: key ^ data, then data.
+# The key check fails for an entry torn by writers in two processes,
+# so the table needs no locks.
+#
+# data bits  0 -  7   depth
+#            8 -  9   flag
+#           10 - 31   score + SCORE_OFFSET
+#           32 - 48   move + 1, zero for no move
+#           49 - 56   generation
+SCORE_OFFSET = 1 << 21
+
+# Seconds between checks of the stop function of a search
+STOP_POLL = 0.01
+
+
+# ---------------------------------------------------------------------------
+class SharedTable:
+    """
+    A transposition table in shared memory, with the same interface
+    as Engine.TranspositionTable, so every process searching with it
+    sees the results of the others.
+    """
+
+    __slots__ = ('shm', 'words', 'mask', 'generation')
+
+    # -----------------------------------------------------------------------
+    def __init__(self, shm):
+        self.shm = shm
+        self.words = shm.buf.cast('Q')
+        self.mask = (len(self.words) >> 1) - 1
+        self.generation = 0
+
+    # -----------------------------------------------------------------------
+    @staticmethod
+    def create(bits = 18):
+        """Return the shared memory for a table of 2 ** bits entries."""
+
+        return shared_memory.SharedMemory(create = True, size = 16 << bits)
+
+    # -----------------------------------------------------------------------
+    def clear(self):
+        self.shm.buf[:] = bytes(len(self.shm.buf))
+
+    # -----------------------------------------------------------------------
+    def new_search(self):
+        self.generation = (self.generation + 1) & 0xFF
+
+    # -----------------------------------------------------------------------
+    def probe(self, key):
+        """Return (depth, flag, score, move) for key, or None."""
+
+        index = (key & self.mask) << 1
+        words = self.words
+        data = words[index + 1]
+        if data == 0 or words[index] ^ data != key:
+            return None
+        return (data & 0xFF, (data >> 8) & 3,
+                ((data >> 10) & 0x3FFFFF) - SCORE_OFFSET,
+                ((data >> 32) & 0x1FFFF) - 1)
+
+    # -----------------------------------------------------------------------
+    def store(self, key, depth, flag, score, move):
+        index = (key & self.mask) << 1
+        words = self.words
+        old = words[index + 1]
+        if old == 0 or words[index] ^ old == key or depth >= old & 0xFF \
+                or old >> 49 != self.generation:
+            data = depth | (flag << 8) | ((score + SCORE_OFFSET) << 10) \
+                   | ((move + 1) << 32) | (self.generation << 49)
+            words[index] = key ^ data
+            words[index + 1] = data
+
+    # -----------------------------------------------------------------------
+    def release(self):
+        self.words.release()
+        self.shm.close()
+
+
+# ---------------------------------------------------------------------------
+class ParallelEngine:
+    """
+    Lazy SMP search. Every worker process runs the same iterative
+    deepening search of the root, sharing one SharedTable. Odd helpers
+    start a depth ahead, so the workers spread over different parts of
+    the tree and fill in the table for each other. Worker 0 decides
+    when the search ends, and the deepest completed result is played.
+    """
+
+    # -----------------------------------------------------------------------
+    def __init__(self, workers = 2, tt_bits = 18):
+        self.shm = SharedTable.create(tt_bits)
+        self.table = SharedTable(self.shm)
+        self.job_id = _CONTEXT.RawValue('i', 0)
+        self.conns = []
+        self.processes = []
+
+        for _ in range(workers):
+            conn, child = _CONTEXT.Pipe()
+            process = _CONTEXT.Process(target = _serve, daemon = True,
+                                       args = (child, self.job_id, self.shm))
+            process.start()
+            child.close()
+            self.conns.append(conn)
+            self.processes.append(process)
+
+    # -----------------------------------------------------------------------
+    @property
+    def tt(self):
+        """The shared table, probed like Engine.tt."""
+
+        return self.table
+
+    # -----------------------------------------------------------------------
+    def search(self, game, seconds = 2.0, max_depth = 64, stop = None):
+        """Same as Engine.search, with nodes counted over all workers."""
+
+        start = perf_counter()
+        self.job_id.value += 1
+        job = self.job_id.value
+        game = game.copy()
+        for index, conn in enumerate(self.conns):
+            conn.send((job, game, seconds, max_depth, 1 + (index & 1)))
+
+        # Stop every worker if asked to
+        if stop is not None:
+            while not self.conns[0].poll(STOP_POLL):
+                if stop():
+                    self.job_id.value += 1
+                    break
+
+        # When the main worker is done, stop the helpers
+        result = self.conns[0].recv()
+        self.job_id.value += 1
+        nodes = result.nodes
+        for conn in self.conns[1:]:
+            helper = conn.recv()
+            nodes += helper.nodes
+            if helper.depth > result.depth:
+                result = helper
+
+        return SearchResult(result.move, result.score, result.depth, nodes,
+                            perf_counter() - start)
+
+    # -----------------------------------------------------------------------
+    def clear(self):
+        """Empty the shared table, for timing searches from scratch."""
+
+        self.table.clear()
+
+    # -----------------------------------------------------------------------
+    def close(self):
+        """Stop the workers and free the shared table."""
+
+        for conn in self.conns:
+            conn.send(None)
+        for process in self.processes:
+            stop_process(process)
+        self.table.release()
+        self.shm.unlink()
+
+
+# ---------------------------------------------------------------------------
+def _serve(conn, job_id, shm):
+    """Main loop of a search worker process."""
+
+    reset_signals()
+    engine = Engine(tt = SharedTable(shm))
+
+    while True:
+        request = conn.recv()
+        if request is None:
+            return
+        job, game, seconds, max_depth, min_depth = request
+
+        # Each search is new, do not carry on from the last one
+        engine.last_key = None
+        result = engine.search(game, seconds, max_depth,
+                               lambda: job_id.value != job, min_depth)
+        conn.send(result)
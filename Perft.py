@@ -0,0 +1,125 @@
+# ---------------------------------------------------------------------------
+# Laser Blast, Perft
+#
+# History
+# 18 Oct 2026                   Created
+# ---------------------------------------------------------------------------
+# MIT Licence
+# Copyright 2022 Mike Christle
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE
+# USE OR OTHER DEALINGS IN THE SOFTWARE.
+# ---------------------------------------------------------------------------
+
+import argparse
+
+from multiprocessing import Pool
+from time import perf_counter
+from GameLogic import Game
+from Moves import move_str
+
+
+# ---------------------------------------------------------------------------
+def perft(game, depth, bulk = True):
+    """
+    Count the leaf positions depth actions from the current position.
+    Each action is one ply, so a full turn is two plies.
+    With bulk counting the last ply counts moves without making them.
+    """
+
+    if depth == 0:
+        return 1
+
+    moves = game.legal_moves()
+    if bulk and depth == 1:
+        return len(moves)
+
+    nodes = 0
+    for move in moves:
+        game.make_move(move)
+        nodes += perft(game, depth - 1, bulk)
+        game.unmake_move()
+    return nodes
+
+
+# ---------------------------------------------------------------------------
+def start_game():
+    """Return a game in the init_game start position."""
+
+    game = Game()
+    game.init_game()
+    return game
+
+
+# ---------------------------------------------------------------------------
+def _perft_root_move(job):
+    """Pool worker, count the nodes below one root move."""
+
+    move, depth, bulk = job
+    game = start_game()
+    game.make_move(move)
+    return move, perft(game, depth - 1, bulk)
+
+
+# ---------------------------------------------------------------------------
+def divide(depth, bulk = True, jobs = 1):
+    """
+    Return a list of (root move, node count) from the start position.
+    With more than one job the root moves are split across a process pool.
+    """
+
+    work = [(move, depth, bulk) for move in start_game().legal_moves()]
+    if jobs > 1:
+        with Pool(jobs) as pool:
+            return pool.map(_perft_root_move, work, chunksize = 1)
+    return [_perft_root_move(job) for job in work]
+
+
+# ---------------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(
+        description = 'Count the positions reachable from the start position')
+    parser.add_argument('depth', type = int, help = 'number of actions')
+    parser.add_argument('--divide', action = 'store_true',
+                        help = 'print the count below each root move')
+    parser.add_argument('--no-bulk', dest = 'bulk', action = 'store_false',
+                        help = 'make every move of the last ply')
+    parser.add_argument('--jobs', type = int, default = 1,
+                        help = 'number of worker processes')
+    args = parser.parse_args()
+
+    start = perf_counter()
+    if args.depth < 1:
+        results = []
+        nodes = 1
+    else:
+        results = divide(args.depth, args.bulk, args.jobs)
+        nodes = sum(count for _, count in results)
+    elapsed = perf_counter() - start
+
+    if args.divide:
+        for move, count in results:
+            print(f'{move_str(move)}: {count}')
+        print()
+
+    print(f'Depth {args.depth}: {nodes} nodes, {elapsed:.2f} s, '
+          f'{nodes / elapsed:.0f} nodes/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,347 @@
+# ---------------------------------------------------------------------------
+# Laser Blast, Position Database
+#
+# History
+# 18 Oct 2026                   Created
+#                               Close with arrays still in use
+#                               Pad records to 104 bytes, format 2
+# ---------------------------------------------------------------------------
+# MIT Licence
+# Copyright 2022 Mike Christle
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE
+# USE OR OTHER DEALINGS IN THE SOFTWARE.
+# ---------------------------------------------------------------------------
+
+import argparse
+import os
+import struct
+import sys
+
+from mmap import mmap, ACCESS_READ
+from time import perf_counter
+from Board import Board
+from Cell import Cell
+from GameLogic import Game
+from GameState import SQUARE_COUNT
+from Record import read_games, replay
+import GameState
+
+# NumPy is only needed to read a position file
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# A position file is a 16 byte header
+#   4 bytes   b'LBPD'
+#   2 bytes   FORMAT_VERSION
+#   2 bytes   RECORD_SIZE
+#   8 bytes   zero
+# followed by fixed size records, one per position, little endian
+#   8 bytes   Zobrist key, Game.key
+#   4 bytes   game number in the source of the positions
+#   2 bytes   actions played in the game before this position
+#   1 byte    player to move, Cell.RED_TEAM or Cell.GRN_TEAM
+#   1 byte    actions left in the turn, move_count
+#   1 byte    red laser count
+#   1 byte    green laser count
+#   1 byte    GameState END, WAIT or ACTION
+#   81 bytes  the packed cells of the Board, see Cell
+#   4 bytes   zero, 104 bytes in all, so keys stay 8 byte aligned
+MAGIC = b'LBPD'
+FORMAT_VERSION = 2
+HEADER = struct.Struct('<4sHH8x')
+RECORD = struct.Struct('<QIHBBBBB81s4x')
+RECORD_SIZE = RECORD.size
+
+# The index is a file beside the positions, path + '.idx', a 16 byte
+# header, b'LBPI' then the count of positions indexed, then the keys
+# of all the positions sorted, then the position number of each key,
+# all 8 byte ints. The keys are kept apart so a search reads them
+# in place.
+INDEX_MAGIC = b'LBPI'
+INDEX_HEADER = struct.Struct('<4s4xQ')
+
+if np is not None:
+    DTYPE = np.dtype({
+        'names': ('key', 'game', 'ply', 'player', 'move_count',
+                  'red_lasers', 'grn_lasers', 'state', 'cells'),
+        'formats': ('<u8', '<u4', '<u2', 'u1', 'u1', 'u1', 'u1', 'u1',
+                    ('u1', (SQUARE_COUNT, SQUARE_COUNT))),
+        'offsets': (0, 8, 12, 14, 15, 16, 17, 18, 19),
+        'itemsize': RECORD_SIZE})
+
+
+# ---------------------------------------------------------------------------
+class PositionWriter:
+    """
+    Appends positions to a position file, creating it if needed.
+    Only the standard library is used, NumPy is not needed to write.
+    The index is not kept up to date, call build_index when done.
+    """
+
+    def __init__(self, path):
+        self.file = open(path, 'ab')
+        if self.file.tell() == 0:
+            self.file.write(HEADER.pack(MAGIC, FORMAT_VERSION, RECORD_SIZE))
+        else:
+            with open(path, 'rb') as file:
+                _check_header(file.read(HEADER.size), path)
+        self.count = 0
+
+    def add(self, game, number = 0, ply = 0):
+        """Add the position of a game."""
+
+        self.file.write(RECORD.pack(
+            game.key(), number, ply, game.player, game.move_count,
+            game.red_laser_count, game.grn_laser_count, game.state,
+            bytes(game.board.cells)))
+        self.count += 1
+
+    def add_game(self, record, number = 0):
+        """Add every position of a recorded game, Record.GameRecord."""
+
+        game = replay(record, 0)
+        self.add(game, number, 0)
+        for ply, (move, _) in enumerate(record.actions, 1):
+            game.make_move(move)
+            self.add(game, number, ply)
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ---------------------------------------------------------------------------
+class PositionDB:
+    """
+    A position file opened with mmap. records is a NumPy structured
+    array of DTYPE over the mapped file, so a scan reads straight from
+    the page cache without copying or making Python objects.
+    find looks up positions by Zobrist key in the index, if built.
+
+    Arrays taken from records point into the mapped file. They keep
+    the mapping open after close, until they are freed.
+    """
+
+    def __init__(self, path):
+        _need_numpy()
+        self.path = path
+        self.file = open(path, 'rb')
+        _check_header(self.file.read(HEADER.size), path)
+
+        # A partly written last record, from a crash, is left out
+        size = os.fstat(self.file.fileno()).st_size
+        count = (size - HEADER.size) // RECORD_SIZE
+        self.map = mmap(self.file.fileno(), 0, access = ACCESS_READ) \
+            if count else None
+        self.records = np.frombuffer(self.map or b'', dtype = DTYPE,
+                                     count = count,
+                                     offset = HEADER.size if count else 0)
+
+        self.index_map = None
+        self.index = None       # Sorted keys
+        self.positions = None   # Position number of each sorted key
+        if os.path.exists(path + '.idx'):
+            self._open_index(path + '.idx')
+
+    def _open_index(self, path):
+        with open(path, 'rb') as file:
+            magic, count = INDEX_HEADER.unpack(file.read(INDEX_HEADER.size))
+            if magic != INDEX_MAGIC:
+                raise ValueError(f'{path} is not a position index')
+            if count != len(self.records):
+                return
+            if count:
+                self.index_map = mmap(file.fileno(), 0, access = ACCESS_READ)
+        index = np.frombuffer(self.index_map or b'', dtype = '<u8',
+                              count = count * 2,
+                              offset = INDEX_HEADER.size if count else 0)
+        self.index = index[:count]
+        self.positions = index[count:]
+
+    def __len__(self):
+        return len(self.records)
+
+    def find(self, key):
+        """Return an array of the numbers of the positions with a key."""
+
+        if self.index is None:
+            raise ValueError(f'{self.path} has no index up to date, '
+                             f'run build_index')
+        key = np.uint64(key)
+        low = np.searchsorted(self.index, key, 'left')
+        high = np.searchsorted(self.index, key, 'right')
+        return self.positions[low:high].copy()
+
+    def game(self, number):
+        """Return a Game at position number."""
+
+        record = self.records[number]
+        game = Game()
+        game.board = Board(record['cells'].tobytes())
+        game.player = int(record['player'])
+        game.move_count = int(record['move_count'])
+        game.red_laser_count = int(record['red_lasers'])
+        game.grn_laser_count = int(record['grn_lasers'])
+        game.state = int(record['state'])
+        return game
+
+    def close(self):
+        self.records = self.index = self.positions = None
+        for buffer in (self.map, self.index_map):
+            if buffer is not None:
+                try:
+                    buffer.close()
+                except BufferError:
+                    # An array still points into it, the mapping
+                    # is closed when the last one is freed
+                    pass
+        self.map = self.index_map = None
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ---------------------------------------------------------------------------
+def build_index(path):
+    """Write the index of a position file, sorted by key."""
+
+    with PositionDB(path) as db:
+        keys = db.records['key']
+        order = np.argsort(keys, kind = 'stable')
+        sorted_keys = keys[order]
+        del keys
+
+    with open(path + '.idx', 'wb') as file:
+        file.write(INDEX_HEADER.pack(INDEX_MAGIC, len(order)))
+        file.write(sorted_keys.astype('<u8').tobytes())
+        file.write(order.astype('<u8').tobytes())
+
+
+# ---------------------------------------------------------------------------
+def _check_header(data, path):
+    if len(data) < HEADER.size:
+        raise ValueError(f'{path} is not a position file')
+    magic, version, size = HEADER.unpack(data)
+    if magic != MAGIC:
+        raise ValueError(f'{path} is not a position file')
+    if version != FORMAT_VERSION or size != RECORD_SIZE:
+        raise ValueError(f'{path} is position format {version}, '
+                         f'this is format {FORMAT_VERSION}')
+
+
+# ---------------------------------------------------------------------------
+def _need_numpy():
+    if np is None:
+        raise ImportError('Reading positions needs NumPy, pip install numpy')
+
+
+# ---------------------------------------------------------------------------
+def cmd_build(args):
+    """Add every position of the games in record files, then index."""
+
+    start = perf_counter()
+    with PositionWriter(args.out) as writer:
+        number = 0
+        for path in args.records:
+            for record in read_games(path):
+                writer.add_game(record, number)
+                number += 1
+    build_index(args.out)
+    print(f'{number} games, {writer.count} positions, '
+          f'{perf_counter() - start:.1f} s')
+
+
+# ---------------------------------------------------------------------------
+def cmd_stats(args):
+    """Scan every position and count some things, timing the scan."""
+
+    with PositionDB(args.file) as db:
+        records = db.records
+        start = perf_counter()
+        count = len(records)
+        ended = int(np.count_nonzero(records['state'] == GameState.END))
+        red = int(np.count_nonzero(records['player'] == Cell.RED_TEAM))
+        lasers = np.bincount(records['red_lasers'] + records['grn_lasers'],
+                             minlength = 7)
+        pieces = int(np.count_nonzero(records['cells']))
+        seconds = perf_counter() - start
+        unique = int(np.count_nonzero(np.diff(db.index)) + 1) \
+            if db.index is not None and len(db.index) else 'no index'
+        del records
+
+    print(f'{count} positions, {unique} different, {ended} ended, '
+          f'red to move in {red}')
+    print('positions by lasers left:',
+          ', '.join(f'{n} {lasers[n]}' for n in range(7) if lasers[n]))
+    print(f'{pieces / max(1, count):.1f} pieces per position')
+    print(f'scan {seconds:.3f} s, {count * RECORD_SIZE / seconds / 1e9:.2f} '
+          f'GB/s, {count / seconds / 1e6:.1f} million positions/s')
+
+
+# ---------------------------------------------------------------------------
+def cmd_find(args):
+    """Print the positions with a key."""
+
+    with PositionDB(args.file) as db:
+        for number in db.find(int(args.key, 0)).tolist():
+            game, ply = db.records[['game', 'ply']][number].tolist()
+            print(f'position {number}: game {game} action {ply}')
+
+
+# ---------------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description = 'Laser Blast positions')
+    sub = parser.add_subparsers(required = True)
+
+    cmd = sub.add_parser('build', help = 'add the positions of recorded '
+                                         'games and build the index')
+    cmd.add_argument('out', help = 'position file')
+    cmd.add_argument('records', nargs = '+', help = 'record files')
+    cmd.set_defaults(func = cmd_build)
+
+    cmd = sub.add_parser('stats', help = 'scan all positions')
+    cmd.add_argument('file')
+    cmd.set_defaults(func = cmd_stats)
+
+    cmd = sub.add_parser('find', help = 'find positions by Zobrist key')
+    cmd.add_argument('file')
+    cmd.add_argument('key', help = 'key, 0x for hex')
+    cmd.set_defaults(func = cmd_find)
+
+    args = parser.parse_args()
+    try:
+        args.func(args)
+    except ValueError as error:
+        sys.exit(str(error))
+
+
+if __name__ == '__main__':
+    main()
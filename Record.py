@@ -0,0 +1,469 @@
+# ---------------------------------------------------------------------------
+# Laser Blast, Game Records
+#
+# History
+# 18 Oct 2026                   Created
+#                               Start games from the on_new_game hook
+# ---------------------------------------------------------------------------
+# MIT Licence
+# Copyright 2022 Mike Christle
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE
+# USE OR OTHER DEALINGS IN THE SOFTWARE.
+# ---------------------------------------------------------------------------
+
+import argparse
+import os
+import sys
+
+from mmap import mmap, ACCESS_READ
+from time import perf_counter
+from Cell import ACTOR_SHIFT, TEAM_SHIFT, ANGLE_MASK, Cell
+from GameLogic import Game
+from GameState import RULES_VERSION, SQUARE_COUNT
+from Laser import trace_hit, BEAM_LOOP
+from Moves import is_legal, move_str, parse_move, parse_square, square_str
+from Moves import KIND_SHIFT, SRC_SHIFT, ARG_MASK, FIRE
+import GameState
+
+
+# A record file is a stream of games. A game is a 5 byte header
+#   2 bytes   0xFF 0xFF, not a move as square 127 does not exist
+#   1 byte    FORMAT_VERSION
+#   1 byte    GameState.RULES_VERSION the game was played under
+#   1 byte    team that moved first, Cell.RED_TEAM or Cell.GRN_TEAM
+# followed by its actions, each a move from Moves as 2 bytes little
+# endian. A move that fires is followed by 1 byte, the Laser outcome.
+# The game starts from the init_game layout.
+FORMAT_VERSION = 1
+GAME_MARK = 0xFFFF
+HEADER_SIZE = 5
+
+TEAM_NAMES = {Cell.RED_TEAM: 'red', Cell.GRN_TEAM: 'green'}
+TEAMS = {'red': Cell.RED_TEAM, 'green': Cell.GRN_TEAM}
+
+
+# ---------------------------------------------------------------------------
+class GameRecord:
+    """
+    One recorded game, the rules version, the team that moved first and
+    the actions, a list of (move, outcome). The outcome of a shot is
+    a Laser outcome, and None for the other moves.
+    """
+
+    __slots__ = ('rules', 'first', 'actions')
+
+    def __init__(self, first, actions = None, rules = RULES_VERSION):
+        self.rules = rules
+        self.first = first
+        self.actions = [] if actions is None else actions
+
+    def __eq__(self, other):
+        if not isinstance(other, GameRecord):
+            return NotImplemented
+        return (self.rules, self.first, self.actions) == \
+            (other.rules, other.first, other.actions)
+
+    def __repr__(self):
+        return f'GameRecord({TEAM_NAMES.get(self.first, self.first)} first, ' \
+               f'{len(self.actions)} actions, rules {self.rules})'
+
+
+# ---------------------------------------------------------------------------
+def header(first, rules = RULES_VERSION):
+    """Return the bytes that start a game."""
+
+    return bytes((0xFF, 0xFF, FORMAT_VERSION, rules, first))
+
+
+# ---------------------------------------------------------------------------
+def action(cells, move):
+    """Return the bytes of a move, for the board cells before it is made."""
+
+    data = move.to_bytes(2, 'little')
+    if move >> KIND_SHIFT == FIRE:
+        data += bytes((trace_hit(cells, (move >> SRC_SHIFT) & ARG_MASK)[0],))
+    return data
+
+
+# ---------------------------------------------------------------------------
+def encode(record):
+    """Return the bytes of a whole game."""
+
+    data = bytearray(header(record.first, record.rules))
+    for move, outcome in record.actions:
+        data += move.to_bytes(2, 'little')
+        if outcome is not None:
+            data.append(outcome)
+    return bytes(data)
+
+
+# ---------------------------------------------------------------------------
+class RecordWriter:
+    """
+    Appends games to a record file as they are played. Each action is
+    written straight through to the operating system, so a crash of the
+    program loses nothing already played. With sync True each action
+    is also flushed to the disk, which is much slower.
+
+    Use new_game as the Game.on_new_game hook and play as the
+    Game.on_play hook. The first action after init_game starts a new
+    game in the file, so a game with no actions is not written.
+    """
+
+    def __init__(self, path, sync = False):
+        self.file = open(path, 'ab', buffering = 0)
+        self.sync = sync
+        self.games = 0
+        self.first = None       # First player of a game not yet started
+
+    def attach(self, game):
+        """Set the hooks of a game to record it."""
+
+        game.on_new_game = self.new_game
+        game.on_play = self.play
+
+    def new_game(self, game):
+        """Note a new game, started by its first action."""
+
+        self.first = game.player
+
+    def start(self, first):
+        """Start a new game, first is the team that moves first."""
+
+        self.write(header(first))
+        self.games += 1
+
+    def play(self, game, move):
+        """Record a move, called before the move is made."""
+
+        if self.first is not None:
+            self.start(self.first)
+            self.first = None
+        self.write(action(game.board.cells, move))
+
+    def write(self, data):
+        self.file.write(data)
+        if self.sync:
+            os.fsync(self.file.fileno())
+
+    def close(self):
+        self.file.close()
+
+
+# ---------------------------------------------------------------------------
+def parse_games(data):
+    """
+    Yield the GameRecord of each game in the bytes of a record file.
+    A partly written last action, left by a crash, is ignored.
+    """
+
+    size = len(data)
+    record = None
+    i = 0
+
+    while i + 1 < size:
+        word = data[i] | (data[i + 1] << 8)
+        if word == GAME_MARK:
+            if i + HEADER_SIZE > size:
+                break
+            if data[i + 2] != FORMAT_VERSION:
+                raise ValueError(f'Unknown record format {data[i + 2]} '
+                                 f'at byte {i}')
+            if record is not None:
+                yield record
+            record = GameRecord(data[i + 4], rules = data[i + 3])
+            i += HEADER_SIZE
+        elif record is None:
+            raise ValueError('Record does not start with a game')
+        elif word >> KIND_SHIFT == FIRE:
+            if i + 3 > size:
+                break
+            record.actions.append((word, data[i + 2]))
+            i += 3
+        else:
+            record.actions.append((word, None))
+            i += 2
+
+    if record is not None:
+        yield record
+
+
+# ---------------------------------------------------------------------------
+def read_games(path):
+    """Yield the GameRecord of each game in a record file."""
+
+    with open(path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return
+        with mmap(file.fileno(), 0, access = ACCESS_READ) as data:
+            yield from parse_games(data)
+
+
+# ---------------------------------------------------------------------------
+def replay(record, plies = None, check = True):
+    """
+    Return a Game at the position after the first plies actions of
+    a recorded game, after all of them by default. With check, raise
+    ValueError if an action is not legal or a shot's outcome differs.
+    """
+
+    if record.rules != RULES_VERSION:
+        raise ValueError(f'Game played under rules {record.rules}, '
+                         f'these are rules {RULES_VERSION}')
+    if record.first not in TEAM_NAMES:
+        raise ValueError(f'No team {record.first} to move first')
+
+    game = Game()
+    game.init_game()
+    game.player = record.first
+
+    for ply, (move, outcome) in enumerate(record.actions[:plies]):
+        if check:
+            if not is_legal(game, move):
+                raise ValueError(f'Action {ply + 1}, {move_str(move)}, '
+                                 f'is not legal')
+            if outcome is not None:
+                src = (move >> SRC_SHIFT) & ARG_MASK
+                if trace_hit(game.board.cells, src)[0] != outcome:
+                    raise ValueError(f'Action {ply + 1}, {move_str(move)}, '
+                                     f'has a different outcome')
+        game.make_move(move)
+
+    return game
+
+
+# ---------------------------------------------------------------------------
+def winner(game):
+    """Return the name of the winner of a game, or 'unfinished'."""
+
+    if game.state != GameState.END:
+        return 'unfinished'
+    return 'green' if game.red_laser_count == 0 else 'red'
+
+
+# ---------------------------------------------------------------------------
+def export_text(records, file):
+    """
+    Write games in text notation. Each game is a line naming the first
+    player, a line for each turn with the moves in the notation of
+    Moves.move_str, a shot followed by the square it hits, and a result.
+
+      game rules 1 first red
+      red a2/3 a2*h2
+      green h2-g3 g3/5
+      result red
+    """
+
+    for record in records:
+        file.write(f'game rules {record.rules} '
+                   f'first {TEAM_NAMES[record.first]}\n')
+        game = replay(record, 0)
+        line = []
+        for move, outcome in record.actions:
+            if not line:
+                line.append(TEAM_NAMES[game.player])
+            text = move_str(move)
+            if outcome is not None:
+                src = (move >> SRC_SHIFT) & ARG_MASK
+                outcome, hit = trace_hit(game.board.cells, src)
+                if outcome != BEAM_LOOP:
+                    text += square_str(hit)
+            line.append(text)
+            player = game.player
+            game.make_move(move)
+            if game.player != player or game.state == GameState.END:
+                file.write(' '.join(line) + '\n')
+                line = []
+        if line:
+            file.write(' '.join(line) + '\n')
+        file.write(f'result {winner(game)}\n')
+
+
+# ---------------------------------------------------------------------------
+def import_text(file):
+    """
+    Yield the GameRecord of each game in text notation, as written by
+    export_text. Each move is checked as it is played, and a ValueError
+    names the line of the first mistake.
+    """
+
+    record = game = None
+    for number, line in enumerate(file, 1):
+        words = line.split()
+        if not words:
+            continue
+        try:
+            match words:
+                case ['game', 'rules', rules, 'first', first]:
+                    if record is not None:
+                        yield record
+                    if first not in TEAMS:
+                        raise ValueError(f'No team {first}')
+                    record = GameRecord(TEAMS[first], rules = int(rules))
+                    game = replay(record)
+
+                case [('red' | 'green') as team, *moves] if game is not None:
+                    for text in moves:
+                        if TEAMS[team] != game.player:
+                            raise ValueError(f'It is not {team}\'s turn')
+                        move = parse_move(text[:3] if text[2:3] == '*'
+                                          else text)
+                        if not is_legal(game, move):
+                            raise ValueError(f'{text} is not legal')
+                        outcome = None
+                        if move >> KIND_SHIFT == FIRE:
+                            src = (move >> SRC_SHIFT) & ARG_MASK
+                            outcome, hit = trace_hit(game.board.cells, src)
+                            if text[3:] and parse_square(text[3:]) != hit:
+                                raise ValueError(f'{text} hits '
+                                                 f'{square_str(hit)}')
+                        record.actions.append((move, outcome))
+                        game.make_move(move)
+
+                case ['result', result] if game is not None:
+                    if result != winner(game):
+                        raise ValueError(f'The result is {winner(game)}')
+
+                case _:
+                    raise ValueError('Not a line of a game')
+
+        except ValueError as error:
+            raise ValueError(f'Line {number}: {error}') from None
+
+    if record is not None:
+        yield record
+
+
+# ---------------------------------------------------------------------------
+def position_str(game):
+    """
+    Return a board as text, a row per line. A mirror is r or g with
+    its angle, a laser cannon R or G with its angle, an empty square '.'.
+    """
+
+    cells = game.board.cells
+    lines = []
+    for y in range(SQUARE_COUNT):
+        row = []
+        for x in range(SQUARE_COUNT):
+            cell = cells[y * SQUARE_COUNT + x]
+            if not cell:
+                row.append(' .')
+                continue
+            team = (cell >> TEAM_SHIFT) & 3
+            letter = 'r' if team == Cell.RED_TEAM else 'g'
+            if cell >> ACTOR_SHIFT == Cell.LASER:
+                letter = letter.upper()
+            row.append(letter + str(cell & ANGLE_MASK))
+        lines.append(str(y + 1) + ' ' + ' '.join(row))
+    lines.append('   ' + '  '.join('abcdefghi'))
+    if game.state == GameState.END:
+        lines.append(f'{winner(game)} won')
+    else:
+        lines.append(f'{TEAM_NAMES[game.player]} to move, '
+                     f'{game.move_count} actions left')
+    lines.append(f'lasers red {game.red_laser_count} '
+                 f'green {game.grn_laser_count}')
+    return '\n'.join(lines)
+
+
+# ---------------------------------------------------------------------------
+def cmd_verify(args):
+    """Replay every game in record files, checking every action."""
+
+    games = actions = errors = 0
+    start = perf_counter()
+    for path in args.files:
+        for index, record in enumerate(read_games(path)):
+            games += 1
+            actions += len(record.actions)
+            try:
+                replay(record)
+            except ValueError as error:
+                errors += 1
+                print(f'{path} game {index}: {error}')
+
+    seconds = perf_counter() - start
+    print(f'{games} games, {actions} actions, {errors} errors, '
+          f'{seconds:.2f} s, {games / seconds * 3600:,.0f} games/hour')
+    if errors:
+        sys.exit(1)
+
+
+# ---------------------------------------------------------------------------
+def cmd_show(args):
+    """Print the position after some actions of a recorded game."""
+
+    count = 0
+    for record in read_games(args.file):
+        if count == args.game:
+            print(position_str(replay(record, args.ply)))
+            return
+        count += 1
+    sys.exit(f'There are only {count} games')
+
+
+# ---------------------------------------------------------------------------
+def cmd_export(args):
+    export_text(read_games(args.file), sys.stdout)
+
+
+# ---------------------------------------------------------------------------
+def cmd_import(args):
+    with open(args.text) as file, open(args.file, 'ab') as out:
+        for record in import_text(file):
+            out.write(encode(record))
+
+
+# ---------------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description = 'Laser Blast game records')
+    sub = parser.add_subparsers(required = True)
+
+    cmd = sub.add_parser('verify', help = 'replay and check every game')
+    cmd.add_argument('files', nargs = '+')
+    cmd.set_defaults(func = cmd_verify)
+
+    cmd = sub.add_parser('show', help = 'print a position of a game')
+    cmd.add_argument('file')
+    cmd.add_argument('--game', type = int, default = 0,
+                     help = 'game number, from 0')
+    cmd.add_argument('--ply', type = int, default = None,
+                     help = 'actions to play, all by default')
+    cmd.set_defaults(func = cmd_show)
+
+    cmd = sub.add_parser('export', help = 'print games in text notation')
+    cmd.add_argument('file')
+    cmd.set_defaults(func = cmd_export)
+
+    cmd = sub.add_parser('import', help = 'append games in text notation '
+                                          'to a record file')
+    cmd.add_argument('text')
+    cmd.add_argument('file')
+    cmd.set_defaults(func = cmd_import)
+
+    args = parser.parse_args()
+    try:
+        args.func(args)
+    except ValueError as error:
+        sys.exit(str(error))
+
+
+if __name__ == '__main__':
+    main()
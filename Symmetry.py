@@ -0,0 +1,399 @@
+# ---------------------------------------------------------------------------
+# Laser Blast, Symmetry
+#
+# History
+# 18 Oct 2026                   Created
+# ---------------------------------------------------------------------------
+# MIT Licence
+# Copyright 2022 Mike Christle
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE
+# USE OR OTHER DEALINGS IN THE SOFTWARE.
+# ---------------------------------------------------------------------------
+
+import sys
+from random import Random
+
+from Cell import ACTOR_SHIFT, ANGLE_MASK, TEAM_SHIFT, LASER_CELL, Cell
+from GameLogic import Game
+from GameState import SQUARE_COUNT
+from Laser import NEW_DIR, DX, DY, trace, trace_hit
+from Moves import KIND_SHIFT, SRC_SHIFT, ARG_MASK
+from Zobrist import CELL_KEYS, TURN_KEYS
+import Moves
+
+
+# The start position is the same after any of these transforms,
+# so is every position reached from it after the same transform of
+# its moves. Each transform is its own inverse.
+#   IDENTITY   no change
+#   FLIP       top to bottom, y -> 8 - y, the teams are kept
+#   MIRROR     left to right, x -> 8 - x, red and green are swapped
+#   TURN       half turn, both of these, red and green are swapped
+IDENTITY = 0
+FLIP = 1
+MIRROR = 2
+TURN = 3
+TRANSFORMS = (IDENTITY, FLIP, MIRROR, TURN)
+NAMES = ('identity', 'flip', 'mirror', 'turn')
+
+# Transforms with bit 1 set swap the teams
+SWAPS_TEAMS = 2
+
+
+# ---------------------------------------------------------------------------
+def _build_tables():
+    """
+    Build the tables of each transform, indexed by transform.
+    SQUARE_MAP maps each square, CELL_MAP each packed cell value,
+    TEAM_MAP each team, LASER_ANGLE and MIRROR_ANGLE each angle.
+
+    A laser points in a direction of travel, so its angle maps
+    like a step in x and y. A mirror is a line through the square,
+    its two ends point in opposite directions and one flip turns
+    angle a to -a, two flips leave it as it is.
+    """
+
+    size = SQUARE_COUNT
+    square_map, cell_map, team_map = [], [], []
+    laser_angle, mirror_angle = [], []
+
+    for t in TRANSFORMS:
+        flip_y = t & FLIP
+        flip_x = t & MIRROR
+
+        squares = []
+        for sq in range(size * size):
+            y, x = divmod(sq, size)
+            if flip_x: x = size - 1 - x
+            if flip_y: y = size - 1 - y
+            squares.append(y * size + x)
+
+        steps = [(DX[d], DY[d]) for d in range(8)]
+        lasers = tuple(steps.index((-DX[d] if flip_x else DX[d],
+                                    -DY[d] if flip_y else DY[d]))
+                       for d in range(8))
+        mirrors = tuple((-a) & 7 if bool(flip_x) != bool(flip_y) else a
+                        for a in range(8))
+        teams = (Cell.NO_TEAM, Cell.GRN_TEAM, Cell.RED_TEAM) if flip_x \
+                else (Cell.NO_TEAM, Cell.RED_TEAM, Cell.GRN_TEAM)
+
+        cells = []
+        for cell in range(128):
+            actor = cell >> ACTOR_SHIFT
+            team = (cell >> TEAM_SHIFT) & 3
+            angle = cell & ANGLE_MASK
+            if actor == Cell.LASER:
+                angle = lasers[angle]
+            elif actor == Cell.MIRROR:
+                angle = mirrors[angle]
+            if team < 3:
+                team = teams[team]
+            cells.append((actor << ACTOR_SHIFT) | (team << TEAM_SHIFT) | angle)
+
+        square_map.append(tuple(squares))
+        cell_map.append(bytes(cells))
+        team_map.append(teams + (3,))
+        laser_angle.append(lasers)
+        mirror_angle.append(mirrors)
+
+    return (tuple(square_map), tuple(cell_map), tuple(team_map),
+            tuple(laser_angle), tuple(mirror_angle))
+
+
+SQUARE_MAP, CELL_MAP, TEAM_MAP, LASER_ANGLE, MIRROR_ANGLE = _build_tables()
+
+# Zobrist keys of each transform, indexed like CELL_KEYS by
+# (square << 7) | cell, giving the key of the transformed cell on the
+# transformed square. The hash of a transformed board is the XOR of
+# these over the board, without building the board.
+KEY_MAP = tuple(tuple(CELL_KEYS[(SQUARE_MAP[t][i >> 7] << 7) |
+                                CELL_MAP[t][i & 0x7F]]
+                      for i in range(len(CELL_KEYS)))
+                for t in TRANSFORMS)
+
+
+# ---------------------------------------------------------------------------
+def transform_cells(cells, t):
+    """Return a board's cells after transform t, as a bytearray."""
+
+    squares = SQUARE_MAP[t]
+    table = CELL_MAP[t]
+    out = bytearray(len(cells))
+    for sq, cell in enumerate(cells):
+        out[squares[sq]] = table[cell]
+    return out
+
+
+# ---------------------------------------------------------------------------
+def transform_game(game, t):
+    """
+    Return a copy of a game position after transform t.
+    As with Game.copy, the history and front end hooks are not copied.
+    """
+
+    copy = game.copy()
+    copy.board.cells[:] = transform_cells(game.board.cells, t)
+    copy.board.hash = transform_hash(game.board.cells, t)
+    copy.player = TEAM_MAP[t][game.player]
+    if t & SWAPS_TEAMS:
+        copy.red_laser_count = game.grn_laser_count
+        copy.grn_laser_count = game.red_laser_count
+    return copy
+
+
+# ---------------------------------------------------------------------------
+def transform_hash(cells, t):
+    """Return the Zobrist hash of a board's cells after transform t."""
+
+    keys = KEY_MAP[t]
+    h = 0
+    for sq, cell in enumerate(cells):
+        if cell:
+            h ^= keys[(sq << 7) | cell]
+    return h
+
+
+# ---------------------------------------------------------------------------
+def transform_move(move, t, cells):
+    """
+    Return a move after transform t. Cells are the board the move is
+    made on, before the transform, as a rotation depends on the piece.
+    """
+
+    kind = move >> KIND_SHIFT
+    src = (move >> SRC_SHIFT) & ARG_MASK
+    arg = move & ARG_MASK
+    match kind:
+        case Moves.STEP | Moves.JUMP:
+            arg = SQUARE_MAP[t][arg]
+        case Moves.ROTATE:
+            if cells[src] >= LASER_CELL:
+                arg = LASER_ANGLE[t][arg]
+            else:
+                arg = MIRROR_ANGLE[t][arg]
+    return (kind << KIND_SHIFT) | (SQUARE_MAP[t][src] << SRC_SHIFT) | arg
+
+
+# ---------------------------------------------------------------------------
+def canonical_key(game, keys = KEY_MAP):
+    """
+    Return (key, transform) for a game position. The key is the smallest
+    Zobrist key of the position under the four transforms, so a position
+    and each of its symmetric positions share one key. Use it in place of
+    Game.key in a cache, book or table to keep one entry for all of them.
+    The transform takes the position to the one the key belongs to,
+    use transform_move to take moves to and from that position.
+    """
+
+    flip, mirror, turn = keys[FLIP], keys[MIRROR], keys[TURN]
+    h1 = h2 = h3 = 0
+    for sq, cell in enumerate(game.board.cells):
+        if cell:
+            i = (sq << 7) | cell
+            h1 ^= flip[i]
+            h2 ^= mirror[i]
+            h3 ^= turn[i]
+
+    turn_index = (game.player << 2) | game.move_count
+    other_index = (TEAM_MAP[MIRROR][game.player] << 2) | game.move_count
+    return min((game.board.hash ^ TURN_KEYS[turn_index], IDENTITY),
+               (h1 ^ TURN_KEYS[turn_index], FLIP),
+               (h2 ^ TURN_KEYS[other_index], MIRROR),
+               (h3 ^ TURN_KEYS[other_index], TURN))
+
+
+# ---------------------------------------------------------------------------
+def random_game(rnd, plies):
+    """Play a game of random moves for up to plies actions."""
+
+    game = Game()
+    game.init_game()
+    for _ in range(plies):
+        moves = game.legal_moves()
+        if not moves:
+            break
+        game.make_move(rnd.choice(moves))
+    return game
+
+
+# ---------------------------------------------------------------------------
+def random_board(rnd):
+    """Return a board of random pieces, more than any game would have."""
+
+    cells = bytearray(SQUARE_COUNT * SQUARE_COUNT)
+    for sq in rnd.sample(range(len(cells)), rnd.randrange(4, 40)):
+        actor = rnd.choice((Cell.MIRROR, Cell.MIRROR, Cell.LASER))
+        team = rnd.choice((Cell.RED_TEAM, Cell.GRN_TEAM))
+        cells[sq] = (actor << ACTOR_SHIFT) | (team << TEAM_SHIFT) | \
+                    rnd.randrange(8)
+    return cells
+
+
+# ---------------------------------------------------------------------------
+def _map_point(point, t):
+    """Transform a point of a laser path, which may be on the border."""
+
+    x, y = point
+    if t & MIRROR: x = SQUARE_COUNT - 1 - x
+    if t & FLIP: y = SQUARE_COUNT - 1 - y
+    return x, y
+
+
+# ---------------------------------------------------------------------------
+def check_tables():
+    """Check that each transform agrees with NEW_DIR and is an involution."""
+
+    for t in TRANSFORMS:
+        lasers, mirrors = LASER_ANGLE[t], MIRROR_ANGLE[t]
+        for d in range(8):
+            for a in range(8):
+                new = NEW_DIR[d][a]
+                if new < 8:
+                    new = lasers[new]
+                assert NEW_DIR[lasers[d]][mirrors[a]] == new, (t, d, a)
+        for sq in range(SQUARE_COUNT * SQUARE_COUNT):
+            assert SQUARE_MAP[t][SQUARE_MAP[t][sq]] == sq
+        for cell in range(128):
+            assert CELL_MAP[t][CELL_MAP[t][cell]] == cell
+
+
+# ---------------------------------------------------------------------------
+def check_lasers(cells):
+    """
+    Check that every laser on a board, fired after each transform, has
+    the same outcome, hits the transformed square and follows the
+    transformed path. Return the number of shots checked.
+    """
+
+    shots = 0
+    lasers = [sq for sq, cell in enumerate(cells) if cell >= LASER_CELL]
+    for t in TRANSFORMS:
+        other = transform_cells(cells, t)
+        for sq in lasers:
+            outcome, hit, path = trace(cells, sq)
+            t_outcome, t_hit, t_path = trace(other, SQUARE_MAP[t][sq])
+            assert t_outcome == outcome, (t, sq)
+            assert t_hit == (SQUARE_MAP[t][hit] if hit >= 0 else hit)
+            assert t_path == [_map_point(p, t) for p in path], (t, sq)
+            assert trace_hit(other, SQUARE_MAP[t][sq]) == (t_outcome, t_hit)
+            shots += 1
+    return shots
+
+
+# ---------------------------------------------------------------------------
+def check_game(game):
+    """
+    Check that each transform of a game position has the transformed
+    key, the transformed legal moves, and that making a move and its
+    transform lead to transformed positions.
+    """
+
+    cells = game.board.cells
+    moves = game.legal_moves()
+    key, _ = canonical_key(game)
+    for t in TRANSFORMS:
+        other = transform_game(game, t)
+        other.board.check_hash()
+        assert transform_game(other, t).key() == game.key()
+        assert canonical_key(other)[0] == key
+        assert sorted(transform_move(m, t, cells) for m in moves) == \
+               sorted(other.legal_moves()), t
+
+        for move in moves[::17]:
+            game.make_move(move)
+            other.make_move(transform_move(move, t, cells))
+            assert other.board.cells == transform_cells(game.board.cells, t)
+            assert other.key() == transform_game(game, t).key()
+            assert (other.state, other.player, other.move_count) == \
+                   (game.state, TEAM_MAP[t][game.player], game.move_count)
+            other.unmake_move()
+            game.unmake_move()
+
+
+# ---------------------------------------------------------------------------
+def self_check(count = 500, seed = 1):
+    """
+    Check the transforms on the start position, on count positions of
+    random games and on count random boards. Raises AssertionError on
+    the first failure, returns the number of laser shots checked.
+    """
+
+    check_tables()
+
+    # The start position is the same after every transform, but
+    # mirrored it is the other player's move
+    start = Game()
+    start.init_game()
+    for t in TRANSFORMS:
+        other = transform_game(start, t)
+        assert other.board.cells == start.board.cells, t
+        assert other.player == TEAM_MAP[t][start.player]
+
+    rnd = Random(seed)
+    shots = 0
+    for _ in range(count):
+        game = random_game(rnd, rnd.randrange(60))
+        check_game(game)
+        shots += check_lasers(game.board.cells)
+        shots += check_lasers(random_board(rnd))
+    return shots
+
+
+# ---------------------------------------------------------------------------
+def count_positions(depth):
+    """
+    Count the different positions each number of actions from the start
+    position, by Zobrist key and by canonical key.
+    Return a list of (actions, keys, canonical keys).
+    """
+
+    game = Game()
+    game.init_game()
+    level = {game.key(): game}
+    counts = []
+    for actions in range(1, depth + 1):
+        last = actions == depth
+        found = {}
+        canonical = set()
+        for game in level.values():
+            for move in game.legal_moves():
+                game.make_move(move)
+                key = game.key()
+                if key not in found:
+                    found[key] = None if last else game.copy()
+                    canonical.add(canonical_key(game)[0])
+                game.unmake_move()
+        counts.append((actions, len(found), len(canonical)))
+        level = found
+    return counts
+
+
+# ---------------------------------------------------------------------------
+def main():
+    depth = int(sys.argv[1]) if len(sys.argv) > 1 else 2
+    shots = self_check()
+    print(f'ok, {shots} laser shots the same after every transform')
+
+    print('Actions   Positions   Canonical')
+    for actions, keys, canonical in count_positions(depth):
+        print(f'{actions:7} {keys:11} {canonical:11} {keys / canonical:6.2f}x')
+
+
+if __name__ == '__main__':
+    main()
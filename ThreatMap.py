@@ -0,0 +1,131 @@
+# ---------------------------------------------------------------------------
+# Laser Blast, Threat Map
+#
+# History
+# 18 Oct 2026                   Created
+# ---------------------------------------------------------------------------
+# MIT Licence
+# Copyright 2022 Mike Christle
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE
+# USE OR OTHER DEALINGS IN THE SOFTWARE.
+# ---------------------------------------------------------------------------
+
+from Cell import TEAM_SHIFT, LASER_CELL
+from Laser import trace_squares, HIT_EDGE, HIT_LASER
+
+
+# ---------------------------------------------------------------------------
+class ThreatMap:
+    """
+    The beam of every laser cannon on a board, as it would be if fired
+    now, kept up to date as the board changes. Each beam is cached as
+    (outcome, hit square, mask of the squares it passes through).
+    A beam only depends on the squares in its mask, so after a change
+    only the beams that pass through a changed square are traced again.
+
+    Call update after the board changes. The changed squares are found
+    by comparing the cells with a copy taken at the last update, so any
+    change is seen, by a move, an unmake or a new game.
+    """
+
+    __slots__ = ('board', 'beams', 'snapshot', 'traced')
+
+    # -----------------------------------------------------------------------
+    def __init__(self, board):
+        self.board = board
+        self.beams = {}         # Laser square -> (outcome, hit, mask)
+        self.snapshot = 0       # Cells as an int at the last update
+        self.traced = 0         # Beams traced, for measuring
+        self.rebuild()
+
+    # -----------------------------------------------------------------------
+    def rebuild(self):
+        """Trace every beam from scratch."""
+
+        cells = self.board.cells
+        self.beams = {sq: trace_squares(cells, sq)
+                      for sq in range(81) if cells[sq] >= LASER_CELL}
+        self.traced += len(self.beams)
+        self.snapshot = int.from_bytes(cells, 'little')
+
+    # -----------------------------------------------------------------------
+    def update(self):
+        """
+        Bring the beams up to date with the board.
+        Return the mask of the squares that changed.
+        """
+
+        cells = self.board.cells
+        current = int.from_bytes(cells, 'little')
+        diff = current ^ self.snapshot
+        if not diff:
+            return 0
+        self.snapshot = current
+
+        # Squares of the changed bytes
+        changed = 0
+        squares = []
+        while diff:
+            sq = ((diff & -diff).bit_length() - 1) >> 3
+            changed |= 1 << sq
+            squares.append(sq)
+            diff &= ~(0xFF << (sq << 3))
+
+        # Drop the beams that pass through a changed square,
+        # a moved or rotated cannon is on its own beam
+        beams = self.beams
+        for sq in [sq for sq, beam in beams.items() if beam[2] & changed]:
+            del beams[sq]
+            squares.append(sq)
+
+        # Trace the cannons on changed squares and dropped beams again
+        for sq in squares:
+            if cells[sq] >= LASER_CELL and sq not in beams:
+                beams[sq] = trace_squares(cells, sq)
+                self.traced += 1
+
+        return changed
+
+    # -----------------------------------------------------------------------
+    def covered(self, team):
+        """Return the mask of the squares covered by the beams of team."""
+
+        cells = self.board.cells
+        mask = 0
+        for sq, beam in self.beams.items():
+            if (cells[sq] >> TEAM_SHIFT) & 3 == team:
+                mask |= beam[2]
+        return mask
+
+    # -----------------------------------------------------------------------
+    def threatened(self, team):
+        """
+        Return the mask of the pieces of team that an enemy laser
+        would destroy if fired now.
+        """
+
+        cells = self.board.cells
+        mask = 0
+        for sq, (outcome, hit, _) in self.beams.items():
+            if (cells[sq] >> TEAM_SHIFT) & 3 == team or hit < 0:
+                continue
+            if outcome in (HIT_LASER, HIT_EDGE) and \
+                    (cells[hit] >> TEAM_SHIFT) & 3 == team:
+                mask |= 1 << hit
+        return mask
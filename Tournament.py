@@ -0,0 +1,377 @@
+# ---------------------------------------------------------------------------
+# Laser Blast, Tournament
+#
+# History
+# 18 Oct 2026                   Created
+#                               Save the games to a record file, --record
+#                               Add the lazy SMP player, smp-K
+# ---------------------------------------------------------------------------
+# MIT Licence
+# Copyright 2022 Mike Christle
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE
+# USE OR OTHER DEALINGS IN THE SOFTWARE.
+# ---------------------------------------------------------------------------
+
+import argparse
+import json
+import os
+import random
+import sys
+
+from contextlib import nullcontext
+from math import sqrt
+from multiprocessing import Pool
+from time import perf_counter
+from Cell import ACTOR_SHIFT, TEAM_SHIFT, Cell
+from Engine import Engine
+from GameLogic import Game
+from Laser import trace_hit
+from MCTS import MCTS
+from ParallelEngine import ParallelEngine
+from Moves import legal_moves, KIND_SHIFT, SRC_SHIFT, ARG_MASK, FIRE
+import GameState
+import Record
+
+
+PLAYERS = 'random, greedy-fire, search-K (depth K), ' \
+          'smp-K (lazy SMP, depth K), mcts-N (N playouts)'
+
+
+# ---------------------------------------------------------------------------
+class RandomPlayer:
+    """Plays a random legal action."""
+
+    def __init__(self, rng):
+        self.rng = rng
+
+    def choose(self, game):
+        return self.rng.choice(legal_moves(game))
+
+
+# ---------------------------------------------------------------------------
+class GreedyFirePlayer:
+    """
+    Fires a laser at an enemy cannon if it can, else at an enemy mirror,
+    else plays a random action that is not a shot at its own pieces.
+    """
+
+    def __init__(self, rng):
+        self.rng = rng
+
+    def choose(self, game):
+        cells = game.board.cells
+        best = None
+        best_value = 0
+        others = []
+
+        for move in legal_moves(game):
+            if move >> KIND_SHIFT != FIRE:
+                others.append(move)
+                continue
+            outcome, hit = trace_hit(cells, (move >> SRC_SHIFT) & ARG_MASK)
+            if hit < 0 or (cells[hit] >> TEAM_SHIFT) & 3 == game.player:
+                continue
+            value = 2 if cells[hit] >> ACTOR_SHIFT == Cell.LASER else 1
+            if value > best_value:
+                best = move
+                best_value = value
+
+        return best if best is not None else self.rng.choice(others)
+
+
+# ---------------------------------------------------------------------------
+class SearchPlayer:
+    """Alpha-beta search to a fixed depth, so games can be repeated."""
+
+    def __init__(self, depth):
+        self.engine = Engine(16)
+        self.depth = depth
+
+    def choose(self, game):
+        return self.engine.search(game, float('inf'), self.depth).move
+
+
+# ---------------------------------------------------------------------------
+class SMPPlayer:
+    """
+    Lazy SMP search to a fixed depth with a ParallelEngine. The workers
+    race to fill the shared table, so a game may not play the same twice.
+    The worker processes start with the first action.
+    """
+
+    def __init__(self, depth, workers):
+        self.engine = None
+        self.depth = depth
+        self.workers = workers
+
+    def choose(self, game):
+        if self.engine is None:
+            self.engine = ParallelEngine(self.workers, 16)
+        return self.engine.search(game, float('inf'), self.depth).move
+
+    def close(self):
+        if self.engine is not None:
+            self.engine.close()
+            self.engine = None
+
+
+# ---------------------------------------------------------------------------
+class MCTSPlayer:
+    """Monte Carlo tree search with a fixed number of playouts."""
+
+    def __init__(self, rng, playouts):
+        self.mcts = MCTS(rng.getrandbits(64))
+        self.playouts = playouts
+
+    def choose(self, game):
+        return self.mcts.search(game, float('inf'), self.playouts).move
+
+
+# ---------------------------------------------------------------------------
+def make_player(spec, rng, smp = 2):
+    """
+    Return a player for a name from PLAYERS.
+    An smp-K player searches with smp processes.
+    """
+
+    name, _, arg = spec.rpartition('-')
+    match spec:
+        case 'random':
+            return RandomPlayer(rng)
+        case 'greedy-fire':
+            return GreedyFirePlayer(rng)
+        case _ if name == 'search' and arg.isdigit():
+            return SearchPlayer(int(arg))
+        case _ if name == 'smp' and arg.isdigit():
+            return SMPPlayer(int(arg), smp)
+        case _ if name == 'mcts' and arg.isdigit():
+            return MCTSPlayer(rng, int(arg))
+        case 'mcts':
+            return MCTSPlayer(rng, 1000)
+    raise ValueError(f'Unknown player {spec}, use one of {PLAYERS}')
+
+
+# ---------------------------------------------------------------------------
+def positive(text):
+    """Argument type of a count that must be at least 1."""
+
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f'{value} is less than 1')
+    return value
+
+
+# ---------------------------------------------------------------------------
+def game_seed(seed, index):
+    """
+    Seed of one game, so any game can be played again on its own.
+    With --series above 1 and --first rule, who moves first also
+    depends on the game before it in the series.
+    """
+
+    return (seed * 1000003 + index) & 0xFFFFFFFFFFFF
+
+
+# ---------------------------------------------------------------------------
+def play_series(task):
+    """
+    Play a series of games back to back on one Game object.
+    Player A plays red in even numbered games and green in odd ones.
+    Return a list of game records. With --record each game record
+    also holds the game in Record format as 'data'.
+    """
+
+    series, args = task
+    game = Game()
+    records = []
+
+    for index in range(series * args.series,
+                       min((series + 1) * args.series, args.games)):
+        seed = game_seed(args.seed, index)
+        rng = random.Random(seed)
+        a = make_player(args.a, random.Random(rng.getrandbits(64)), args.smp)
+        b = make_player(args.b, random.Random(rng.getrandbits(64)), args.smp)
+        red, green = (a, b) if index % 2 == 0 else (b, a)
+
+        # A new Game starts with red, after that init_game picks
+        game.init_game()
+        match args.first:
+            case 'red': game.player = Cell.RED_TEAM
+            case 'green': game.player = Cell.GRN_TEAM
+            case 'random': game.player = rng.choice((Cell.RED_TEAM,
+                                                     Cell.GRN_TEAM))
+        first = game.player
+        data = bytearray(Record.header(first)) if args.record else None
+
+        start = perf_counter()
+        plies = 0
+        while game.state != GameState.END and plies < args.max_plies:
+            player = red if game.player == Cell.RED_TEAM else green
+            move = player.choose(game)
+            if data is not None:
+                data += Record.action(game.board.cells, move)
+            game.make_move(move)
+            plies += 1
+
+        for player in (a, b):
+            if isinstance(player, SMPPlayer):
+                player.close()
+
+        if game.state != GameState.END:
+            winner = Cell.NO_TEAM
+        elif game.red_laser_count == 0:
+            winner = Cell.GRN_TEAM
+        else:
+            winner = Cell.RED_TEAM
+
+        records.append({
+            'game': index,
+            'seed': seed,
+            'red': args.a if index % 2 == 0 else args.b,
+            'green': args.b if index % 2 == 0 else args.a,
+            'first': TEAM_NAMES[first],
+            'winner': TEAM_NAMES[winner],
+            'a_result': _a_result(index, winner),
+            'plies': plies,
+            'seconds': round(perf_counter() - start, 4)})
+        if data is not None:
+            records[-1]['data'] = bytes(data)
+
+    return records
+
+
+TEAM_NAMES = {Cell.NO_TEAM: 'draw', Cell.RED_TEAM: 'red',
+              Cell.GRN_TEAM: 'green'}
+
+
+# ---------------------------------------------------------------------------
+def _a_result(index, winner):
+    """Result of a game for player A, 1 win, 0.5 draw, 0 loss."""
+
+    if winner == Cell.NO_TEAM:
+        return 0.5
+    a_team = Cell.RED_TEAM if index % 2 == 0 else Cell.GRN_TEAM
+    return 1.0 if winner == a_team else 0.0
+
+
+# ---------------------------------------------------------------------------
+def wilson(wins, count, z = 1.96):
+    """Return the Wilson score interval of a proportion, 95% by default."""
+
+    if count == 0:
+        return 0.0, 1.0
+    p = wins / count
+    scale = 1 + z * z / count
+    centre = (p + z * z / (2 * count)) / scale
+    half = z * sqrt(p * (1 - p) / count + z * z / (4 * count * count)) / scale
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+
+# ---------------------------------------------------------------------------
+def summary(records, seconds):
+    """Return the lines of the summary of a list of game records."""
+
+    count = len(records)
+    a_score = sum(r['a_result'] for r in records)
+    a_wins = sum(r['a_result'] == 1.0 for r in records)
+    draws = sum(r['winner'] == 'draw' for r in records)
+    decided = [r for r in records if r['winner'] != 'draw']
+    first_wins = sum(r['winner'] == r['first'] for r in decided)
+    red_wins = sum(r['winner'] == 'red' for r in decided)
+    plies = sum(r['plies'] for r in records)
+
+    low, high = wilson(a_score, count)
+    first_low, first_high = wilson(first_wins, len(decided))
+    lines = [
+        f'{count} games, A wins {a_wins}, B wins {count - a_wins - draws}, '
+        f'draws {draws}',
+        f'A score {a_score / max(1, count):.3f}  '
+        f'95% CI {low:.3f} - {high:.3f}',
+        f'first player wins {first_wins / max(1, len(decided)):.3f}  '
+        f'95% CI {first_low:.3f} - {first_high:.3f}  '
+        f'red wins {red_wins / max(1, len(decided)):.3f}',
+        f'average length {plies / max(1, count):.1f} actions',
+        f'{count / seconds:.2f} games/s']
+    return lines
+
+
+# ---------------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(
+        description = 'Play games between two computer players',
+        epilog = f'Players: {PLAYERS}')
+    parser.add_argument('a', help = 'player A')
+    parser.add_argument('b', help = 'player B')
+    parser.add_argument('--games', type = positive, default = 100)
+    parser.add_argument('--series', type = positive, default = 1,
+                        help = 'games played back to back on one Game')
+    parser.add_argument('--first', default = 'rule',
+                        choices = ('rule', 'red', 'green', 'random'),
+                        help = 'who moves first, rule is the init_game rule')
+    parser.add_argument('--max-plies', type = positive, default = 1000,
+                        help = 'actions before a game is a draw')
+    parser.add_argument('--seed', type = int, default = 1)
+    parser.add_argument('--jobs', type = positive, default = os.cpu_count(),
+                        help = 'processes playing games, one with smp players')
+    parser.add_argument('--smp', type = positive, default = 2,
+                        help = 'processes each smp player searches with')
+    parser.add_argument('--out', default = 'tournament.jsonl',
+                        help = 'file the game records are streamed to')
+    parser.add_argument('--record',
+                        help = 'record file the games are appended to')
+    args = parser.parse_args()
+
+    # Check the players before starting the pool
+    for spec in (args.a, args.b):
+        try:
+            make_player(spec, random.Random())
+        except ValueError as error:
+            parser.error(str(error))
+
+    series = (args.games + args.series - 1) // args.series
+    tasks = [(index, args) for index in range(series)]
+    records = []
+    start = perf_counter()
+
+    # The processes of an smp player can not be started from a pool
+    # process, and use the cores themselves, so play one game at a time
+    smp = any(spec.startswith('smp-') for spec in (args.a, args.b))
+
+    with open(args.out, 'w') as out, \
+            open(args.record or os.devnull, 'ab') as games, \
+            (nullcontext() if smp else Pool(args.jobs)) as pool:
+        results = map(play_series, tasks) if smp \
+                  else pool.imap_unordered(play_series, tasks)
+        for result in results:
+            for record in result:
+                if 'data' in record:
+                    games.write(record.pop('data'))
+                out.write(json.dumps(record) + '\n')
+                records.append(record)
+            out.flush()
+            games.flush()
+            print(f'\r{len(records)} games', end = '', file = sys.stderr)
+
+    print(file = sys.stderr)
+    for line in summary(records, perf_counter() - start):
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
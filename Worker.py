@@ -0,0 +1,230 @@
+# ---------------------------------------------------------------------------
+# Laser Blast, Engine Worker
+#
+# History
+# 18 Oct 2026                   Created
+#                               Search with Monte Carlo tree search
+#                               Search with a ParallelEngine, smp
+#                               Default signal handlers in the worker
+# ---------------------------------------------------------------------------
+# MIT Licence
+# Copyright 2022 Mike Christle
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE
+# USE OR OTHER DEALINGS IN THE SOFTWARE.
+# ---------------------------------------------------------------------------
+
+import atexit
+import signal
+from multiprocessing import get_context, get_all_start_methods
+from os import getppid
+from Engine import Engine, NO_MOVE
+from MCTS import MCTS
+from Moves import legal_moves
+import GameState
+
+
+# A forked worker starts at once and does not load the front end again.
+# Where there is no fork, the front end must guard its main code.
+_CONTEXT = get_context('fork' if 'fork' in get_all_start_methods()
+                       else 'spawn')
+
+PREDICT_SECONDS = 0.2   # Time to find the move a player is expected to make
+
+# Seconds a worker is given to stop before it is terminated, then killed
+STOP_WAIT = 1.0
+
+
+# ---------------------------------------------------------------------------
+class EngineWorker:
+    """
+    Runs an Engine in a child process, so the front end keeps handling
+    events and painting while the computer thinks. The engine and its
+    transposition table live as long as the worker.
+
+    Each request is given a job number. The front end cancels a request
+    by changing the shared job number, and the child stops searching
+    when it no longer matches. Results of cancelled jobs are dropped.
+    """
+
+    # -----------------------------------------------------------------------
+    def __init__(self, tt_bits = 18, smp = 1):
+        """
+        With smp above 1 the alpha-beta search is a ParallelEngine of
+        that many processes. They are children of the worker, which
+        can then not be a daemon process, so it is closed at exit.
+        """
+
+        self.job_id = _CONTEXT.RawValue('i', 0)
+        self.conn, child = _CONTEXT.Pipe()
+        self.process = _CONTEXT.Process(target = _serve, daemon = smp < 2,
+                                        args = (child, self.job_id, tt_bits,
+                                                smp))
+        self.process.start()
+        child.close()
+        self.job = None     # (kind, key) of the running request
+        if smp > 1:
+            atexit.register(self.close)
+
+    # -----------------------------------------------------------------------
+    def search(self, game, seconds, mcts = False):
+        """
+        Start a search of game, unless it is already running.
+        The search is a Monte Carlo tree search if mcts is True.
+        """
+
+        kind = 'mcts' if mcts else 'search'
+        if self.job != (kind, game.key()):
+            self._send(kind, game, seconds)
+
+    # -----------------------------------------------------------------------
+    def ponder(self, game):
+        """
+        Think on the other player's time, unless already pondering game.
+        The worker searches the position after the move it expects
+        the player to make, and keeps that search if the move is made.
+        """
+
+        if self.job != ('ponder', game.key()):
+            self._send('ponder', game, 0.0)
+
+    # -----------------------------------------------------------------------
+    def cancel(self):
+        """Stop the running request."""
+
+        if self.job is not None:
+            self.job_id.value += 1
+            self.job = None
+
+    # -----------------------------------------------------------------------
+    def result(self):
+        """Return the SearchResult of the running search, or None."""
+
+        while self.conn.poll():
+            job_id, result = self.conn.recv()
+            if job_id == self.job_id.value and self.job[0] != 'ponder':
+                self.job = None
+                return result
+        return None
+
+    # -----------------------------------------------------------------------
+    def close(self):
+        """Stop the worker process."""
+
+        if not self.process.is_alive():
+            return
+        self.cancel()
+        self.conn.send(('quit', 0, None, 0.0))
+        stop_process(self.process)
+
+    # -----------------------------------------------------------------------
+    def _send(self, kind, game, seconds):
+        self.job_id.value += 1
+        self.job = kind, game.key()
+        self.conn.send((kind, self.job_id.value, game.copy(), seconds))
+
+
+# ---------------------------------------------------------------------------
+def reset_signals():
+    """
+    Restore the default SIGTERM and SIGINT actions in a child process.
+    A child forked from the front end inherits the handlers SDL sets,
+    which catch SIGTERM, so terminate would not stop it.
+    """
+
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+
+
+# ---------------------------------------------------------------------------
+def stop_process(process):
+    """
+    Wait for a child process that was asked to stop,
+    then terminate it, and as a last resort kill it.
+    """
+
+    process.join(STOP_WAIT)
+    if process.is_alive():
+        process.terminate()
+        process.join(STOP_WAIT)
+    if process.is_alive():
+        process.kill()
+        process.join()
+
+
+# ---------------------------------------------------------------------------
+def _serve(conn, job_id, tt_bits, smp):
+    """
+    Main loop of the worker process. The worker also stops
+    if the front end goes away without closing it.
+    """
+
+    reset_signals()
+    if smp > 1:
+        # ParallelEngine imports this module for _CONTEXT
+        from ParallelEngine import ParallelEngine
+        engine = ParallelEngine(smp, tt_bits)
+    else:
+        engine = Engine(tt_bits)
+    mcts = None
+    parent = getppid()
+
+    while True:
+        try:
+            kind, job, game, seconds = conn.recv()
+        except EOFError:
+            kind = 'quit'
+        stop = lambda: job_id.value != job or getppid() != parent
+
+        match kind:
+            case 'quit':
+                if smp > 1:
+                    engine.close()
+                return
+            case 'search':
+                conn.send((job, engine.search(game, seconds, stop = stop)))
+            case 'mcts':
+                if mcts is None:
+                    mcts = MCTS()
+                conn.send((job, mcts.search(game, seconds, stop = stop)))
+            case 'ponder':
+                game = _predict(engine, game, stop)
+                if game is not None:
+                    engine.search(game, float('inf'), stop = stop)
+                conn.send((job, None))
+
+
+# ---------------------------------------------------------------------------
+def _predict(engine, game, stop):
+    """
+    Play the moves the engine expects from the player to move,
+    to the end of the player's turn. Return the game, or None if
+    the game ends or the request is cancelled.
+    """
+
+    player = game.player
+    while game.player == player and game.state != GameState.END:
+        entry = engine.tt.probe(game.key())
+        move = entry[3] if entry is not None else NO_MOVE
+        if move not in legal_moves(game):
+            move = engine.search(game, PREDICT_SECONDS, stop = stop).move
+            if stop() or move == NO_MOVE:
+                return None
+        game.make_move(move)
+
+    return game if game.state != GameState.END else None
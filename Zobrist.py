@@ -0,0 +1,53 @@
+# ---------------------------------------------------------------------------
+# Laser Blast, Zobrist Keys
+#
+# History
+# 18 Oct 2026                   Created
+# ---------------------------------------------------------------------------
+# MIT Licence
+# Copyright 2022 Mike Christle
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE
+# USE OR OTHER DEALINGS IN THE SOFTWARE.
+# ---------------------------------------------------------------------------
+
+from random import Random
+from GameState import SQUARE_COUNT
+
+
+# One 64 bit key for each square and each value of a packed cell,
+# indexed by (square << 7) | cell. The key of an empty cell is zero.
+# A fixed seed keeps the keys the same from run to run.
+_random = Random(0x1A5E4B1A57)
+CELL_KEYS = tuple(0 if cell == 0 else _random.getrandbits(64)
+                  for sq in range(SQUARE_COUNT * SQUARE_COUNT)
+                  for cell in range(128))
+
+# One key for each player and remaining move count,
+# indexed by (player << 2) | move_count
+TURN_KEYS = tuple(_random.getrandbits(64) for _ in range(16))
+
+
+# ---------------------------------------------------------------------------
+def board_hash(cells):
+    """Compute the hash of a board's cells from scratch."""
+
+    h = 0
+    for sq, cell in enumerate(cells):
+        h ^= CELL_KEYS[(sq << 7) | cell]
+    return h